@@ -0,0 +1,189 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from utils.image_utils import image_fingerprint, hash_distance
+from config import (
+    ANSWER_CACHE_MAX_BYTES, ANSWER_CACHE_TTL_SECONDS, ANSWER_CACHE_MAX_HASH_DISTANCE
+)
+
+# Politeness fillers that do not change what the user is asking
+FILLER_WORDS = {"please", "kindly", "hey", "ok", "okay"}
+
+# Rough per-entry bookkeeping cost added to the text sizes when enforcing the memory budget
+ENTRY_OVERHEAD_BYTES = 200
+
+
+def normalize_question(question):
+    """
+    Normalizes a question so trivially different phrasings share a cache key.
+
+    Lowercases, drops punctuation and filler words, and collapses whitespace.
+
+    Args:
+        question (str): The user's question.
+
+    Returns:
+        str: The normalized question.
+
+    Example:
+        normalize_question("Describe this image, please.")  # "describe this image"
+    """
+    words = re.sub(r"[^\w\s]", " ", question.lower()).split()
+    return " ".join(word for word in words if word not in FILLER_WORDS)
+
+
+class AnswerCache:
+    """
+    LRU + TTL cache of AI answers keyed by image fingerprint and normalized question.
+
+    A repeated question about the same scene is answered from memory without touching
+    the model. Scenes match when their perceptual hashes differ by at most
+    `max_hash_distance` bits.
+
+    Args:
+        max_bytes (int): Memory budget for cached questions and answers.
+        ttl_seconds (float): How long an answer stays valid.
+        max_hash_distance (int): Maximum hash bit difference treated as the same scene.
+        store (GetCachedAnswer, optional): ORM handler used to persist answers in SQLite.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that needed the model.
+        evictions (int): Entries dropped for the memory budget or TTL.
+    """
+
+    def __init__(self, max_bytes=ANSWER_CACHE_MAX_BYTES, ttl_seconds=ANSWER_CACHE_TTL_SECONDS,
+                 max_hash_distance=ANSWER_CACHE_MAX_HASH_DISTANCE, store=None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_hash_distance = max_hash_distance
+        self.store = store
+        self._entries = OrderedDict()
+        self._keys_by_question = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_seconds_total = 0.0
+
+    def load_persisted(self):
+        """
+        Fills the in-memory cache with the non-expired answers stored in SQLite.
+
+        Does nothing when no `store` was given.
+        """
+        if self.store is None:
+            return
+        for row in self.store.load_answers(self.ttl_seconds):
+            self._insert(row["image_hash"], row["question"], row["answer"], row["timestamp"].timestamp())
+
+    def _insert(self, image_hash, question, answer, created_at):
+        """
+        Adds an entry and evicts least recently used ones beyond the memory budget.
+        """
+        key = (question, image_hash)
+        size = len(question.encode()) + len(answer.encode()) + len(image_hash) + ENTRY_OVERHEAD_BYTES
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {"answer": answer, "created_at": created_at, "size": size}
+            self._keys_by_question.setdefault(question, set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        """
+        Removes an entry; the caller must hold the lock.
+        """
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+        keys = self._keys_by_question.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_question[key[0]]
+
+    def _find(self, image_hash, question, now):
+        """
+        Finds a fresh entry for the question whose image hash is close enough.
+
+        The caller must hold the lock.
+
+        Returns:
+            tuple or None: The matching key, or None.
+        """
+        best_key, best_distance = None, None
+        for key in list(self._keys_by_question.get(question, ())):
+            if now - self._entries[key]["created_at"] > self.ttl_seconds:
+                self._remove(key)
+                self.evictions += 1
+                continue
+            distance = hash_distance(key[1], image_hash)
+            if distance <= self.max_hash_distance and (best_distance is None or distance < best_distance):
+                best_key, best_distance = key, distance
+        return best_key
+
+    def lookup(self, image, question):
+        """
+        Returns the cached answer for this image and question, if any.
+
+        Args:
+            image (PIL.Image.Image): The image being asked about.
+            question (str): The user's question.
+
+        Returns:
+            str or None: The cached answer, or None on a miss.
+        """
+        start = time.perf_counter()
+        image_hash = image_fingerprint(image)
+        normalized = normalize_question(question)
+        with self._lock:
+            key = self._find(image_hash, normalized, time.time())
+            if key is None:
+                self.misses += 1
+                answer = None
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                answer = self._entries[key]["answer"]
+            self.lookup_seconds_total += time.perf_counter() - start
+        return answer
+
+    def remember(self, image, question, answer):
+        """
+        Caches an answer and persists it when a store is configured.
+
+        Args:
+            image (PIL.Image.Image): The image that was asked about.
+            question (str): The user's question.
+            answer (str): The AI's answer.
+        """
+        image_hash = image_fingerprint(image)
+        normalized = normalize_question(question)
+        self._insert(image_hash, normalized, answer, time.time())
+        if self.store is not None:
+            self.store.save_answer(image_hash, normalized, answer)
+
+    def stats(self):
+        """
+        Returns hit/miss statistics and memory use.
+
+        Returns:
+            dict: Entries, bytes used, hits, misses, hit rate, evictions and average lookup time.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "avg_lookup_ms": round(self.lookup_seconds_total / lookups * 1000, 3) if lookups else 0.0
+            }
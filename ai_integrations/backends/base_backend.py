@@ -0,0 +1,82 @@
+class InferenceBackend:
+    """
+    Interface shared by every inference backend.
+
+    A backend answers a question about an image. It is loaded once, can answer in
+    one piece (`generate`) or chunk by chunk (`stream`), and releases its resources
+    on `close`. `InteractionManager` only needs `generate` and `stream`, so any
+    backend can drive the full pipeline.
+
+    Attributes:
+        name (str): Identifier used in config (`INFERENCE_BACKEND`).
+    """
+
+    name = "base"
+
+    @property
+    def is_ready(self):
+        """bool: True once `load()` has completed."""
+        raise NotImplementedError
+
+    def load(self):
+        """
+        Loads the model and any runtime resources. Safe to call more than once.
+
+        Returns:
+            bool: True when the backend is ready.
+        """
+        raise NotImplementedError
+
+    def generate(self, image, question):
+        """
+        Answers a question about an image.
+
+        Args:
+            image (PIL.Image.Image or numpy.ndarray): RGB image to analyze.
+            question (str): The user's question.
+
+        Returns:
+            str: The generated answer.
+        """
+        raise NotImplementedError
+
+    def stream(self, image, question):
+        """
+        Answers a question about an image, yielding text as it is produced.
+
+        Args:
+            image (PIL.Image.Image or numpy.ndarray): RGB image to analyze.
+            question (str): The user's question.
+
+        Yields:
+            str: Text chunks in generation order.
+        """
+        raise NotImplementedError
+
+    def generate_batch(self, images, questions):
+        """
+        Answers several questions. Backends without native batching answer them one by one.
+
+        Args:
+            images (list): One image per request.
+            questions (list[str]): One question per request, in the same order.
+
+        Returns:
+            list[str]: The answers, in request order.
+        """
+        return [self.generate(image, question) for image, question in zip(images, questions)]
+
+    def close(self):
+        """
+        Releases the model and runtime resources.
+        """
+        pass
+
+    def stats(self):
+        """
+        Returns backend-specific load and timing counters.
+
+        Returns:
+            dict: Counters; at least the backend name.
+        """
+        return {"backend": self.name}
@@ -0,0 +1,34 @@
+from config import INFERENCE_BACKEND
+
+# Backend names accepted by `create_backend`
+BACKEND_NAMES = ("transformers", "onnx", "stub")
+
+
+def create_backend(name=INFERENCE_BACKEND, get_lang=None):
+    """
+    Creates the inference backend selected in config.
+
+    Backend modules are imported lazily, so the "stub" backend runs without
+    PyTorch, Transformers or ONNX Runtime installed.
+
+    Args:
+        name (str): One of `BACKEND_NAMES`. Defaults to `INFERENCE_BACKEND`.
+        get_lang (object, optional): Language source; the Transformers backend uses it to
+            pick the speculative decoding draft model.
+
+    Returns:
+        InferenceBackend: The (not yet loaded) backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if name == "transformers":
+        from ai_integrations.backends.transformers_backend import TransformersBackend
+        return TransformersBackend(get_lang=get_lang)
+    if name == "onnx":
+        from ai_integrations.backends.onnx_backend import OnnxBackend
+        return OnnxBackend()
+    if name == "stub":
+        from ai_integrations.backends.stub_backend import StubBackend
+        return StubBackend()
+    raise ValueError(f"Unknown inference backend '{name}'. Choose one of {BACKEND_NAMES}.")
@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+import numpy as np
+from ai_integrations.backends.base_backend import InferenceBackend
+from config import ONNX_MODEL_DIR, GEMMA_MAX_NEW_TOKENS
+
+# ONNX Runtime element types of the key/value cache inputs
+ONNX_DTYPES = {"tensor(float)": np.float32, "tensor(float16)": np.float16}
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    Gemma 3n through ONNX Runtime on CPU, without PyTorch.
+
+    Expects the split export layout used by the onnx-community Gemma 3n releases,
+    next to the processor and tokenizer files:
+        onnx/vision_encoder.onnx        pixel_values -> image_features
+        onnx/embed_tokens.onnx          input_ids -> inputs_embeds (and per_layer_inputs)
+        onnx/decoder_model_merged.onnx  inputs_embeds, position_ids, past_key_values.* -> logits, present.*
+
+    Decoding is greedy with a key/value cache.
+
+    Args:
+        model_dir (str): Directory holding the export and the processor files.
+        max_new_tokens (int): Maximum number of tokens per answer.
+        intra_op_threads (int, optional): ONNX Runtime thread count; None lets the runtime decide.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR, max_new_tokens=GEMMA_MAX_NEW_TOKENS, intra_op_threads=None):
+        self.model_dir = model_dir
+        self.max_new_tokens = max_new_tokens
+        self.intra_op_threads = intra_op_threads
+        self.processor = None
+        self.vision_session = None
+        self.embed_session = None
+        self.decoder_session = None
+        self.image_token_id = None
+        self.eos_token_ids = set()
+        self.load_seconds = 0.0
+        self.generate_count = 0
+        self.generate_seconds_total = 0.0
+        self._load_lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+
+    @property
+    def is_ready(self):
+        return self.decoder_session is not None
+
+    def load(self):
+        if self.is_ready:
+            return True
+
+        with self._load_lock:
+            if self.is_ready:
+                return True
+
+            import onnxruntime
+            from transformers import AutoProcessor, GenerationConfig
+
+            start = time.perf_counter()
+            options = onnxruntime.SessionOptions()
+            if self.intra_op_threads:
+                options.intra_op_num_threads = self.intra_op_threads
+
+            def session(filename):
+                return onnxruntime.InferenceSession(
+                    os.path.join(self.model_dir, "onnx", filename), options, providers=["CPUExecutionProvider"]
+                )
+
+            self.processor = AutoProcessor.from_pretrained(self.model_dir)
+            tokenizer = self.processor.tokenizer
+            self.image_token_id = getattr(self.processor, "image_token_id", None) or \
+                tokenizer.convert_tokens_to_ids("<image_soft_token>")
+            try:
+                eos = GenerationConfig.from_pretrained(self.model_dir).eos_token_id
+            except Exception:
+                eos = tokenizer.eos_token_id
+            self.eos_token_ids = set(eos if isinstance(eos, (list, tuple)) else [eos])
+
+            self.vision_session = session("vision_encoder.onnx")
+            self.embed_session = session("embed_tokens.onnx")
+            self.decoder_session = session("decoder_model_merged.onnx")
+            self.load_seconds = time.perf_counter() - start
+            print(f"🧠 ONNX model loaded from {self.model_dir} in {self.load_seconds:.1f}s")
+        return True
+
+    def _embed(self, input_ids):
+        """
+        Embeds token ids.
+
+        Returns:
+            dict: Embedding outputs by name (`inputs_embeds`, optionally `per_layer_inputs`).
+        """
+        outputs = self.embed_session.run(None, {self.embed_session.get_inputs()[0].name: input_ids})
+        return {output.name: value for output, value in zip(self.embed_session.get_outputs(), outputs)}
+
+    def _empty_past(self):
+        """
+        Builds zero-length key/value cache inputs from the decoder's input metadata.
+
+        Returns:
+            dict: {"past_key_values.N.key" | "...value": empty array}
+        """
+        past = {}
+        for model_input in self.decoder_session.get_inputs():
+            if not model_input.name.startswith("past_key_values"):
+                continue
+            shape = [1 if index == 0 else 0 if isinstance(dim, str) or dim is None else dim
+                     for index, dim in enumerate(model_input.shape)]
+            past[model_input.name] = np.zeros(shape, dtype=ONNX_DTYPES.get(model_input.type, np.float32))
+        return past
+
+    def stream(self, image, question):
+        self.load()
+
+        with self._generate_lock:
+            start = time.perf_counter()
+            inputs = self.processor(text=f"<image_soft_token> {question}", images=image, return_tensors="np")
+            input_ids = inputs["input_ids"].astype(np.int64)
+
+            embedded = self._embed(input_ids)
+            image_mask = input_ids[0] == self.image_token_id
+            if image_mask.any():
+                image_features = self.vision_session.run(
+                    None, {self.vision_session.get_inputs()[0].name: inputs["pixel_values"].astype(np.float32)}
+                )[0]
+                hidden_size = embedded["inputs_embeds"].shape[-1]
+                embedded["inputs_embeds"][0, image_mask] = image_features.reshape(-1, hidden_size)[:image_mask.sum()]
+
+            decoder_inputs = {model_input.name for model_input in self.decoder_session.get_inputs()}
+            output_names = [output.name for output in self.decoder_session.get_outputs()]
+            past = self._empty_past()
+            past_length = 0
+            generated = []
+            emitted = ""
+
+            for _ in range(self.max_new_tokens):
+                sequence_length = embedded["inputs_embeds"].shape[1]
+                feeds = dict(past)
+                feeds.update({name: value for name, value in embedded.items() if name in decoder_inputs})
+                if "position_ids" in decoder_inputs:
+                    feeds["position_ids"] = np.arange(
+                        past_length, past_length + sequence_length, dtype=np.int64
+                    )[None, :]
+                if "attention_mask" in decoder_inputs:
+                    feeds["attention_mask"] = np.ones((1, past_length + sequence_length), dtype=np.int64)
+
+                outputs = dict(zip(output_names, self.decoder_session.run(None, feeds)))
+                past = {
+                    name.replace("present", "past_key_values", 1): value
+                    for name, value in outputs.items() if name.startswith("present")
+                }
+                past_length += sequence_length
+
+                token = int(np.argmax(outputs["logits"][0, -1]))
+                if token in self.eos_token_ids:
+                    break
+                generated.append(token)
+
+                text = self.processor.tokenizer.decode(generated, skip_special_tokens=True)
+                # Only emit once the decoded prefix is stable (multi-byte characters can span tokens)
+                if text.startswith(emitted) and len(text) > len(emitted):
+                    yield text[len(emitted):]
+                    emitted = text
+
+                embedded = self._embed(np.array([[token]], dtype=np.int64))
+
+            self.generate_count += 1
+            self.generate_seconds_total += time.perf_counter() - start
+
+    def generate(self, image, question):
+        return "".join(self.stream(image, question))
+
+    def close(self):
+        with self._load_lock, self._generate_lock:
+            self.vision_session = None
+            self.embed_session = None
+            self.decoder_session = None
+            self.processor = None
+
+    def stats(self):
+        return {
+            "backend": self.name,
+            "model_dir": self.model_dir,
+            "load_seconds": round(self.load_seconds, 3),
+            "generate_count": self.generate_count,
+            "generate_seconds_total": round(self.generate_seconds_total, 3)
+        }
@@ -0,0 +1,81 @@
+import threading
+import time
+from ai_integrations.backends.base_backend import InferenceBackend
+from config import STUB_TOKENS_PER_SECOND, GEMMA_MAX_NEW_TOKENS
+
+
+class StubBackend(InferenceBackend):
+    """
+    Deterministic stand-in for the vision-language model.
+
+    Produces the same answer for the same question and image size, one word-token at
+    a time at `tokens_per_second`, without loading any model. Used to benchmark and
+    test the rest of the pipeline (capture, STT, TTS, caching, batching) on any
+    Linux box.
+
+    Args:
+        tokens_per_second (float): Simulated decode speed; 0 or less means no delay.
+        max_new_tokens (int): Maximum number of tokens per answer.
+        load_seconds (float): Simulated load time.
+    """
+
+    name = "stub"
+
+    def __init__(self, tokens_per_second=STUB_TOKENS_PER_SECOND, max_new_tokens=GEMMA_MAX_NEW_TOKENS,
+                 load_seconds=0.0):
+        self.tokens_per_second = tokens_per_second
+        self.max_new_tokens = max_new_tokens
+        self.load_seconds = load_seconds
+        self._ready = False
+        self._lock = threading.Lock()
+        self.generate_count = 0
+        self.tokens_total = 0
+
+    @property
+    def is_ready(self):
+        return self._ready
+
+    def load(self):
+        if not self._ready:
+            time.sleep(self.load_seconds)
+            self._ready = True
+        return True
+
+    def _answer_tokens(self, image, question):
+        """
+        Builds the deterministic answer for a request.
+
+        Returns:
+            list[str]: Answer tokens, each with its leading space except the first.
+        """
+        size = getattr(image, "size", None) or tuple(getattr(image, "shape", (0, 0))[1::-1])
+        words = f"This is a stub answer about a {size[0]}x{size[1]} image. You asked: {question}".split()
+        words = words[:self.max_new_tokens]
+        return [word if index == 0 else f" {word}" for index, word in enumerate(words)]
+
+    def stream(self, image, question):
+        self.load()
+        tokens = self._answer_tokens(image, question)
+        delay = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        for token in tokens:
+            if delay:
+                time.sleep(delay)
+            yield token
+        with self._lock:
+            self.generate_count += 1
+            self.tokens_total += len(tokens)
+
+    def generate(self, image, question):
+        return "".join(self.stream(image, question))
+
+    def close(self):
+        self._ready = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.name,
+                "tokens_per_second": self.tokens_per_second,
+                "generate_count": self.generate_count,
+                "tokens_total": self.tokens_total
+            }
@@ -0,0 +1,45 @@
+from ai_integrations.backends.base_backend import InferenceBackend
+from ai_integrations.gemma_3n import gemma_holder
+
+
+class TransformersBackend(InferenceBackend):
+    """
+    Gemma 3n through Hugging Face Transformers and PyTorch.
+
+    Thin adapter over a `GemmaModelHolder`; by default the process-wide `gemma_holder`,
+    so the model is shared with `init_ai` / `stream_ai`.
+
+    Args:
+        holder (GemmaModelHolder, optional): Holder to use instead of the shared one.
+        get_lang (object, optional): Object with method load_language() returning {"language": code};
+            passed with every call, so speculative decoding uses the user's draft model without
+            changing the language source of other users of the shared holder.
+    """
+
+    name = "transformers"
+
+    def __init__(self, holder=None, get_lang=None):
+        self.holder = holder if holder is not None else gemma_holder
+        self.get_lang = get_lang
+
+    @property
+    def is_ready(self):
+        return self.holder.is_ready
+
+    def load(self):
+        return self.holder.load()
+
+    def generate(self, image, question):
+        return self.holder.generate(image, question, get_lang=self.get_lang)
+
+    def stream(self, image, question):
+        return self.holder.stream(image, question, get_lang=self.get_lang)
+
+    def generate_batch(self, images, questions):
+        return self.holder.generate_batch(images, questions)
+
+    def close(self):
+        self.holder.unload()
+
+    def stats(self):
+        return {"backend": self.name, **self.holder.stats()}
@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from config import INFERENCE_BATCH_MAX_SIZE, INFERENCE_BATCH_MAX_WAIT_MS
+
+
+class _PendingRequest:
+    """
+    A single (image, question) request waiting for its batched answer.
+
+    Attributes:
+        image (PIL.Image.Image): The image to analyze.
+        question (str): The user's question.
+        enqueued_at (float): `time.perf_counter()` value when the request was queued.
+        done (threading.Event): Set once `result` or `error` is available.
+        result (str): The generated answer.
+        error (Exception): The error raised by the batch, if any.
+    """
+
+    def __init__(self, image, question):
+        self.image = image
+        self.question = question
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchScheduler:
+    """
+    Collects concurrent inference requests and runs them as one batched generate call.
+
+    A background worker takes the first pending request, then keeps collecting requests
+    until either `max_batch_size` is reached or `max_wait_seconds` has passed, runs
+    `generate_batch` once and routes each answer back to its waiting caller.
+
+    Args:
+        generate_batch (Callable): Function taking `(images, questions)` lists and
+                                   returning a list of answers in the same order,
+                                   e.g. `GemmaModelHolder.generate_batch`.
+        max_batch_size (int): Maximum number of requests per batch.
+        max_wait_seconds (float): Maximum time to wait for a batch to fill up.
+    """
+
+    def __init__(self, generate_batch, max_batch_size=INFERENCE_BATCH_MAX_SIZE,
+                 max_wait_seconds=INFERENCE_BATCH_MAX_WAIT_MS / 1000):
+        self.generate_batch = generate_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests_total = 0
+        self.batches_total = 0
+        self.batched_requests_total = 0
+        self.largest_batch = 0
+        self.max_queue_depth = 0
+        self.queue_wait_seconds_total = 0.0
+        self.batch_seconds_total = 0.0
+
+    def start(self):
+        """
+        Starts the background worker if it is not running yet.
+        """
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+                self._worker.start()
+
+    def stop(self):
+        """
+        Stops the background worker after the batches already queued are served.
+        """
+        with self._start_lock:
+            if self._worker is not None and self._worker.is_alive():
+                self._queue.put(None)
+                self._worker.join()
+            self._worker = None
+
+    def submit(self, image, question, timeout=None):
+        """
+        Queues a request and blocks until its answer is ready.
+
+        Args:
+            image (PIL.Image.Image): The image to analyze.
+            question (str): The user's question.
+            timeout (float, optional): Maximum seconds to wait for the answer.
+
+        Returns:
+            str: The generated answer.
+
+        Raises:
+            TimeoutError: If no answer arrives within `timeout`.
+            Exception: Whatever `generate_batch` raised for this batch.
+        """
+        self.start()
+        request = _PendingRequest(image, question)
+        self._queue.put(request)
+
+        with self._stats_lock:
+            self.requests_total += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+        if not request.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for a batched inference result.")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def generate(self, image_pil, text):
+        """
+        Drop-in replacement for `init_ai` that goes through the scheduler.
+
+        Args:
+            image_pil (PIL.Image.Image): The image to analyze.
+            text (str): The user's question.
+
+        Returns:
+            str: The generated answer.
+        """
+        return self.submit(image_pil, text)
+
+    def _collect_batch(self):
+        """
+        Blocks for the first request, then gathers more until the batch is full or the wait expires.
+
+        Returns:
+            tuple: (list of _PendingRequest, bool stop_requested)
+        """
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+        return batch, False
+
+    def _run_batch(self, batch):
+        """
+        Runs one batched generate call and hands each result to its caller.
+
+        Args:
+            batch (list): The _PendingRequest objects to serve.
+        """
+        started = time.perf_counter()
+        try:
+            answers = self.generate_batch(
+                [request.image for request in batch],
+                [request.question for request in batch]
+            )
+            if len(answers) != len(batch):
+                raise RuntimeError(f"Batch returned {len(answers)} answers for {len(batch)} requests.")
+            for request, answer in zip(batch, answers):
+                request.result = answer
+        except Exception as e:
+            print(f"Error running inference batch of {len(batch)}: {e}")
+            for request in batch:
+                request.error = e
+
+        finished = time.perf_counter()
+        with self._stats_lock:
+            self.batches_total += 1
+            self.batched_requests_total += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.batch_seconds_total += finished - started
+            self.queue_wait_seconds_total += sum(started - request.enqueued_at for request in batch)
+
+        for request in batch:
+            request.done.set()
+
+    def _run(self):
+        """
+        Worker loop: collect a batch, run it, repeat until stopped.
+        """
+        while True:
+            batch, stop_requested = self._collect_batch()
+            if batch:
+                self._run_batch(batch)
+            if stop_requested:
+                break
+
+    def stats(self):
+        """
+        Returns queue-depth and batching metrics.
+
+        Returns:
+            dict: Current and maximum queue depth, request and batch counts,
+                  average batch size and average time spent waiting in the queue.
+        """
+        with self._stats_lock:
+            served = self.batched_requests_total
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "requests_total": self.requests_total,
+                "batches_total": self.batches_total,
+                "largest_batch": self.largest_batch,
+                "avg_batch_size": round(served / self.batches_total, 2) if self.batches_total else 0.0,
+                "avg_queue_wait_seconds": round(self.queue_wait_seconds_total / served, 4) if served else 0.0,
+                "batch_seconds_total": round(self.batch_seconds_total, 3)
+            }
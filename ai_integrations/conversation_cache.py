@@ -0,0 +1,116 @@
+import threading
+
+
+class ConversationCache:
+    """
+    Per-session cache of the current image's prefix state for follow-up questions.
+
+    When the user keeps asking about the "same picture", the image is encoded and the
+    prompt prefix prefilled only once; every later question reuses the cached
+    `past_key_values` and only prefills its own tokens.
+
+    Args:
+        holder (GemmaModelHolder): Resident model used to build prefixes and generate.
+        get_lang (object, optional): Language source passed to the holder with every question.
+
+    Attributes:
+        hits (int): Questions answered from an existing prefix.
+        misses (int): Questions that had to build a new prefix.
+        evictions (int): Prefixes dropped because the image changed or the session ended.
+        prefill_seconds_saved (float): Sum of the prefill time skipped on hits.
+    """
+
+    def __init__(self, holder, get_lang=None):
+        self.holder = holder
+        self.get_lang = get_lang
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefill_seconds_saved = 0.0
+
+    def _get_prefix(self, session_id, image):
+        """
+        Returns the cached prefix for this session's image, building it on a miss.
+
+        Args:
+            session_id (str): Identifier of the interaction session.
+            image (PIL.Image.Image): The current image.
+
+        Returns:
+            dict: Prefix state from `GemmaModelHolder.build_prefix_cache`.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and entry["image"] is image:
+                self.hits += 1
+                self.prefill_seconds_saved += entry["prefix"]["prefill_seconds"]
+                return entry["prefix"]
+
+        prefix = self.holder.build_prefix_cache(image)
+        with self._lock:
+            if session_id in self._entries:
+                self.evictions += 1
+            self._entries[session_id] = {"image": image, "prefix": prefix}
+            self.misses += 1
+        return prefix
+
+    def generate(self, session_id, image, text):
+        """
+        Answers a question about the session's current image.
+
+        Args:
+            session_id (str): Identifier of the interaction session.
+            image (PIL.Image.Image): The current image.
+            text (str): The user's question.
+
+        Returns:
+            str: The generated answer.
+        """
+        return self.holder.generate(
+            image, text, prefix_cache=self._get_prefix(session_id, image), get_lang=self.get_lang
+        )
+
+    def stream(self, session_id, image, text):
+        """
+        Streams the answer to a question about the session's current image.
+
+        Args:
+            session_id (str): Identifier of the interaction session.
+            image (PIL.Image.Image): The current image.
+            text (str): The user's question.
+
+        Returns:
+            Iterator[str]: Decoded text chunks in generation order.
+        """
+        return self.holder.stream(
+            image, text, prefix_cache=self._get_prefix(session_id, image), get_lang=self.get_lang
+        )
+
+    def evict(self, session_id):
+        """
+        Drops the cached prefix of a session, e.g. when the user asks for a new picture.
+
+        Args:
+            session_id (str): Identifier of the interaction session.
+        """
+        with self._lock:
+            if self._entries.pop(session_id, None) is not None:
+                self.evictions += 1
+
+    def stats(self):
+        """
+        Returns cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, live sessions and prefill time saved.
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "prefill_seconds_saved": round(self.prefill_seconds_saved, 3)
+            }
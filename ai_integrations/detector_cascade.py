@@ -0,0 +1,236 @@
+import re
+import threading
+import time
+from config import DETECTOR_ANSWER_CONFIDENCE
+
+# Question words for each detector label. Words the detector cannot verify ("man", "woman")
+# are left out, so such questions go to Gemma.
+LABEL_WORDS = {
+    "person": {"person", "people", "someone", "somebody", "anyone", "anybody", "human", "humans"},
+    "face": {"face", "faces"},
+    "car": {"car", "cars", "vehicle", "vehicles"},
+    "bus": {"bus", "buses"},
+    "bicycle": {"bicycle", "bicycles", "bike", "bikes"},
+    "motorbike": {"motorbike", "motorbikes", "motorcycle", "motorcycles"},
+    "dog": {"dog", "dogs"},
+    "cat": {"cat", "cats"},
+    "bird": {"bird", "birds"},
+    "chair": {"chair", "chairs", "seat", "seats"},
+    "sofa": {"sofa", "sofas", "couch", "couches"},
+    "diningtable": {"table", "tables"},
+    "bottle": {"bottle", "bottles"},
+    "pottedplant": {"plant", "plants"},
+    "tvmonitor": {"tv", "television", "monitor", "screen"}
+}
+
+# How labels are spoken (singular, plural)
+SPOKEN_LABELS = {
+    "person": ("person", "people"),
+    "face": ("face", "faces"),
+    "bus": ("bus", "buses"),
+    "diningtable": ("table", "tables"),
+    "pottedplant": ("plant", "plants"),
+    "tvmonitor": ("TV screen", "TV screens"),
+    "sofa": ("sofa", "sofas")
+}
+
+# Questions asking for a general look at what is ahead
+OVERVIEW_PATTERNS = (
+    "what is in front of me", "what's in front of me", "whats in front of me",
+    "what do you see", "what can you see", "what is ahead", "what's ahead"
+)
+
+# Question openings the detector can answer
+PRESENCE_PREFIXES = ("is there", "are there", "do you see", "can you see", "is anyone", "is someone")
+COUNT_PREFIXES = ("how many",)
+
+# Words that may follow those openings without changing the question; any other word
+# ("with a red shirt", "not wearing masks") is a qualifier the detector cannot check
+FILLER_WORDS = {
+    "a", "an", "any", "some", "the", "is", "are", "there", "here", "in", "front", "of", "me",
+    "you", "can", "see", "around", "ahead", "right", "now"
+}
+
+
+def spoken_label(label, count=1):
+    """
+    Returns the spoken name of a detector label.
+    """
+    singular, plural = SPOKEN_LABELS.get(label, (label, f"{label}s"))
+    return singular if count == 1 else plural
+
+
+class DetectorCascade:
+    """
+    Two-tier answering: a fast local detector first, Gemma only when needed.
+
+    Tier 1 answers directly when the question is one the detector can settle and its
+    detections are confident enough:
+    - presence ("is there a person?", "do you see a dog?") and counting ("how many
+      people?") when the object is found and every detection of it is confident
+    - overview ("what is in front of me?") when the object detector ran and every
+      object it reported is confident
+    Anything else escalates to Gemma with the detections appended to the question as
+    context: "not found" (a miss is not proof of absence), questions with qualifiers
+    ("a man with a red shirt"), and answers that would rest on Haar faces alone.
+
+    Args:
+        detector (LocalDetector): The tier-1 detector.
+        answer_confidence (float): Minimum detection confidence for a direct answer.
+
+    Attributes:
+        tier_counts (dict): {"detector" | "gemma": questions answered at that tier}.
+        tier_seconds (dict): {"detector" | "gemma": total seconds spent in that tier}.
+    """
+
+    def __init__(self, detector, answer_confidence=DETECTOR_ANSWER_CONFIDENCE):
+        self.detector = detector
+        self.answer_confidence = answer_confidence
+        self.tier_counts = {"detector": 0, "gemma": 0}
+        self.tier_seconds = {"detector": 0.0, "gemma": 0.0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _asked_labels(words):
+        """
+        Returns the detector labels the question mentions.
+        """
+        return [label for label, label_words in LABEL_WORDS.items() if words & label_words]
+
+    @staticmethod
+    def _remainder(text, prefixes):
+        """
+        Returns the words after the first matching prefix, or None when no prefix matches.
+        """
+        for prefix in prefixes:
+            if text == prefix or text.startswith(f"{prefix} "):
+                return set(text[len(prefix):].split())
+        return None
+
+    def _direct_answer(self, question, detections):
+        """
+        Answers from the detections when the question allows it.
+
+        Args:
+            question (str): The user's question.
+            detections (list[dict]): Output of `LocalDetector.detect`.
+
+        Returns:
+            str or None: The answer, or None to escalate.
+        """
+        text = re.sub(r"[^\w\s']", " ", question.lower())
+        text = " ".join(text.split())
+        words = set(text.split())
+        # Haar faces carry a made-up score, so only object detections can answer
+        objects = [detection for detection in detections if detection["label"] != "face"]
+        confident = [detection for detection in objects if detection["confidence"] >= self.answer_confidence]
+
+        asked = self._asked_labels(words)
+        if asked:
+            label = asked[0]
+            for prefixes, answer in ((PRESENCE_PREFIXES, "Yes, I can see {} in front of you."),
+                                     (COUNT_PREFIXES, "I can see {}.")):
+                remainder = self._remainder(text, prefixes)
+                if remainder is None:
+                    continue
+                if remainder - LABEL_WORDS[label] - FILLER_WORDS:
+                    return None
+                matching = [detection for detection in objects if detection["label"] == label]
+                # An unsure detection of the same object would make the count a confident undercount
+                if not matching or any(detection["confidence"] < self.answer_confidence for detection in matching):
+                    return None
+                return answer.format(f"{len(matching)} {spoken_label(label, len(matching))}")
+
+        overview = self._remainder(text, OVERVIEW_PATTERNS)
+        if overview is not None:
+            if overview - FILLER_WORDS or not self.detector.has_object_model:
+                return None
+            if not confident or len(confident) != len(objects):
+                return None
+            counts = {}
+            for detection in confident:
+                counts[detection["label"]] = counts.get(detection["label"], 0) + 1
+            parts = [f"{found} {spoken_label(label, found)}" for label, found in counts.items()]
+            listed = parts[0] if len(parts) == 1 else f"{', '.join(parts[:-1])} and {parts[-1]}"
+            return f"I can see {listed} in front of you."
+
+        return None
+
+    @staticmethod
+    def _context(question, detections):
+        """
+        Appends what was detected to the question as context for Gemma.
+
+        Only labels and counts are given: the scores change with every capture (and Haar
+        faces have none), so they would only make the prompt differ between re-captures.
+        """
+        if not detections:
+            return question
+        counts = {}
+        for detection in detections:
+            counts[detection["label"]] = counts.get(detection["label"], 0) + 1
+        found = ", ".join(f"{count} {spoken_label(label, count)}" for label, count in list(counts.items())[:8])
+        return f"{question} (An object detector found: {found}.)"
+
+    def triage(self, question, image):
+        """
+        Runs tier 1 on a question.
+
+        Args:
+            question (str): The user's question.
+            image (PIL.Image.Image): The image it is about.
+
+        Returns:
+            tuple: (answer, prompt) - the direct answer and None, or None and the
+                   question with detection context to send to Gemma.
+        """
+        start = time.perf_counter()
+        try:
+            detections = self.detector.detect(image)
+        except Exception as e:
+            print(f"Local detector failed, asking Gemma directly: {e}")
+            detections = []
+        answer = self._direct_answer(question, detections)
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            self.tier_seconds["detector"] += seconds
+            if answer is not None:
+                self.tier_counts["detector"] += 1
+        print(f"🔎 Detector: {len(detections)} detections in {seconds * 1000:.0f}ms -> "
+              f"{'answered' if answer is not None else 'escalating to Gemma'}")
+        if answer is not None:
+            return answer, None
+        return None, self._context(question, detections)
+
+    def record_escalation(self, seconds):
+        """
+        Records the Gemma time of an escalated question.
+
+        Args:
+            seconds (float): Time Gemma took, or None when the answer came from cache.
+        """
+        with self._lock:
+            self.tier_counts["gemma"] += 1
+            if seconds is not None:
+                self.tier_seconds["gemma"] += seconds
+
+    def stats(self):
+        """
+        Returns the share of questions answered and the average latency per tier.
+
+        Returns:
+            dict: {tier: {"answered", "share", "avg_seconds"}}; the detector's average covers
+                  every question, since tier 1 runs on all of them.
+        """
+        with self._lock:
+            total = sum(self.tier_counts.values())
+            result = {}
+            for tier, answered in self.tier_counts.items():
+                runs = total if tier == "detector" else answered
+                result[tier] = {
+                    "answered": answered,
+                    "share": round(answered / total, 3) if total else 0.0,
+                    "avg_seconds": round(self.tier_seconds[tier] / runs, 4) if runs else 0.0
+                }
+            return result
@@ -1,12 +1,721 @@
-from transformers import AutoProcessor, AutoModelForImageTextToText
+import copy
+import threading
+import time
+import os
+import cv2
+import PIL.Image
+from transformers import (
+    AutoProcessor, AutoModelForImageTextToText, AutoModelForCausalLM, AutoTokenizer,
+    TextIteratorStreamer, DynamicCache, StoppingCriteria, StoppingCriteriaList
+)
 import torch
+from config import (
+    GEMMA_MODEL_PATH, GEMMA_MAX_NEW_TOKENS, GEMMA_PRECISION,
+    GEMMA_SPECULATIVE_DECODING, GEMMA_NUM_ASSISTANT_TOKENS, LANG_SETTINGS
+)
+from camera.preprocess import FramePreprocessor
+
+# Supported precision modes for CPU inference
+PRECISION_MODES = ("fp32", "bf16", "int8")
+
+
+class _StopWhenCancelled(StoppingCriteria):
+    """
+    Stops a streamed generation once its caller has stopped reading.
+    """
+
+    def __init__(self, cancelled):
+        self.cancelled = cancelled
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.cancelled.is_set(), dtype=torch.bool, device=input_ids.device)
+
+
+class GemmaModelHolder:
+    """
+    Keeps the Gemma 3n processor and model resident in memory for the whole process.
+
+    The model is loaded once (lazily on first use, or eagerly via `load()`) and then
+    reused for every question, so each turn only pays for generation.
+
+    Attributes:
+        model_path (str): Local directory of the pre-trained model.
+        max_new_tokens (int): Maximum number of tokens generated per answer.
+        precision (str): "fp32", "bf16" or "int8" (dynamic int8 quantization of linear layers).
+        processor (AutoProcessor): Loaded processor, or None before loading.
+        model (AutoModelForImageTextToText): Loaded model, or None before loading.
+        frame_preprocessor (FramePreprocessor): Camera frame to pixel tensor converter, or None before loading.
+        load_state (str): One of "not_loaded", "loading", "ready" or "failed".
+        load_error (str): Error message of the last failed load, if any.
+        load_seconds (float): Time spent loading the processor and model.
+        generate_count (int): Number of completed generate calls.
+        generate_seconds_total (float): Total time spent in generate calls.
+        last_generate_seconds (float): Duration of the most recent generate call.
+        last_first_chunk_seconds (float): Time to the first streamed text chunk of the most recent stream call.
+        speculative (bool): Whether single-request calls use the language's draft model.
+        num_assistant_tokens (int): Tokens the draft model proposes per verification step.
+        get_lang (object, optional): Default language source, object with method load_language()
+            returning {"language": code}; callers sharing the holder pass their own per call.
+    """
+
+    def __init__(self, model_path=GEMMA_MODEL_PATH, max_new_tokens=GEMMA_MAX_NEW_TOKENS,
+                 precision=GEMMA_PRECISION, speculative=GEMMA_SPECULATIVE_DECODING,
+                 num_assistant_tokens=GEMMA_NUM_ASSISTANT_TOKENS, get_lang=None):
+        """
+        Initializes the holder without loading anything.
+
+        Args:
+            model_path (str): Local directory of the pre-trained model.
+            max_new_tokens (int): Maximum number of tokens generated per answer.
+            precision (str): One of `PRECISION_MODES`.
+            speculative (bool): Enables speculative decoding with the per-language draft model.
+            num_assistant_tokens (int): Tokens proposed by the draft model per step.
+            get_lang (object, optional): Language source used to pick the draft model.
+
+        Raises:
+            ValueError: If the precision mode is not supported.
+        """
+        if precision not in PRECISION_MODES:
+            raise ValueError(f"Unsupported precision '{precision}'. Choose one of {PRECISION_MODES}.")
+        self.model_path = model_path
+        self.max_new_tokens = max_new_tokens
+        self.precision = precision
+        self.processor = None
+        self.model = None
+        self.frame_preprocessor = None
+        self.load_state = "not_loaded"
+        self.load_error = None
+        self.load_seconds = 0.0
+        self.generate_count = 0
+        self.generate_seconds_total = 0.0
+        self.last_generate_seconds = 0.0
+        self.last_first_chunk_seconds = 0.0
+        self.speculative = speculative
+        self.num_assistant_tokens = num_assistant_tokens
+        self.get_lang = get_lang
+        self._draft_models = {}
+        self._target_forwards = 0
+        self._draft_forwards = 0
+        self.speculative_count = 0
+        self.speculative_new_tokens = 0
+        self.speculative_accepted_tokens = 0
+        self.speculative_proposed_tokens = 0
+        self.speculative_seconds_total = 0.0
+        self._load_lock = threading.Lock()
+        self._generate_lock = threading.Lock()
+
+    @property
+    def is_ready(self):
+        """bool: True once the processor and model are loaded."""
+        return self.load_state == "ready"
+
+    def load(self):
+        """
+        Loads the processor and model if they are not resident yet.
+
+        Safe to call from several threads; only the first caller performs the load.
+
+        Returns:
+            bool: True when the model is ready.
+
+        Raises:
+            Exception: If the processor or model cannot be loaded.
+        """
+        if self.is_ready:
+            return True
+
+        with self._load_lock:
+            if self.is_ready:
+                return True
+
+            self.load_state = "loading"
+            start = time.perf_counter()
+            try:
+                self.processor = AutoProcessor.from_pretrained(self.model_path)
+                self.model = self._load_model()
+                # Left padding keeps every prompt's last token aligned for batched generation
+                self.processor.tokenizer.padding_side = "left"
+                self.frame_preprocessor = FramePreprocessor.from_image_processor(self.processor.image_processor)
+            except Exception as e:
+                self.load_state = "failed"
+                self.load_error = str(e)
+                print(f"Error loading Gemma model from {self.model_path}: {e}")
+                raise
+
+            self.load_seconds = time.perf_counter() - start
+            self.load_error = None
+            self.load_state = "ready"
+            print(f"🧠 Gemma model ({self.precision}) loaded from {self.model_path} in {self.load_seconds:.1f}s")
+        return True
+
+    def unload(self):
+        """
+        Releases the processor and model so their memory can be reclaimed.
+        """
+        with self._load_lock, self._generate_lock:
+            self.processor = None
+            self.model = None
+            self.frame_preprocessor = None
+            self._draft_models = {}
+            self.load_state = "not_loaded"
+
+    def _load_model(self):
+        """
+        Loads the model weights in the configured precision.
+
+        - fp32: weights as float32
+        - bf16: weights as bfloat16
+        - int8: float32 weights, then dynamic int8 quantization of every `nn.Linear`
+
+        Returns:
+            torch.nn.Module: The model in eval mode.
+        """
+        dtype = torch.bfloat16 if self.precision == "bf16" else torch.float32
+        model = AutoModelForImageTextToText.from_pretrained(self.model_path, torch_dtype=dtype)
+        model.eval()
+        if self.precision == "int8":
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        # Every target forward pass yields exactly one token, which is how speculative acceptance is measured
+        model.register_forward_hook(self._count_target_forward)
+        return model
+
+    def _count_target_forward(self, module, inputs, outputs):
+        """Forward hook counting passes of the main model."""
+        self._target_forwards += 1
+
+    def _count_draft_forward(self, module, inputs, outputs):
+        """Forward hook counting passes of the draft model (one proposed token each)."""
+        self._draft_forwards += 1
+
+    def _current_language(self, get_lang=None):
+        """
+        Reads the user's language from `get_lang`, or from the holder's default source.
+
+        Args:
+            get_lang (object, optional): Language source of this call.
+
+        Returns:
+            str: Language code, or None when no language source is set or it cannot be read.
+        """
+        get_lang = get_lang if get_lang is not None else self.get_lang
+        if get_lang is None:
+            return None
+        try:
+            return get_lang.load_language().get("language")
+        except Exception as e:
+            print(f"Could not read the language for speculative decoding: {e}")
+            return None
+
+    def _get_draft_model(self, draft_path):
+        """
+        Loads a draft model once and keeps it next to the main model.
+
+        The draft runs on CPU in the main model's dtype (float32 for int8, whose
+        quantized layers still exchange float32 activations).
+
+        Args:
+            draft_path (str): Local directory of the draft model.
+
+        Returns:
+            dict: {"model": causal LM in eval mode, "tokenizer": its tokenizer,
+                   "same_vocab": True when it shares the main model's vocabulary}
+        """
+        draft = self._draft_models.get(draft_path)
+        if draft is not None:
+            return draft
+
+        start = time.perf_counter()
+        dtype = torch.bfloat16 if self.precision == "bf16" else torch.float32
+        model = AutoModelForCausalLM.from_pretrained(draft_path, torch_dtype=dtype)
+        model.eval()
+        model.register_forward_hook(self._count_draft_forward)
+        tokenizer = AutoTokenizer.from_pretrained(draft_path)
+        draft = {
+            "model": model,
+            "tokenizer": tokenizer,
+            "same_vocab": len(tokenizer) == len(self.processor.tokenizer)
+        }
+        self._draft_models[draft_path] = draft
+        print(f"🧠 Draft model loaded from {draft_path} in {time.perf_counter() - start:.1f}s")
+        return draft
+
+    def _speculative_kwargs(self, get_lang=None):
+        """
+        Builds the `generate` arguments for speculative decoding in the user's language.
+
+        Args:
+            get_lang (object, optional): Language source of this call; defaults to the holder's.
+
+        The draft model proposes `num_assistant_tokens` tokens and the main model
+        verifies them in a single forward pass. Decoding is greedy, so the answer is
+        token-for-token the one plain greedy decoding would produce. Draft models
+        with a different vocabulary go through universal assisted decoding, which
+        re-tokenizes between the two tokenizers.
+
+        Returns:
+            dict: Extra `generate` keyword arguments; empty when speculation is off,
+                  no draft is configured for the language, or the draft cannot be loaded.
+        """
+        if not self.speculative:
+            return {}
+
+        draft_path = LANG_SETTINGS.get(self._current_language(get_lang), {}).get("gemma_draft_model_path")
+        if not draft_path or not os.path.isdir(draft_path):
+            return {}
+
+        try:
+            draft = self._get_draft_model(draft_path)
+        except Exception as e:
+            print(f"Error loading draft model from {draft_path}, decoding without it: {e}")
+            self._draft_models[draft_path] = None
+            return {}
+        if draft is None:
+            return {}
+
+        kwargs = {
+            "assistant_model": draft["model"],
+            "num_assistant_tokens": self.num_assistant_tokens,
+            "do_sample": False
+        }
+        if not draft["same_vocab"]:
+            kwargs["tokenizer"] = self.processor.tokenizer
+            kwargs["assistant_tokenizer"] = draft["tokenizer"]
+        return kwargs
+
+    def _record_speculative(self, new_tokens, target_forwards, draft_forwards, seconds):
+        """
+        Updates the speculative decoding counters for one call.
+
+        Each verification pass of the main model emits one token of its own, so the
+        tokens accepted from the draft are the new tokens minus the main model's passes.
+
+        Args:
+            new_tokens (int): Tokens generated by the call.
+            target_forwards (int): Main model forward passes during the call.
+            draft_forwards (int): Draft model forward passes (proposed tokens) during the call.
+            seconds (float): Duration of the call.
+        """
+        self.speculative_count += 1
+        self.speculative_new_tokens += new_tokens
+        self.speculative_accepted_tokens += max(new_tokens - target_forwards, 0)
+        self.speculative_proposed_tokens += draft_forwards
+        self.speculative_seconds_total += seconds
+
+    def _prepare_inputs(self, image_pil, text, prefix_cache=None):
+        """
+        Builds the model inputs for an image and a question.
+
+        With a `prefix_cache` (see `build_prefix_cache`), only the question is tokenized:
+        it is appended to the cached image prefix and a copy of the prefix's
+        `past_key_values` is attached, so generation prefills the question tokens only.
+
+        Args:
+            image_pil (PIL.Image.Image or numpy.ndarray): The input image (arrays are RGB).
+            text (str): The user's question.
+            prefix_cache (dict, optional): Cached prefix state for this image.
+
+        Returns:
+            BatchFeature or dict: Model inputs on the model device.
+        """
+        if prefix_cache is None:
+            prompt = f"<image_soft_token> {text}"
+            return self.processor(text=prompt, images=image_pil, return_tensors="pt").to(
+                self.model.device, dtype=self.model.dtype
+            )
+
+        prefix_inputs = prefix_cache["prefix_inputs"]
+        question_ids = self.processor.tokenizer(
+            f" {text}", add_special_tokens=False, return_tensors="pt"
+        )["input_ids"].to(self.model.device)
+
+        model_inputs = {
+            "input_ids": torch.cat([prefix_inputs["input_ids"], question_ids], dim=-1),
+            "attention_mask": torch.cat(
+                [prefix_inputs["attention_mask"], torch.ones_like(question_ids)], dim=-1
+            )
+        }
+        if "token_type_ids" in prefix_inputs:
+            model_inputs["token_type_ids"] = torch.cat(
+                [prefix_inputs["token_type_ids"], torch.zeros_like(question_ids)], dim=-1
+            )
+        # generate() extends the cache in place, so every question works on its own copy
+        model_inputs["past_key_values"] = copy.deepcopy(prefix_cache["past_key_values"])
+        return model_inputs
+
+    def _prepare_frame_inputs(self, frame_bgr, text):
+        """
+        Builds the model inputs straight from an OpenCV frame.
+
+        The pixels go through `frame_preprocessor` (no PIL image, no second resize) and
+        only the prompt goes through the tokenizer, with the image placeholder expanded
+        the same way the processor does it. Processors without `full_image_sequence`
+        fall back to the regular PIL path.
+
+        Args:
+            frame_bgr (numpy.ndarray): Camera frame, shape (h, w, 3), BGR uint8.
+            text (str): The user's question.
+
+        Returns:
+            dict: Model inputs on the model device.
+        """
+        image_sequence = getattr(self.processor, "full_image_sequence", None)
+        boi_token = getattr(self.processor, "boi_token", None)
+        if image_sequence is None or boi_token is None:
+            image_pil = PIL.Image.fromarray(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB))
+            return self._prepare_inputs(image_pil, text)
+
+        # The processor expands the begin-of-image token into one placeholder per image feature
+        prompt = f"{boi_token} {text}"
+        model_inputs = dict(self.processor.tokenizer(
+            prompt.replace(boi_token, image_sequence), return_tensors="pt"
+        ).to(self.model.device))
+        image_token_id = getattr(self.processor, "image_token_id", None)
+        if image_token_id is not None:
+            model_inputs["token_type_ids"] = (model_inputs["input_ids"] == image_token_id).long()
+        # from_numpy shares the preprocessor's buffer; it is only reused under the generate lock
+        model_inputs["pixel_values"] = torch.from_numpy(self.frame_preprocessor(frame_bgr)).to(
+            self.model.device, dtype=self.model.dtype
+        )
+        return model_inputs
+
+    def build_prefix_cache(self, image_pil):
+        """
+        Runs the image prefix through the model once and keeps its attention state.
+
+        The vision encoder runs here and nowhere else for this image: follow-up
+        questions reuse the returned `past_key_values`, and because generation then
+        starts past the image tokens, the pixels are not encoded again.
+
+        Args:
+            image_pil (PIL.Image.Image): The image every follow-up question refers to.
+
+        Returns:
+            dict: {
+                "prefix_inputs": token ids, attention mask (and token type ids) of the prefix,
+                "past_key_values": DynamicCache holding the prefix keys and values,
+                "prefill_seconds": time spent encoding the image and prefilling the prefix
+            }
+        """
+        self.load()
+
+        with self._generate_lock:
+            start = time.perf_counter()
+            prefix_inputs = self.processor(
+                text="<image_soft_token>", images=image_pil, return_tensors="pt"
+            ).to(self.model.device, dtype=self.model.dtype)
+
+            with torch.inference_mode():
+                outputs = self.model(**prefix_inputs, past_key_values=DynamicCache(), use_cache=True)
+
+            prefill_seconds = time.perf_counter() - start
+
+        return {
+            "prefix_inputs": {key: value for key, value in prefix_inputs.items() if key != "pixel_values"},
+            "past_key_values": outputs.past_key_values,
+            "prefill_seconds": prefill_seconds
+        }
+
+    def _record_generate(self, seconds):
+        """Updates the generate timing counters."""
+        self.generate_count += 1
+        self.generate_seconds_total += seconds
+        self.last_generate_seconds = seconds
+
+    def generate(self, image_pil, text, prefix_cache=None, get_lang=None):
+        """
+        Generates an answer for the given image and question using the resident model.
+
+        Calls are serialized so the model is never used by two threads at once.
+
+        Args:
+            image_pil (PIL.Image.Image or numpy.ndarray): The input image (arrays are RGB; BGR camera
+                frames go through `generate_frame`).
+            text (str): The textual prompt to guide the model's response.
+            prefix_cache (dict, optional): Result of `build_prefix_cache` for this image.
+            get_lang (object, optional): Language source picking the draft model; defaults to the holder's.
+
+        Returns:
+            str: The generated textual output from the model.
+        """
+        self.load()
+
+        with self._generate_lock:
+            start = time.perf_counter()
+            return self._generate_from_inputs(self._prepare_inputs(image_pil, text, prefix_cache), start, get_lang)
+
+    def generate_frame(self, frame_bgr, text, get_lang=None):
+        """
+        Generates an answer straight from an OpenCV camera frame, skipping the PIL conversion.
+
+        Args:
+            frame_bgr (numpy.ndarray): Camera frame, shape (h, w, 3), BGR uint8.
+            text (str): The textual prompt to guide the model's response.
+            get_lang (object, optional): Language source picking the draft model; defaults to the holder's.
+
+        Returns:
+            str: The generated textual output from the model.
+        """
+        self.load()
+
+        with self._generate_lock:
+            start = time.perf_counter()
+            return self._generate_from_inputs(self._prepare_frame_inputs(frame_bgr, text), start, get_lang)
+
+    def _generate_from_inputs(self, model_inputs, start, get_lang=None):
+        """
+        Runs one generate call on prepared inputs; the caller holds the generate lock.
+
+        Args:
+            model_inputs (dict or BatchFeature): Inputs from `_prepare_inputs` or `_prepare_frame_inputs`.
+            start (float): `time.perf_counter()` when the request started.
+            get_lang (object, optional): Language source of this call.
+
+        Returns:
+            str: The decoded answer.
+        """
+        input_len = model_inputs["input_ids"].shape[-1]
+        speculative_kwargs = self._speculative_kwargs(get_lang)
+        target_forwards, draft_forwards = self._target_forwards, self._draft_forwards
+
+        with torch.inference_mode():
+            generation = self.model.generate(
+                **model_inputs, max_new_tokens=self.max_new_tokens, **speculative_kwargs
+            )
+            generation = generation[0][input_len:]
+
+        decoded = self.processor.decode(generation, skip_special_tokens=True)
+        seconds = time.perf_counter() - start
+        self._record_generate(seconds)
+        if speculative_kwargs:
+            self._record_speculative(
+                int(generation.shape[-1]),
+                self._target_forwards - target_forwards,
+                self._draft_forwards - draft_forwards,
+                seconds
+            )
+        return decoded
+
+    def generate_batch(self, images, texts):
+        """
+        Generates answers for several (image, question) pairs in one padded generate call.
+
+        Speculative decoding is not used here: assisted generation verifies one sequence at a time.
+
+        Args:
+            images (list[PIL.Image.Image]): One image per request.
+            texts (list[str]): One question per request, in the same order.
+
+        Returns:
+            list[str]: The generated answers, in request order.
+        """
+        self.load()
+
+        with self._generate_lock:
+            start = time.perf_counter()
+            prompts = [f"<image_soft_token> {text}" for text in texts]
+            model_inputs = self.processor(
+                text=prompts,
+                images=[[image] for image in images],
+                padding=True,
+                return_tensors="pt"
+            ).to(self.model.device, dtype=self.model.dtype)
+            input_len = model_inputs["input_ids"].shape[-1]
+
+            with torch.inference_mode():
+                generation = self.model.generate(**model_inputs, max_new_tokens=self.max_new_tokens)
+                generation = generation[:, input_len:]
+
+            decoded = self.processor.batch_decode(generation, skip_special_tokens=True)
+            self._record_generate(time.perf_counter() - start)
+        return decoded
+
+    def _generate_into_streamer(self, model_inputs, streamer, errors, generate_kwargs=None, result=None):
+        """
+        Runs generation in a background thread and pushes tokens into the streamer.
+
+        Args:
+            model_inputs (BatchFeature): Prepared model inputs.
+            streamer (TextIteratorStreamer): Streamer that receives the generated tokens.
+            errors (list): Receives the exception if generation fails.
+            generate_kwargs (dict, optional): Extra `generate` arguments (speculative decoding).
+            result (list, optional): Receives the generated sequences.
+        """
+        try:
+            with torch.inference_mode():
+                generation = self.model.generate(
+                    **model_inputs, max_new_tokens=self.max_new_tokens, streamer=streamer, **(generate_kwargs or {})
+                )
+            if result is not None:
+                result.append(generation)
+        except Exception as e:
+            errors.append(e)
+            streamer.end()
+
+    def stream(self, image_pil, text, prefix_cache=None, get_lang=None):
+        """
+        Generates an answer incrementally, yielding text as soon as it is decoded.
+
+        Generation runs in a background thread, so the caller can act on each chunk
+        (for example speak it) while decoding continues. That thread holds the generate
+        lock only until generation finishes; text reaches the caller through the streamer
+        queue, so a slow caller or one that never finishes reading does not block other
+        sessions. Closing the iterator early stops generation at the next token.
+
+        Args:
+            image_pil (PIL.Image.Image or numpy.ndarray): The input image (arrays are RGB; BGR camera
+                frames go through `generate_frame`).
+            text (str): The textual prompt to guide the model's response.
+            prefix_cache (dict, optional): Result of `build_prefix_cache` for this image.
+            get_lang (object, optional): Language source picking the draft model; defaults to the holder's.
+
+        Yields:
+            str: Decoded text chunks in generation order.
+
+        Raises:
+            Exception: If generation fails in the background thread.
+        """
+        self.load()
+
+        self._generate_lock.acquire()
+        try:
+            start = time.perf_counter()
+            model_inputs = self._prepare_inputs(image_pil, text, prefix_cache)
+            input_len = model_inputs["input_ids"].shape[-1]
+            speculative_kwargs = self._speculative_kwargs(get_lang)
+            target_forwards, draft_forwards = self._target_forwards, self._draft_forwards
+            streamer = TextIteratorStreamer(self.processor.tokenizer, skip_prompt=True, skip_special_tokens=True)
+            cancelled = threading.Event()
+            generate_kwargs = dict(
+                speculative_kwargs, stopping_criteria=StoppingCriteriaList([_StopWhenCancelled(cancelled)])
+            )
+            errors = []
+            result = []
+
+            def generate_and_release():
+                try:
+                    self._generate_into_streamer(model_inputs, streamer, errors, generate_kwargs, result)
+                    seconds = time.perf_counter() - start
+                    self._record_generate(seconds)
+                    if speculative_kwargs and result:
+                        self._record_speculative(
+                            int(result[0].shape[-1]) - input_len,
+                            self._target_forwards - target_forwards,
+                            self._draft_forwards - draft_forwards,
+                            seconds
+                        )
+                finally:
+                    self._generate_lock.release()
+
+            worker = threading.Thread(target=generate_and_release, daemon=True)
+            worker.start()
+        except Exception:
+            self._generate_lock.release()
+            raise
+
+        first_chunk = True
+        try:
+            for chunk in streamer:
+                if not chunk:
+                    continue
+                if first_chunk:
+                    self.last_first_chunk_seconds = time.perf_counter() - start
+                    first_chunk = False
+                yield chunk
+        finally:
+            # Reached early when the caller closes the iterator: stop decoding for nobody
+            cancelled.set()
+
+        worker.join()
+        if errors:
+            raise errors[0]
+
+    def profile(self, image_pil, text):
+        """
+        Answers a question while measuring prefill and per-token decode latency separately.
+
+        Prefill is timed with a one-token generation; the full answer is then generated
+        and the remaining time is spread over the extra tokens. Meant for benchmarks,
+        it costs roughly one extra prefill.
+
+        Args:
+            image_pil (PIL.Image.Image): The input image.
+            text (str): The user's question.
+
+        Returns:
+            dict: {"answer", "new_tokens", "prefill_seconds", "decode_seconds_per_token", "total_seconds"}
+        """
+        self.load()
+
+        with self._generate_lock:
+            model_inputs = self._prepare_inputs(image_pil, text)
+            input_len = model_inputs["input_ids"].shape[-1]
+
+            with torch.inference_mode():
+                start = time.perf_counter()
+                self.model.generate(**model_inputs, max_new_tokens=1)
+                prefill_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                generation = self.model.generate(**model_inputs, max_new_tokens=self.max_new_tokens)
+                total_seconds = time.perf_counter() - start
+
+            generation = generation[0][input_len:]
+            new_tokens = int(generation.shape[-1])
+            decode_seconds = max(total_seconds - prefill_seconds, 0.0)
+
+        return {
+            "answer": self.processor.decode(generation, skip_special_tokens=True),
+            "new_tokens": new_tokens,
+            "prefill_seconds": prefill_seconds,
+            "decode_seconds_per_token": decode_seconds / (new_tokens - 1) if new_tokens > 1 else 0.0,
+            "total_seconds": total_seconds
+        }
+
+    def stats(self):
+        """
+        Returns the load state and timing counters.
+
+        Speculative decoding is reported as the share of draft-proposed tokens the main
+        model accepted, and as effective tokens per second over speculative calls.
+
+        Returns:
+            dict: Load state, load time, generate timing and speculative decoding counters.
+        """
+        average = self.generate_seconds_total / self.generate_count if self.generate_count else 0.0
+        acceptance = self.speculative_accepted_tokens / self.speculative_proposed_tokens \
+            if self.speculative_proposed_tokens else 0.0
+        tokens_per_second = self.speculative_new_tokens / self.speculative_seconds_total \
+            if self.speculative_seconds_total else 0.0
+        return {
+            "model_path": self.model_path,
+            "precision": self.precision,
+            "load_state": self.load_state,
+            "load_error": self.load_error,
+            "load_seconds": round(self.load_seconds, 3),
+            "generate_count": self.generate_count,
+            "generate_seconds_total": round(self.generate_seconds_total, 3),
+            "generate_seconds_avg": round(average, 3),
+            "last_generate_seconds": round(self.last_generate_seconds, 3),
+            "last_first_chunk_seconds": round(self.last_first_chunk_seconds, 3),
+            "speculative": self.speculative,
+            "speculative_count": self.speculative_count,
+            "speculative_accepted_tokens": self.speculative_accepted_tokens,
+            "speculative_proposed_tokens": self.speculative_proposed_tokens,
+            "speculative_acceptance_rate": round(acceptance, 3),
+            "speculative_tokens_per_second": round(tokens_per_second, 2)
+        }
+
+
+# Process-wide holder shared by every interaction
+gemma_holder = GemmaModelHolder()
+
 
 def init_ai(image_pil, text):
     """
     Generates a textual response from a vision-language model using an image and a prompt.
 
     This function:
-    - Loads a pre-trained image-text-to-text model using Transformers
+    - Uses the process-wide `gemma_holder`, which loads the model only once
     - Prepares the input by combining the image with a textual prompt
     - Performs inference using the model in no-grad mode
     - Decodes the generated output into a human-readable string
@@ -20,28 +729,29 @@ def init_ai(image_pil, text):
 
     Notes:
         - Uses `AutoProcessor` and `AutoModelForImageTextToText` from Hugging Face
-        - Assumes the model is stored locally at `model_id` path
+        - Model location comes from `GEMMA_MODEL_PATH` in config
         - Uses `<image_soft_token>` to indicate image embedding in prompt
-        - Limits generation to `max_new_tokens=10` for brevity
+        - Limits generation to `GEMMA_MAX_NEW_TOKENS` for brevity
 
     Example:
         response = init_ai(image_pil, "Describe the scene for a blind user.")
     """
+    return gemma_holder.generate(image_pil, text)
 
-    model_id = "E:\Echo_Guide_Vision\models\google\gemma-3n-transformers-gemma-3n-e2b-v2"
-    processor = AutoProcessor.from_pretrained(model_id)
-
-    model = AutoModelForImageTextToText.from_pretrained(model_id)
-    
-    prompt = f"<image_soft_token> {text}"
 
-    model_inputs = processor(text=prompt, images=image_pil, return_tensors="pt").to(model.device)
+def stream_ai(image_pil, text):
+    """
+    Streams a textual response from the vision-language model chunk by chunk.
 
-    input_len = model_inputs["input_ids"].shape[-1]
+    Args:
+        image_pil (PIL.Image.Image): The input image in PIL format.
+        text (str): The textual prompt to guide the model's response.
 
-    with torch.inference_mode():
-        generation = model.generate(**model_inputs, max_new_tokens=10)
-        generation = generation[0][input_len:]
+    Returns:
+        Iterator[str]: Decoded text chunks in generation order.
 
-    decoded = processor.decode(generation, skip_special_tokens=True)
-    return decoded
\ No newline at end of file
+    Example:
+        for chunk in stream_ai(image_pil, "What is in front of me?"):
+            print(chunk, end="")
+    """
+    return gemma_holder.stream(image_pil, text)
@@ -0,0 +1,404 @@
+import atexit
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from config import (
+    INFERENCE_BACKEND, INFERENCE_WORKER_COUNT,
+    INFERENCE_WORKER_TIMEOUT_SECONDS, INFERENCE_WORKER_HEALTH_INTERVAL_SECONDS
+)
+
+"""
+Out-of-process Gemma inference.
+
+Protocol (plain dicts over multiprocessing queues):
+    parent -> worker:
+        {"op": "generate", "id": int, "shm_name": str, "shape": tuple, "dtype": str, "question": str}
+        {"op": "ping", "id": int}
+        None                                   # shutdown
+    worker -> parent:
+        {"type": "ready", "worker_id": int, "load_seconds": float, "error": str or None}
+        {"type": "response", "id": int, "worker_id": int, "ok": bool, "text": str, "error": str, "stats": dict}
+
+Image pixels never travel through the queues: the parent copies the RGB frame into a
+`SharedMemory` block and the worker maps it as a numpy array.
+"""
+
+
+def _worker_main(worker_id, request_queue, response_queue, backend_name):
+    """
+    Entry point of an inference worker process.
+
+    Loads the inference backend once, then serves requests until it receives `None`.
+
+    Args:
+        worker_id (int): Index of this worker in the pool.
+        request_queue (multiprocessing.Queue): Requests addressed to this worker.
+        response_queue (multiprocessing.Queue): Shared queue for answers to the parent.
+        backend_name (str): Backend to load, see `create_backend`.
+    """
+    from ai_integrations.backends.factory_backend import create_backend
+    from data_storage.lang_handler import GetLanguage
+
+    # The worker reads the saved language itself to pick the speculative decoding draft model
+    backend = create_backend(backend_name, get_lang=GetLanguage())
+    try:
+        start = time.perf_counter()
+        backend.load()
+        load_seconds = time.perf_counter() - start
+        response_queue.put({"type": "ready", "worker_id": worker_id, "load_seconds": load_seconds, "error": None})
+    except Exception as e:
+        response_queue.put({"type": "ready", "worker_id": worker_id, "load_seconds": 0.0, "error": str(e)})
+
+    while True:
+        message = request_queue.get()
+        if message is None:
+            break
+
+        response = {"type": "response", "id": message["id"], "worker_id": worker_id, "ok": True}
+        if message["op"] == "ping":
+            response["stats"] = backend.stats()
+            response["pid"] = os.getpid()
+        elif message["op"] == "generate":
+            shm = None
+            try:
+                shm = shared_memory.SharedMemory(name=message["shm_name"])
+                frame = np.ndarray(message["shape"], dtype=message["dtype"], buffer=shm.buf)
+                response["text"] = backend.generate(frame, message["question"])
+                del frame
+            except Exception as e:
+                response["ok"] = False
+                response["error"] = str(e)
+            finally:
+                if shm is not None:
+                    shm.close()
+        else:
+            response["ok"] = False
+            response["error"] = f"Unknown op: {message['op']}"
+        response_queue.put(response)
+
+
+class _WorkerHandle:
+    """
+    Parent-side bookkeeping for one worker process.
+
+    Attributes:
+        worker_id (int): Index of the worker in the pool.
+        process (multiprocessing.Process): The running process, or None.
+        request_queue (multiprocessing.Queue): Queue feeding this worker.
+        ready (bool): True once the worker reported a successful model load.
+        load_error (str): Error reported by the worker while loading, if any.
+        load_seconds (float): Model load time reported by the worker.
+        in_flight (set): Ids of requests sent to this worker and not answered yet.
+        restarts (int): Number of times the worker was restarted after a crash.
+    """
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.process = None
+        self.request_queue = None
+        self.ready = False
+        self.load_error = None
+        self.load_seconds = 0.0
+        self.in_flight = set()
+        self.restarts = 0
+
+    @property
+    def alive(self):
+        """bool: True while the worker process is running."""
+        return self.process is not None and self.process.is_alive()
+
+
+class InferenceWorkerPool:
+    """
+    Runs Gemma inference in dedicated worker processes.
+
+    Keeping `torch` generation out of the Flask process means the GIL and the decode's
+    CPU load no longer starve the `sounddevice` callback or the HTTP threads.
+
+    Responsibilities:
+    - Starts `worker_count` processes, each holding its own loaded backend
+    - Hands frames to workers through shared-memory numpy buffers
+    - Routes answers back to the waiting callers
+    - Detects crashed workers, fails their in-flight requests and restarts them
+
+    Args:
+        worker_count (int): Number of worker processes.
+        backend_name (str): Inference backend loaded by each worker.
+        request_timeout (float): Maximum seconds to wait for an answer.
+        health_interval (float): Seconds between crash checks.
+    """
+
+    def __init__(self, worker_count=INFERENCE_WORKER_COUNT, backend_name=INFERENCE_BACKEND,
+                 request_timeout=INFERENCE_WORKER_TIMEOUT_SECONDS,
+                 health_interval=INFERENCE_WORKER_HEALTH_INTERVAL_SECONDS):
+        self.worker_count = max(1, worker_count)
+        self.backend_name = backend_name
+        self.request_timeout = request_timeout
+        self.health_interval = health_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._workers = [_WorkerHandle(i) for i in range(self.worker_count)]
+        self._response_queue = None
+        self._pending = {}
+        self._request_ids = itertools.count(1)
+        self._next_worker = itertools.count()
+        self._lock = threading.Lock()
+        self._running = False
+        self._threads = []
+
+    def start(self):
+        """
+        Starts the worker processes plus the response dispatcher and supervisor threads.
+
+        Calling it again while the pool is running does nothing.
+        """
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._response_queue = self._context.Queue()
+            for handle in self._workers:
+                self._spawn(handle)
+
+        self._threads = [
+            threading.Thread(target=self._dispatch_responses, name="inference-dispatcher", daemon=True),
+            threading.Thread(target=self._supervise, name="inference-supervisor", daemon=True)
+        ]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.stop)
+        print(f"🧠 Started {self.worker_count} inference worker(s).")
+
+    def stop(self):
+        """
+        Asks every worker to exit and waits briefly before terminating it.
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            for handle in self._workers:
+                if handle.alive:
+                    handle.request_queue.put(None)
+
+        for handle in self._workers:
+            if handle.process is not None:
+                handle.process.join(timeout=5)
+                if handle.process.is_alive():
+                    handle.process.terminate()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._fail_pending(lambda request_id: True, "Inference worker pool stopped.")
+
+    def _spawn(self, handle):
+        """
+        Starts (or restarts) the process behind a worker handle.
+
+        Args:
+            handle (_WorkerHandle): The worker to start.
+        """
+        handle.request_queue = self._context.Queue()
+        handle.ready = False
+        handle.load_error = None
+        handle.in_flight = set()
+        handle.process = self._context.Process(
+            target=_worker_main,
+            args=(handle.worker_id, handle.request_queue, self._response_queue, self.backend_name),
+            name=f"inference-worker-{handle.worker_id}",
+            daemon=True
+        )
+        handle.process.start()
+
+    def _fail_pending(self, predicate, message):
+        """
+        Completes matching pending requests with an error.
+
+        Args:
+            predicate (Callable): Returns True for request ids that should fail.
+            message (str): Error message handed to the callers.
+        """
+        with self._lock:
+            failed = [request_id for request_id in self._pending if predicate(request_id)]
+            for request_id in failed:
+                pending = self._pending[request_id]
+                pending["response"] = {"ok": False, "error": message}
+                pending["event"].set()
+
+    def _dispatch_responses(self):
+        """
+        Reads worker messages and wakes up the matching callers.
+        """
+        while self._running:
+            try:
+                message = self._response_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            handle = self._workers[message["worker_id"]]
+            if message["type"] == "ready":
+                handle.ready = message["error"] is None
+                handle.load_error = message["error"]
+                handle.load_seconds = message["load_seconds"]
+                if handle.load_error:
+                    print(f"Inference worker {handle.worker_id} failed to load the model: {handle.load_error}")
+                continue
+
+            with self._lock:
+                handle.in_flight.discard(message["id"])
+                pending = self._pending.get(message["id"])
+                if pending is not None:
+                    pending["response"] = message
+                    pending["event"].set()
+
+    def _restart_if_crashed(self, handle):
+        """
+        Restarts a dead worker and fails the requests it was serving.
+
+        Args:
+            handle (_WorkerHandle): The worker to check.
+        """
+        with self._lock:
+            if not self._running or handle.alive:
+                return
+            exit_code = handle.process.exitcode if handle.process is not None else None
+            lost = set(handle.in_flight)
+            handle.restarts += 1
+            print(f"⚠️ Inference worker {handle.worker_id} exited (code {exit_code}); restarting.")
+            self._spawn(handle)
+        self._fail_pending(lambda request_id: request_id in lost, "Inference worker crashed during the request.")
+
+    def _supervise(self):
+        """
+        Periodically restarts crashed workers.
+        """
+        while self._running:
+            for handle in self._workers:
+                self._restart_if_crashed(handle)
+            time.sleep(self.health_interval)
+
+    def _pick_worker(self):
+        """
+        Chooses the ready worker with the fewest in-flight requests.
+
+        Falls back to round-robin while no worker has reported ready yet.
+
+        Returns:
+            _WorkerHandle: The worker that should serve the next request.
+        """
+        for handle in self._workers:
+            self._restart_if_crashed(handle)
+        ready = [handle for handle in self._workers if handle.ready]
+        if ready:
+            return min(ready, key=lambda handle: len(handle.in_flight))
+        return self._workers[next(self._next_worker) % self.worker_count]
+
+    def _request(self, handle, message, timeout):
+        """
+        Sends a message to a worker and waits for its response.
+
+        Args:
+            handle (_WorkerHandle): Target worker.
+            message (dict): Protocol message without its id.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            dict: The worker's response.
+
+        Raises:
+            TimeoutError: If the worker does not answer in time.
+        """
+        request_id = next(self._request_ids)
+        message["id"] = request_id
+        pending = {"event": threading.Event(), "response": None}
+        with self._lock:
+            self._pending[request_id] = pending
+            handle.in_flight.add(request_id)
+            handle.request_queue.put(message)
+
+        try:
+            if not pending["event"].wait(timeout):
+                raise TimeoutError(f"Inference worker {handle.worker_id} did not answer within {timeout}s.")
+            return pending["response"]
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+                handle.in_flight.discard(request_id)
+
+    def generate(self, image, text):
+        """
+        Drop-in replacement for `init_ai` that runs generation in a worker process.
+
+        Args:
+            image (PIL.Image.Image or numpy.ndarray): RGB image or frame to analyze.
+            text (str): The user's question.
+
+        Returns:
+            str: The generated answer.
+
+        Raises:
+            RuntimeError: If the worker reports an error or crashes.
+            TimeoutError: If no answer arrives within `request_timeout`.
+        """
+        self.start()
+        frame = np.ascontiguousarray(np.asarray(image, dtype=np.uint8))
+
+        shm = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+        try:
+            shared_frame = np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)
+            np.copyto(shared_frame, frame)
+            del shared_frame
+
+            response = self._request(self._pick_worker(), {
+                "op": "generate",
+                "shm_name": shm.name,
+                "shape": frame.shape,
+                "dtype": frame.dtype.str,
+                "question": text
+            }, self.request_timeout)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "Unknown inference worker error."))
+        return response["text"]
+
+    def health(self, timeout=2.0):
+        """
+        Pings every worker and reports its state.
+
+        Args:
+            timeout (float): Maximum seconds to wait for each ping.
+
+        Returns:
+            list[dict]: One entry per worker with liveness, readiness, restarts,
+                        ping latency and the worker's model stats when it answered.
+        """
+        report = []
+        for handle in self._workers:
+            entry = {
+                "worker_id": handle.worker_id,
+                "alive": handle.alive,
+                "ready": handle.ready,
+                "load_error": handle.load_error,
+                "load_seconds": round(handle.load_seconds, 3),
+                "restarts": handle.restarts,
+                "in_flight": len(handle.in_flight)
+            }
+            if self._running and handle.alive:
+                start = time.perf_counter()
+                try:
+                    response = self._request(handle, {"op": "ping"}, timeout)
+                    entry["ping_seconds"] = round(time.perf_counter() - start, 4)
+                    entry["pid"] = response.get("pid")
+                    entry["stats"] = response.get("stats")
+                except TimeoutError:
+                    entry["ping_seconds"] = None
+            report.append(entry)
+        return report
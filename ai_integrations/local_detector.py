@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from config import DETECTOR_MODEL_DIR, DETECTOR_MIN_CONFIDENCE, DETECTOR_FACE_CONFIDENCE
+
+# Output classes of the MobileNet-SSD (PASCAL VOC) Caffe model, in model order
+SSD_LABELS = (
+    "background", "aeroplane", "bicycle", "bird", "boat", "bottle", "bus", "car", "cat", "chair",
+    "cow", "diningtable", "dog", "horse", "motorbike", "person", "pottedplant", "sheep", "sofa",
+    "train", "tvmonitor"
+)
+
+
+class LocalDetector:
+    """
+    Fast CPU object and face detector used before Gemma.
+
+    - Objects: MobileNet-SSD through `cv2.dnn` (`MobileNetSSD_deploy.prototxt` and
+      `MobileNetSSD_deploy.caffemodel` in `model_dir`), 20 everyday classes
+    - Faces: OpenCV's bundled Haar cascade, reported as "face"
+
+    Both run in tens of milliseconds on a 300x300 input. Without the SSD files only
+    faces are detected.
+
+    Args:
+        model_dir (str): Directory of the MobileNet-SSD files.
+        min_confidence (float): Detections below this score are dropped.
+        face_confidence (float): Score given to Haar faces, which have no score of their own.
+
+    Attributes:
+        last_seconds (float): Duration of the most recent `detect` call.
+    """
+
+    def __init__(self, model_dir=DETECTOR_MODEL_DIR, min_confidence=DETECTOR_MIN_CONFIDENCE,
+                 face_confidence=DETECTOR_FACE_CONFIDENCE):
+        self.model_dir = model_dir
+        self.min_confidence = min_confidence
+        self.face_confidence = face_confidence
+        self.last_seconds = 0.0
+        self._net = None
+        self._faces = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def has_object_model(self):
+        """bool: True when the SSD object detector is loaded, not only the face cascade."""
+        self.load()
+        return self._net is not None
+
+    def load(self):
+        """
+        Loads the SSD network (when its files exist) and the face cascade once.
+
+        Returns:
+            bool: True when at least one detector is available.
+        """
+        with self._lock:
+            if self._loaded:
+                return self._net is not None or self._faces is not None
+            prototxt = os.path.join(self.model_dir, "MobileNetSSD_deploy.prototxt")
+            weights = os.path.join(self.model_dir, "MobileNetSSD_deploy.caffemodel")
+            if os.path.exists(prototxt) and os.path.exists(weights):
+                self._net = cv2.dnn.readNetFromCaffe(prototxt, weights)
+            else:
+                print(f"Object detector files not found in {self.model_dir}, detecting faces only.")
+            cascade = cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml"))
+            self._faces = None if cascade.empty() else cascade
+            self._loaded = True
+            return self._net is not None or self._faces is not None
+
+    def detect(self, pil_img):
+        """
+        Detects objects and faces in an image.
+
+        Args:
+            pil_img (PIL.Image.Image): The image.
+
+        Returns:
+            list[dict]: {"label", "confidence", "box": (x1, y1, x2, y2) in pixels}, best first.
+        """
+        self.load()
+        start = time.perf_counter()
+        frame = cv2.cvtColor(np.asarray(pil_img.convert("RGB")), cv2.COLOR_RGB2BGR)
+        height, width = frame.shape[:2]
+        detections = []
+
+        with self._lock:
+            if self._net is not None:
+                blob = cv2.dnn.blobFromImage(cv2.resize(frame, (300, 300)), 0.007843, (300, 300), 127.5)
+                self._net.setInput(blob)
+                # (1, 1, N, 7): image id, class id, confidence, x1, y1, x2, y2 (relative)
+                rows = self._net.forward()[0, 0]
+                rows = rows[(rows[:, 2] >= self.min_confidence) & (rows[:, 1] > 0)]
+                boxes = (rows[:, 3:7] * np.array([width, height, width, height])).astype(int)
+                for row, box in zip(rows, boxes):
+                    detections.append({
+                        "label": SSD_LABELS[int(row[1])], "confidence": float(row[2]), "box": tuple(box.tolist())
+                    })
+
+            if self._faces is not None:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                for x, y, w, h in self._faces.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=6, minSize=(40, 40)):
+                    detections.append({
+                        "label": "face", "confidence": self.face_confidence, "box": (int(x), int(y), int(x + w), int(y + h))
+                    })
+
+        self.last_seconds = time.perf_counter() - start
+        return sorted(detections, key=lambda detection: detection["confidence"], reverse=True)
@@ -0,0 +1,222 @@
+import re
+import threading
+import PIL.Image
+from config import (
+    RESOLUTION_INPUT_SIDE, RESOLUTION_TILE_GRID, RESOLUTION_LATENCY_BUDGET_SECONDS, RESOLUTION_REPROBE_EVERY
+)
+
+# Questions about written content: worth tiles
+TEXT_KEYWORDS = {
+    "read", "text", "sign", "signs", "label", "labels", "written", "write", "says", "say",
+    "word", "words", "letter", "letters", "number", "numbers", "price", "menu", "title", "brand"
+}
+
+# Questions about the overall scene
+OVERVIEW_KEYWORDS = {
+    "describe", "scene", "around", "where", "room", "color", "colour", "colors", "colours", "light", "dark"
+}
+
+# Overlap between neighbouring tiles, as a fraction of the tile size, so words on a seam stay whole
+TILE_OVERLAP = 0.1
+
+# Weight of the newest measurement in the per-plan latency average
+LATENCY_SMOOTHING = 0.3
+
+
+class ResolutionPolicy:
+    """
+    Picks between one whole image and a tiling from the question and a latency budget.
+
+    The Gemma 3n processor resizes every image to its fixed vision input (`input_side`
+    square), so a smaller image costs the same as a full one and only loses detail. What
+    changes the cost is how many images are sent:
+    - `single`: the whole capture, downscaled to `input_side` (the processor would do it anyway)
+    - `tiles`: one `input_side` crop per grid cell, answered one after the other, so small
+      text gets more of the vision input
+    Text intent questions ("read", "sign", "label", ...) get `tiles` when the measured cost
+    fits the budget, and `single` otherwise; every other question gets `single`. A plan
+    stepped down for exceeding the budget is tried again after being passed over
+    `reprobe_every` times, and that probe's measurement replaces its estimate, so one
+    slow (e.g. cold) call is not permanent.
+
+    Prepared images are memoized per session for its current source image, so follow-up
+    questions with the same plan reuse the same image objects (and the conversation cache),
+    and concurrent sessions do not invalidate each other's images.
+
+    Args:
+        input_side (int): Side of the model's vision input; longest side of the image and of each tile.
+        tile_grid (int): Tiles per side for `tiles` (2 means 2x2).
+        latency_budget_seconds (float): Target time until the answer starts on this device.
+        reprobe_every (int): Choices a plan over budget is skipped before it is measured again.
+
+    Attributes:
+        latency_by_plan (dict): {plan name: smoothed seconds until the answer started}.
+        plan_counts (dict): {plan name: times chosen}.
+    """
+
+    def __init__(self, input_side=RESOLUTION_INPUT_SIDE, tile_grid=RESOLUTION_TILE_GRID,
+                 latency_budget_seconds=RESOLUTION_LATENCY_BUDGET_SECONDS, reprobe_every=RESOLUTION_REPROBE_EVERY):
+        self.input_side = input_side
+        self.tile_grid = tile_grid
+        self.latency_budget_seconds = latency_budget_seconds
+        self.reprobe_every = reprobe_every
+        self.latency_by_plan = {}
+        self.plan_counts = {}
+        self._skipped = {}
+        self._probing = set()
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def intent(question):
+        """
+        Classifies a question as "text", "overview" or "general".
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            str: The intent.
+        """
+        words = set(re.sub(r"[^\w\s]", " ", question.lower()).split())
+        if words & TEXT_KEYWORDS:
+            return "text"
+        if words & OVERVIEW_KEYWORDS:
+            return "overview"
+        return "general"
+
+    def _fits_budget(self, plan):
+        """
+        True when the plan has no measurement yet, its measured latency is within budget,
+        or it has been passed over `reprobe_every` times and is due for a new measurement.
+
+        Called under the lock; counts the skip when the plan does not fit.
+        """
+        latency = self.latency_by_plan.get(plan)
+        if latency is None or latency <= self.latency_budget_seconds:
+            return True
+        skipped = self._skipped.get(plan, 0) + 1
+        if skipped >= self.reprobe_every:
+            self._skipped[plan] = 0
+            self._probing.add(plan)
+            return True
+        self._skipped[plan] = skipped
+        return False
+
+    def choose(self, question):
+        """
+        Chooses the plan for a question.
+
+        Args:
+            question (str): The user's question.
+
+        Returns:
+            str: "single" or "tiles".
+        """
+        candidates = ("tiles", "single") if self.intent(question) == "text" else ("single",)
+        with self._lock:
+            plan = next((candidate for candidate in candidates if self._fits_budget(candidate)), candidates[-1])
+            self.plan_counts[plan] = self.plan_counts.get(plan, 0) + 1
+        return plan
+
+    def _resize(self, image, side):
+        """
+        Downscales an image so its longest side is at most `side` (never upscales).
+        """
+        scale = side / max(image.size)
+        if scale >= 1:
+            return image
+        return image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), PIL.Image.BICUBIC)
+
+    def _tiles(self, image):
+        """
+        Splits an image into a `tile_grid` x `tile_grid` grid of overlapping crops.
+
+        Returns:
+            list[PIL.Image.Image]: Tiles in reading order, each at most `input_side` on its longest side.
+        """
+        tile_width = image.width / self.tile_grid
+        tile_height = image.height / self.tile_grid
+        pad_x, pad_y = tile_width * TILE_OVERLAP, tile_height * TILE_OVERLAP
+        tiles = []
+        for row in range(self.tile_grid):
+            for col in range(self.tile_grid):
+                box = (
+                    max(0, int(col * tile_width - pad_x)),
+                    max(0, int(row * tile_height - pad_y)),
+                    min(image.width, int((col + 1) * tile_width + pad_x)),
+                    min(image.height, int((row + 1) * tile_height + pad_y))
+                )
+                tiles.append(self._resize(image.crop(box), self.input_side))
+        return tiles
+
+    def prepare(self, question, image, session_id=None):
+        """
+        Chooses a plan and builds the model input images for it.
+
+        Args:
+            question (str): The user's question.
+            image (PIL.Image.Image): Full-resolution capture.
+            session_id (str, optional): Interaction session the images are memoized for.
+
+        Returns:
+            tuple: (plan name, list[PIL.Image.Image]) - one image, or one per tile.
+        """
+        plan = self.choose(question)
+        with self._lock:
+            source, prepared = self._prepared.get(session_id, (None, {}))
+            if source is not image:
+                prepared = {}
+                self._prepared[session_id] = (image, prepared)
+            images = prepared.get(plan)
+        if images is None:
+            images = self._tiles(image) if plan == "tiles" else [self._resize(image, self.input_side)]
+            with self._lock:
+                prepared[plan] = images
+        return plan, images
+
+    def evict(self, session_id):
+        """
+        Drops the memoized images of a session, e.g. when it ends.
+
+        Args:
+            session_id (str): Identifier of the interaction session.
+        """
+        with self._lock:
+            self._prepared.pop(session_id, None)
+
+    def record(self, plan, images, seconds):
+        """
+        Logs the chosen resolution against the measured latency and updates the budget estimate.
+
+        Args:
+            plan (str): Plan returned by `prepare`.
+            images (list[PIL.Image.Image]): Images returned by `prepare`.
+            seconds (float): Time until the answer started (first spoken sentence, or full answer);
+                for several images (tiles) the time until the full answer.
+        """
+        with self._lock:
+            previous = self.latency_by_plan.get(plan)
+            # A re-probe replaces the stale estimate instead of being averaged into it
+            if previous is None or plan in self._probing:
+                self.latency_by_plan[plan] = seconds
+                self._probing.discard(plan)
+            else:
+                self.latency_by_plan[plan] = previous + LATENCY_SMOOTHING * (seconds - previous)
+        width, height = images[0].size
+        print(f"📐 Resolution {plan}: {len(images)} x {width}x{height} -> answer after {seconds:.2f}s "
+              f"(budget {self.latency_budget_seconds:.1f}s)")
+
+    def stats(self):
+        """
+        Returns the plan counts and smoothed latencies.
+
+        Returns:
+            dict: {"plan_counts", "latency_by_plan", "latency_budget_seconds"}
+        """
+        with self._lock:
+            return {
+                "plan_counts": dict(self.plan_counts),
+                "latency_by_plan": {plan: round(seconds, 3) for plan, seconds in self.latency_by_plan.items()},
+                "latency_budget_seconds": self.latency_budget_seconds
+            }
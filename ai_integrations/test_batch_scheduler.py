@@ -0,0 +1,68 @@
+import threading
+import time
+import pytest
+from ai_integrations.batch_scheduler import BatchScheduler
+
+
+class StubModel:
+    """
+    Stand-in for the Gemma holder: echoes each question and records batch sizes.
+    """
+
+    def __init__(self, delay_seconds=0.0, fail=False):
+        self.delay_seconds = delay_seconds
+        self.fail = fail
+        self.batch_sizes = []
+
+    def generate_batch(self, images, questions):
+        self.batch_sizes.append(len(questions))
+        time.sleep(self.delay_seconds)
+        if self.fail:
+            raise RuntimeError("stub failure")
+        return [f"{image}:{question}" for image, question in zip(images, questions)]
+
+
+def _submit_concurrently(scheduler, count):
+    results = [None] * count
+
+    def worker(index):
+        results[index] = scheduler.submit(f"img{index}", f"q{index}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_requests_are_batched_and_routed_back():
+    stub = StubModel()
+    scheduler = BatchScheduler(stub.generate_batch, max_batch_size=4, max_wait_seconds=0.5)
+
+    results = _submit_concurrently(scheduler, 4)
+    scheduler.stop()
+
+    assert results == [f"img{i}:q{i}" for i in range(4)]
+    assert sum(stub.batch_sizes) == 4
+    assert max(stub.batch_sizes) > 1
+    assert scheduler.stats()["requests_total"] == 4
+
+
+def test_batch_size_is_capped():
+    stub = StubModel(delay_seconds=0.05)
+    scheduler = BatchScheduler(stub.generate_batch, max_batch_size=2, max_wait_seconds=0.2)
+
+    _submit_concurrently(scheduler, 5)
+    scheduler.stop()
+
+    assert max(stub.batch_sizes) <= 2
+    assert scheduler.stats()["largest_batch"] <= 2
+
+
+def test_batch_error_reaches_every_caller():
+    scheduler = BatchScheduler(StubModel(fail=True).generate_batch, max_batch_size=2, max_wait_seconds=0.0)
+
+    with pytest.raises(RuntimeError, match="stub failure"):
+        scheduler.submit("img", "q")
+    scheduler.stop()
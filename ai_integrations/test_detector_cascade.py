@@ -0,0 +1,69 @@
+from ai_integrations.detector_cascade import DetectorCascade
+
+
+class StubDetector:
+    """
+    Stand-in for LocalDetector: returns fixed detections.
+    """
+
+    def __init__(self, detections, has_object_model=True):
+        self.detections = detections
+        self.has_object_model = has_object_model
+
+    def detect(self, image):
+        return self.detections
+
+
+def _detection(label, confidence):
+    return {"label": label, "confidence": confidence, "box": (0, 0, 10, 10)}
+
+
+def _cascade(detections, has_object_model=True):
+    return DetectorCascade(StubDetector(detections, has_object_model), answer_confidence=0.8)
+
+
+def test_presence_and_count_are_answered_from_confident_objects():
+    detections = [_detection("person", 0.9), _detection("dog", 0.95)]
+    cascade = _cascade(detections)
+
+    assert cascade._direct_answer("Is there a person in front of me?", detections) == \
+        "Yes, I can see 1 person in front of you."
+    assert cascade._direct_answer("How many dogs are there?", detections) == "I can see 1 dog."
+    assert cascade._direct_answer("Is there a cat?", detections) is None
+
+
+def test_count_escalates_when_any_matching_detection_is_unsure():
+    detections = [_detection("person", 0.95), _detection("person", 0.9), _detection("person", 0.6)]
+    cascade = _cascade(detections)
+
+    assert cascade._direct_answer("How many people are there?", detections) is None
+    assert cascade._direct_answer("Is there a person?", detections) is None
+
+
+def test_faces_alone_never_answer():
+    detections = [_detection("face", 0.85)]
+    cascade = _cascade(detections, has_object_model=False)
+
+    assert cascade._direct_answer("What is in front of me?", detections) is None
+    assert cascade._direct_answer("Is there a person?", detections) is None
+    assert cascade._direct_answer("How many people?", detections) is None
+
+
+def test_overview_needs_the_object_detector():
+    detections = [_detection("person", 0.9), _detection("chair", 0.85), _detection("face", 0.6)]
+
+    assert _cascade(detections)._direct_answer("What is in front of me?", detections) == \
+        "I can see 1 person and 1 chair in front of you."
+    assert _cascade(detections, has_object_model=False)._direct_answer("What is in front of me?", detections) is None
+    assert _cascade(detections)._direct_answer("What do you see on the table?", detections) is None
+
+
+def test_qualified_questions_escalate_with_context():
+    detections = [_detection("person", 0.9)]
+    cascade = _cascade(detections)
+
+    for question in ("Is there a man with a red shirt?", "How many people are not wearing masks?"):
+        answer, prompt = cascade.triage(question, image=None)
+        assert answer is None
+        assert prompt == f"{question} (An object detector found: 1 person.)"
+    assert cascade.stats()["detector"]["answered"] == 0
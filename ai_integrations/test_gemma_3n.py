@@ -0,0 +1,59 @@
+import re
+import pytest
+
+np = pytest.importorskip("numpy")
+torch = pytest.importorskip("torch")
+pytest.importorskip("cv2")
+pytest.importorskip("transformers")
+from ai_integrations.gemma_3n import GemmaModelHolder
+
+IMAGE_TOKEN = "<image_soft_token>"
+IMAGE_TOKEN_ID = 7
+IMAGE_SEQ_LENGTH = 4
+
+
+class StubEncoding(dict):
+    def to(self, device):
+        return self
+
+
+class StubTokenizer:
+    """
+    Gives the image token its own id and every other word id 1.
+    """
+
+    def __call__(self, text, return_tensors="pt"):
+        ids = [
+            IMAGE_TOKEN_ID if piece == IMAGE_TOKEN else 1
+            for piece in re.split(f"({re.escape(IMAGE_TOKEN)})|\\s+", text) if piece
+        ]
+        return StubEncoding(input_ids=torch.tensor([ids]), attention_mask=torch.ones(1, len(ids), dtype=torch.long))
+
+
+class StubProcessor:
+    """
+    Stand-in for the Gemma 3n processor's image token attributes.
+    """
+    boi_token = "<start_of_image>"
+    image_token_id = IMAGE_TOKEN_ID
+    image_seq_length = IMAGE_SEQ_LENGTH
+    full_image_sequence = f"\n\n<start_of_image>{IMAGE_TOKEN * IMAGE_SEQ_LENGTH}<end_of_image>\n\n"
+    tokenizer = StubTokenizer()
+
+
+class StubModel:
+    device = "cpu"
+    dtype = torch.float32
+
+
+def test_frame_prompt_has_one_image_token_per_image_feature():
+    holder = GemmaModelHolder()
+    holder.processor = StubProcessor()
+    holder.model = StubModel()
+    holder.frame_preprocessor = lambda frame: np.zeros((1, 3, 8, 8), dtype=np.float32)
+
+    model_inputs = holder._prepare_frame_inputs(np.zeros((8, 8, 3), dtype=np.uint8), "What is this?")
+
+    image_tokens = int((model_inputs["input_ids"] == IMAGE_TOKEN_ID).sum())
+    assert image_tokens == StubProcessor.image_seq_length
+    assert int(model_inputs["token_type_ids"].sum()) == image_tokens
@@ -0,0 +1,168 @@
+import threading
+import numpy as np
+import sounddevice as sd
+from config import AUDIO_SAMPLERATE, AUDIO_CHANNELS, AUDIO_RING_SECONDS, AUDIO_VAD_FRAME_MS
+
+
+class AudioRing:
+    """
+    One long-lived microphone stream writing into a preallocated int16 ring buffer.
+
+    Positions are absolute sample counts since the stream started, so a reader keeps
+    its own cursor and asks for any range still inside the ring:
+    - no device open/close per recording, and no allocation per audio block
+    - a recording can start slightly in the past (pre-roll), so the first syllable is kept
+    - audio heard before a recording starts never leaks into it
+
+    Args:
+        samplerate (int): Sample rate in Hz.
+        seconds (float): Audio kept in the ring.
+        blocksize (int): Samples per device callback.
+        channels (int): Device channels; only the first one is kept.
+
+    Attributes:
+        capacity (int): Ring size in samples.
+        overruns (int): Reads that asked for audio already overwritten.
+        input_overflows (int): Device callbacks reporting dropped input.
+    """
+
+    def __init__(self, samplerate=AUDIO_SAMPLERATE, seconds=AUDIO_RING_SECONDS,
+                 blocksize=int(AUDIO_SAMPLERATE * AUDIO_VAD_FRAME_MS / 1000), channels=AUDIO_CHANNELS):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.capacity = int(samplerate * seconds)
+        self._buffer = np.zeros(self.capacity, dtype=np.int16)
+        self._written = 0
+        self._new_audio = threading.Condition()
+        self._stream = None
+        self.overruns = 0
+        self.input_overflows = 0
+
+    @property
+    def is_running(self):
+        """bool: True while the input stream is open and active."""
+        return self._stream is not None and self._stream.active
+
+    def start(self):
+        """
+        Opens and starts the input stream if it is not running yet.
+        """
+        if self.is_running:
+            return
+        self._stream = sd.InputStream(
+            samplerate=self.samplerate,
+            blocksize=self.blocksize,
+            dtype='int16',
+            channels=self.channels,
+            callback=self._callback
+        )
+        self._stream.start()
+        print(f"🎙️ Microphone stream open ({self.capacity / self.samplerate:.0f}s ring)")
+
+    def stop(self):
+        """
+        Stops and closes the input stream; waiting readers are woken up.
+        """
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        with self._new_audio:
+            self._new_audio.notify_all()
+
+    def _callback(self, indata, frames, time, status):
+        """
+        sounddevice callback: copies the block into the ring, wrapping around its end.
+        """
+        if status.input_overflow:
+            self.input_overflows += 1
+        samples = indata[:, 0]
+        with self._new_audio:
+            start = self._written % self.capacity
+            first = min(frames, self.capacity - start)
+            self._buffer[start:start + first] = samples[:first]
+            if first < frames:
+                self._buffer[:frames - first] = samples[first:]
+            self._written += frames
+            self._new_audio.notify_all()
+
+    def position(self, seconds_ago=0.0):
+        """
+        Returns a read cursor at the current write position, optionally moved into the past.
+
+        Args:
+            seconds_ago (float): Pre-roll; limited to the audio actually in the ring.
+
+        Returns:
+            int: Absolute sample position.
+        """
+        with self._new_audio:
+            back = min(int(seconds_ago * self.samplerate), self._written, self.capacity)
+            return self._written - back
+
+    def views(self, start, end):
+        """
+        Returns the samples of a range as views into the ring, without copying.
+
+        The views are only valid until the ring wraps around them again, i.e. for about
+        `capacity` samples after `end`.
+
+        Args:
+            start (int): First absolute sample position.
+            end (int): Absolute position after the last sample; must already be written.
+
+        Returns:
+            list[np.ndarray]: One view, or two when the range wraps around the end of the ring.
+
+        Raises:
+            ValueError: If the range has not been recorded yet or was already overwritten.
+        """
+        with self._new_audio:
+            if start < self._written - self.capacity:
+                self.overruns += 1
+                raise ValueError(f"Audio range {start}-{end} was already overwritten (written: {self._written}).")
+            if end > self._written:
+                raise ValueError(f"Audio range {start}-{end} has not been recorded yet (written: {self._written}).")
+        if end <= start:
+            return [self._buffer[:0]]
+        first, last = start % self.capacity, end % self.capacity
+        if first < last or last == 0:
+            return [self._buffer[first:last or self.capacity]]
+        return [self._buffer[first:], self._buffer[:last]]
+
+    def read(self, start, samples, timeout=1.0):
+        """
+        Waits until a block is available and returns it.
+
+        Args:
+            start (int): Absolute position of the block.
+            samples (int): Block length in samples.
+            timeout (float): Maximum seconds to wait for the audio.
+
+        Returns:
+            np.ndarray or None: The block - a view into the ring, copied only when it wraps
+                                around the ring's end - or None on timeout or when stopped.
+        """
+        end = start + samples
+        with self._new_audio:
+            if not self._new_audio.wait_for(lambda: self._written >= end or self._stream is None, timeout):
+                return None
+            if self._written < end:
+                return None
+        parts = self.views(start, end)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def stats(self):
+        """
+        Returns the ring counters.
+
+        Returns:
+            dict: {"running", "seconds_written", "overruns", "input_overflows"}
+        """
+        return {
+            "running": self.is_running,
+            "seconds_written": round(self._written / self.samplerate, 1),
+            "overruns": self.overruns,
+            "input_overflows": self.input_overflows
+        }
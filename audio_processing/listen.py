@@ -1,43 +1,87 @@
-import queue
-import sounddevice as sd
-import vosk
-from config import AUDIO_SAMPLERATE, AUDIO_BLOCKSIZE, AUDIO_CHANNELS, AUDIO_DTYPE
+import numpy as np
+from audio_processing.audio_ring import AudioRing
+from audio_processing.vad import VoiceActivityDetector
+from config import AUDIO_SAMPLERATE, AUDIO_BLOCKSIZE, AUDIO_KEEP_OPEN, AUDIO_PRE_ROLL_SECONDS
 
 class Record:
     """
     A class for recording raw audio input from the microphone using sounddevice.
 
+    Recordings are read from one long-lived microphone stream (`AudioRing`) through a
+    read cursor, starting `pre_roll_seconds` in the past so the first syllable is kept.
+    The pre-roll never reaches back past the last `mark()`, so the tail of a spoken
+    prompt is not mistaken for the user's answer.
+
     Attributes:
-        audio_queue (queue.Queue): A thread-safe queue to store incoming audio chunks.
+        ring (AudioRing): Microphone stream and ring buffer.
+        vad (VoiceActivityDetector): Endpointing used by `record_utterance`.
     """
 
-    def __init__(self):
+    def __init__(self, vad=None, ring=None, keep_open=AUDIO_KEEP_OPEN, pre_roll_seconds=AUDIO_PRE_ROLL_SECONDS):
+        """
+        Initializes the Record object.
+
+        Args:
+            vad (VoiceActivityDetector, optional): Endpointing for `record_utterance`.
+                Defaults to one built from the config.
+            ring (AudioRing, optional): Microphone ring buffer. Defaults to one built from the config.
+            keep_open (bool): Keep the microphone stream open between recordings.
+            pre_roll_seconds (float): Audio from before the call included in each recording.
+        """
+        self.vad = vad or VoiceActivityDetector()
+        self.ring = ring or AudioRing(blocksize=self.vad.frame_samples)
+        self.keep_open = keep_open
+        self.pre_roll_seconds = pre_roll_seconds
+        self._not_before = None
+
+    def mark(self):
         """
-        Initializes the Record object and sets up the audio queue.
+        Marks the end of a spoken prompt: the next recording does not start before this point.
+
+        Call it when `speak()` returns, right before recording the answer.
         """
-        self.audio_queue = queue.Queue()
+        self._not_before = self.ring.position() if self.ring.is_running else None
 
-    def audio_callback(self, indata, frames, time, status):
+    def _blocks(self, block_samples, max_blocks=None):
         """
-        Callback function triggered by sounddevice during audio input.
+        Yields consecutive blocks from the ring, starting at the pre-roll cursor (or the last mark).
 
         Args:
-            indata (bytes): Raw audio input data.
-            frames (int): Number of frames in this block.
-            time (CData): Timestamps for the audio block.
-            status (CallbackFlags): Status flags indicating stream state.
+            block_samples (int): Samples per block.
+            max_blocks (int, optional): Number of blocks to read. Unlimited when None.
 
-        Side Effects:
-            Puts the raw audio bytes into the audio queue for later processing.
+        Yields:
+            tuple: (absolute start position, block as a view into the ring)
         """
-        self.audio_queue.put(bytes(indata))
+        self.ring.start()
+        cursor = self.ring.position(self.pre_roll_seconds)
+        if self._not_before is not None:
+            cursor = max(cursor, self._not_before)
+            self._not_before = None
+        count = 0
+        while max_blocks is None or count < max_blocks:
+            block = self.ring.read(cursor, block_samples)
+            if block is None:
+                print("No audio data received from the microphone.")
+                return
+            yield cursor, block
+            cursor += block_samples
+            count += 1
+
+    def _audio(self, start, end):
+        """Copies a recorded range out of the ring as raw 16-bit PCM bytes."""
+        if end <= start:
+            return b''
+        return np.concatenate(self.ring.views(start, end)).tobytes()
 
-    def record_audio_once(self, duration_seconds):
+    def record_audio_once(self, duration_seconds, on_block=None):
         """
         Records audio from the microphone for a specified duration.
 
         Args:
             duration_seconds (int): Duration of recording in seconds.
+            on_block (callable, optional): Called with each audio block (int16 view into the ring)
+                as soon as it arrives, e.g. `SpeechStream.accept` to recognize while recording.
 
         Returns:
             bytes: Concatenated raw audio data recorded during the session.
@@ -47,26 +91,64 @@ class Record:
             Prints status messages to the console during recording.
         """
         print(f"🎤 Listening for {duration_seconds} seconds...")
-        frames = []
+        start = end = None
         try:
-            with sd.RawInputStream(
-                samplerate=AUDIO_SAMPLERATE,
-                blocksize=AUDIO_BLOCKSIZE,
-                dtype=AUDIO_DTYPE,
-                channels=AUDIO_CHANNELS,
-                callback=self.audio_callback
-            ):
-                for _ in range(int(AUDIO_SAMPLERATE / AUDIO_BLOCKSIZE * duration_seconds)):
-                    try:
-                        data = self.audio_queue.get(timeout=duration_seconds + 1)
-                        frames.append(data)
-                    except queue.Empty:
-                        print("Not enough audio data received within timeout.")
-                        break
+            for position, block in self._blocks(AUDIO_BLOCKSIZE, int(AUDIO_SAMPLERATE / AUDIO_BLOCKSIZE * duration_seconds)):
+                if start is None:
+                    start = position
+                end = position + len(block)
+                if on_block:
+                    on_block(block)
+            return self._audio(start, end) if start is not None else b''
         except Exception as e:
             print(f"Error during audio recording: {e}")
             return b''
+        finally:
+            if not self.keep_open:
+                self.ring.stop()
+
+    def record_utterance(self, max_seconds, on_block=None):
+        """
+        Records one utterance, stopping as soon as the user stops talking.
+
+        Audio is read from the ring in `vad.frame_samples` blocks; the voice activity detector ends the
+        recording after the trailing silence, after `max_seconds` of speech, or when no
+        speech starts within its start timeout.
+
+        Args:
+            max_seconds (float): Maximum length of the speech in seconds.
+            on_block (callable, optional): Called with each audio block (int16 view into the ring)
+                as soon as it arrives.
+
+        Returns:
+            dict: {"audio": speech segment with pre-roll (bytes, empty when nothing was said)}
+                  plus the timing from `VoiceActivityDetector.timing`.
+
+        Side Effects:
+            Prints the endpointing result to the console.
+        """
+        self.vad.reset(max_seconds)
+        start = None
+        audio = b''
+        try:
+            for position, block in self._blocks(self.vad.frame_samples):
+                if start is None:
+                    start = position
+                if on_block:
+                    on_block(block)
+                if self.vad.push(block):
+                    break
+            segment = self.vad.segment()
+            if segment:
+                audio = self._audio(start + segment[0] * self.vad.frame_samples, start + segment[1] * self.vad.frame_samples)
+        except Exception as e:
+            print(f"Error during audio recording: {e}")
+        finally:
+            if not self.keep_open:
+                self.ring.stop()
 
-        if frames:
-            return b''.join(frames)
-        return b''
\ No newline at end of file
+        result = self.vad.timing()
+        result["audio"] = audio
+        print(f"🎤 Recording ended by {result['ended_by'] or 'error'} after {result['recording_seconds']:.2f}s "
+              f"({result['speech_seconds']:.2f}s of speech)")
+        return result
@@ -0,0 +1,111 @@
+import re
+from config import MENU_PHRASES, MENU_MIN_CONFIDENCE, AUDIO_FOLLOW_UP_DURATION
+
+
+class MenuRecognizer:
+    """
+    Fast, accurate recognition of short spoken menu answers ("yes" / "no", "new" / "same" / "previous").
+
+    Instead of full large-vocabulary decoding followed by substring checks (where "know"
+    and "now" count as "no"), the Vosk recognizer is restricted to the menu's phrases in
+    the user's language plus "[unk]", and the result is matched on whole words.
+
+    Args:
+        stt (Stt): Speech-to-text processor providing the models and the streaming recording.
+        menus (dict): {language: {menu: {intent: [phrases]}}}, see `MENU_PHRASES`.
+        min_confidence (float): Answers with a lower mean word confidence are rejected.
+
+    Attributes:
+        last_result (dict or None): Result of the last `listen` call.
+    """
+
+    def __init__(self, stt, menus=MENU_PHRASES, min_confidence=MENU_MIN_CONFIDENCE):
+        self.stt = stt
+        self.menus = menus
+        self.min_confidence = min_confidence
+        self.last_result = None
+
+    def phrases(self, menu, lang=None):
+        """
+        Returns the phrases of a menu in a language, falling back to English.
+
+        Args:
+            menu (str): Menu name, e.g. "follow_up" or "choice".
+            lang (str, optional): Language code. Defaults to the user's stored language.
+
+        Returns:
+            dict: {intent: [phrases]}
+
+        Raises:
+            KeyError: If the menu does not exist.
+        """
+        lang = lang or self.stt.current_language()
+        return self.menus.get(lang, self.menus["en-US"])[menu]
+
+    @staticmethod
+    def grammar(phrases):
+        """
+        Returns the Vosk grammar of a menu: every phrase, plus "[unk]" for anything else.
+        """
+        return sorted({phrase for intent_phrases in phrases.values() for phrase in intent_phrases}) + ["[unk]"]
+
+    @staticmethod
+    def match(text, phrases):
+        """
+        Maps a transcript to the intent whose phrase it contains as whole words.
+
+        Args:
+            text (str): The transcript.
+            phrases (dict): {intent: [phrases]}
+
+        Returns:
+            str or None: The intent, or None when no intent or several different intents match.
+        """
+        text = f" {' '.join(text.lower().split())} "
+        found = {
+            intent for intent, intent_phrases in phrases.items()
+            if any(re.search(rf"(?<!\S){re.escape(phrase)}(?!\S)", text) for phrase in intent_phrases)
+        }
+        return found.pop() if len(found) == 1 else None
+
+    @staticmethod
+    def confidence(words):
+        """
+        Returns the mean confidence of the recognized words, counting "[unk]" as 0.
+        """
+        if not words:
+            return 0.0
+        return sum(0.0 if word.get("word") == "[unk]" else word.get("conf", 1.0) for word in words) / len(words)
+
+    def listen(self, record, menu, duration_seconds=AUDIO_FOLLOW_UP_DURATION, lang=None):
+        """
+        Records one menu answer and recognizes it with the menu's grammar.
+
+        Args:
+            record (Record): Microphone recorder.
+            menu (str): Menu name in `menus`.
+            duration_seconds (float): Maximum length of the answer.
+            lang (str, optional): Language code. Defaults to the user's stored language.
+
+        Returns:
+            dict: {"intent": intent or None, "confidence": 0-1, "text": transcript}
+        """
+        result = {"intent": None, "confidence": 0.0, "text": ""}
+        try:
+            lang = lang or self.stt.current_language()
+            phrases = self.phrases(menu, lang)
+            stream = self.stt.create_stream(lang, grammar=self.grammar(phrases))
+            if stream is not None:
+                text = self.stt.record_into(stream, record, duration_seconds)
+                confidence = self.confidence(stream.words)
+                intent = self.match(text, phrases)
+                result = {
+                    "intent": intent if confidence >= self.min_confidence else None,
+                    "confidence": round(confidence, 3),
+                    "text": text
+                }
+        except Exception as e:
+            print(f"Error recognizing the {menu} menu answer: {e}")
+        print(f"🗣️ Menu {menu}: '{result['text']}' -> {result['intent']} ({result['confidence']:.2f})")
+        self.last_result = result
+        return result
@@ -0,0 +1,95 @@
+import json
+import threading
+import vosk
+from config import AUDIO_RECOGNIZER_POOL_SIZE
+
+
+class RecognizerPool:
+    """
+    Pool of reusable Vosk recognizers, keyed by (model, sample rate, grammar).
+
+    Building a `KaldiRecognizer` allocates the decoder (and compiles the grammar when
+    there is one); a recognizer that was flushed and reset decodes the next utterance
+    just like a new one. Recognizers are taken exclusively, so concurrent sessions each
+    get their own, and at most `max_idle` per key are kept for reuse.
+
+    Args:
+        max_idle (int): Idle recognizers kept per key.
+
+    Attributes:
+        created (int): Recognizers built.
+        reused (int): Recognizers handed out again from the pool.
+    """
+
+    def __init__(self, max_idle=AUDIO_RECOGNIZER_POOL_SIZE):
+        self.max_idle = max_idle
+        self.created = 0
+        self.reused = 0
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model_key, samplerate, grammar=None):
+        """
+        Returns the pool key of a recognizer configuration.
+
+        Args:
+            model_key (str): Identity of the model, e.g. its directory.
+            samplerate (int): Sample rate of the audio.
+            grammar (list[str], optional): Phrases the recognizer is restricted to.
+
+        Returns:
+            tuple: (model_key, samplerate, grammar JSON or None)
+        """
+        return model_key, samplerate, json.dumps(grammar, ensure_ascii=False) if grammar else None
+
+    def acquire(self, model, key):
+        """
+        Takes a ready recognizer out of the pool, building one when none is idle.
+
+        Args:
+            model (vosk.Model): The model for `key`.
+            key (tuple): Key from `key()`.
+
+        Returns:
+            vosk.KaldiRecognizer: A recognizer with word confidences enabled, owned by the caller until `release`.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop()
+            self.created += 1
+
+        _, samplerate, grammar = key
+        recognizer = vosk.KaldiRecognizer(model, samplerate, grammar) if grammar else vosk.KaldiRecognizer(model, samplerate)
+        recognizer.SetWords(True)
+        return recognizer
+
+    def release(self, key, recognizer):
+        """
+        Resets a recognizer and returns it to the pool.
+
+        Args:
+            key (tuple): Key the recognizer was acquired with.
+            recognizer (vosk.KaldiRecognizer): The recognizer.
+        """
+        recognizer.Reset()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(recognizer)
+
+    def stats(self):
+        """
+        Returns the pool counters.
+
+        Returns:
+            dict: {"created", "reused", "idle"}
+        """
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": sum(len(idle) for idle in self._idle.values())
+            }
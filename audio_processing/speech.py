@@ -1,27 +1,42 @@
 import json
 import vosk
 import os
-from config import AUDIO_SAMPLERATE, LANG_SETTINGS
+import threading
+import time
+from audio_processing.recognizer_pool import RecognizerPool
+from config import AUDIO_SAMPLERATE, AUDIO_BLOCKSIZE, AUDIO_VAD, LANG_SETTINGS
 
 class Stt:
     """
     A class for performing speech-to-text conversion using Vosk.
 
+    Per utterance only a pooled recognizer is taken: the user's language is re-read from
+    the database only after `GetLanguage.version` changes, and each language's model
+    directory is resolved and checked on disk once.
+
     Attributes:
         vosk_cache (dict): Class-level cache for loaded Vosk models.
         get_lang (Get_language): Instance used to retrieve the user's selected language.
+        pool (RecognizerPool): Reusable recognizers per (model, sample rate, grammar).
+        last_utterance (dict or None): Endpointing timing of the last `transcribe_live` call.
     """
 
     vosk_cache = {}
+    _vosk_cache_lock = threading.Lock()
 
-    def __init__(self, get_lang):
+    def __init__(self, get_lang, pool=None):
         """
         Initializes the Stt class with a language retriever.
 
         Args:
             get_lang (Get_language): Object that provides the user's language settings.
+            pool (RecognizerPool, optional): Recognizer pool. Defaults to a new one.
         """
         self.get_lang = get_lang
+        self.pool = pool or RecognizerPool()
+        self.last_utterance = None
+        self._language = None
+        self._models_by_lang = {}
 
     @classmethod
     def _get_vosk_model(cls, file_path):
@@ -34,52 +49,240 @@ class Stt:
         Returns:
             vosk.Model: Loaded Vosk model instance.
         """
-        model = cls.vosk_cache.get(file_path)
-        if not model:
-            model = vosk.Model(file_path)
-            cls.vosk_cache[file_path] = model
-            print(f"Model cached for: {file_path}")
-        return model
+        with cls._vosk_cache_lock:
+            model = cls.vosk_cache.get(file_path)
+            if not model:
+                model = vosk.Model(file_path)
+                cls.vosk_cache[file_path] = model
+                print(f"Model cached for: {file_path}")
+            return model
 
-    def speech_to_text(self, data):
+    def current_language(self):
         """
-        Converts raw audio data to text using the appropriate Vosk model.
+        Returns the user's stored language code.
 
-        Args:
-            data (bytes): Raw audio data in WAV format.
+        The code is cached together with `GetLanguage.version` and read again only after
+        a new language was saved; retrievers without a version are always asked.
 
         Returns:
-            str: Transcribed text from the audio input. Returns an empty string on failure.
+            str: Language code, "en-US" when none is stored.
         """
+        version = getattr(self.get_lang, "version", None)
+        cached = self._language
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
         usr_lang = self.get_lang.load_language()
-        lang = usr_lang.get('language')
-        print(lang)
-        if not lang:
-            lang = "en-US"
-
-        selected_lang = LANG_SETTINGS.get(lang)
-        print(selected_lang)
-        lang_vosk_path = selected_lang.get('vosk_model_path')
-        print(lang_vosk_path)
+        lang = usr_lang.get('language') or "en-US"
+        self._language = (version, lang)
+        return lang
+
+    def _resolve_model(self, lang):
+        """
+        Returns the model directory and model of a language, resolving them once.
+
+        Args:
+            lang (str): Language code.
+
+        Returns:
+            tuple or None: (model directory, vosk.Model), or None if the model directory is missing.
+        """
+        resolved = self._models_by_lang.get(lang)
+        if resolved:
+            return resolved
+
+        selected_lang = LANG_SETTINGS.get(lang) or LANG_SETTINGS["en-US"]
         BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        lang_vosk_path_ex = os.path.join(BASE_DIR, lang_vosk_path)
-        print(lang_vosk_path_ex)
+        lang_vosk_path_ex = os.path.join(BASE_DIR, selected_lang.get('vosk_model_path'))
 
         if not os.path.exists(lang_vosk_path_ex):
+            # Not cached: the model may still be downloaded
             print(f"Error: Vosk model not found at {lang_vosk_path_ex}. Please download it.")
-            return ""
+            return None
+
+        resolved = (lang_vosk_path_ex, self._get_vosk_model(lang_vosk_path_ex))
+        self._models_by_lang[lang] = resolved
+        return resolved
+
+    def load_model(self, lang=None):
+        """
+        Resolves the Vosk model directory for a language and returns the cached model.
+
+        Args:
+            lang (str, optional): Language code. Defaults to the user's stored language.
+
+        Returns:
+            vosk.Model or None: Loaded Vosk model, or None if the model directory is missing.
+        """
+        resolved = self._resolve_model(lang or self.current_language())
+        return resolved[1] if resolved else None
+
+    def create_stream(self, lang=None, grammar=None):
+        """
+        Creates a streaming recognizer for one utterance, taking a recognizer from the pool.
+
+        Args:
+            lang (str, optional): Language code. Defaults to the user's stored language.
+            grammar (list[str], optional): Phrases the recognizer is restricted to
+                (add "[unk]" to let it reject anything else). Unrestricted when None.
+
+        Returns:
+            SpeechStream or None: The stream, or None if the Vosk model is missing.
+                                  Its recognizer goes back to the pool when the stream finishes.
+        """
+        resolved = self._resolve_model(lang or self.current_language())
+        if not resolved:
+            return None
+        model_path, model = resolved
+        key = self.pool.key(model_path, AUDIO_SAMPLERATE, grammar)
+        recognizer = self.pool.acquire(model, key)
+        return SpeechStream(recognizer, on_finish=lambda finished: self.pool.release(key, finished))
+
+    def record_into(self, stream, record, duration_seconds, on_partial=None, endpointing=AUDIO_VAD):
+        """
+        Records and recognizes at the same time: every audio block goes to the stream as
+        soon as it arrives, so the transcript is ready the moment recording ends.
+
+        Args:
+            stream (SpeechStream): Stream from `create_stream`.
+            record (Record): Microphone recorder.
+            duration_seconds (float): Recording length in seconds; the maximum speech length with endpointing.
+            on_partial (callable, optional): Called with the partial transcript whenever it changes.
+            endpointing (bool): Stop when the user stops talking (`Record.record_utterance`)
+                instead of after `duration_seconds`.
+
+        Returns:
+            str: Transcribed text.
+
+        Side Effects:
+            Sets `last_utterance` to the endpointing timing, or None without endpointing.
+        """
+        def feed(block):
+            if stream.accept(block) and on_partial:
+                on_partial(stream.partial)
+
+        if endpointing:
+            self.last_utterance = record.record_utterance(duration_seconds, on_block=feed)
         else:
-            print(f"Vosk model found at {lang_vosk_path_ex}")
+            self.last_utterance = None
+            record.record_audio_once(duration_seconds=duration_seconds, on_block=feed)
+        text = stream.finish()
+        print(f"📝 Transcript ready {stream.finish_seconds * 1000:.0f}ms after recording ended")
+        return text
 
+    def transcribe_live(self, record, duration_seconds, on_partial=None, endpointing=AUDIO_VAD):
+        """
+        Records one utterance and transcribes it with the full vocabulary.
+
+        Args:
+            record (Record): Microphone recorder.
+            duration_seconds (float): Recording length in seconds; the maximum speech length with endpointing.
+            on_partial (callable, optional): Called with the partial transcript whenever it changes.
+            endpointing (bool): Stop when the user stops talking instead of after `duration_seconds`.
+
+        Returns:
+            str: Transcribed text. Returns an empty string on failure.
+        """
         try:
-            model = self._get_vosk_model(lang_vosk_path_ex)
-            if model:
-                rec = vosk.KaldiRecognizer(model, AUDIO_SAMPLERATE)
-
-                if rec.AcceptWaveform(data):
-                    result = json.loads(rec.Result())
-                    text = result.get("text", "").strip()
-                    return text if text else ""
+            stream = self.create_stream()
+            if stream is None:
+                return ""
+            return self.record_into(stream, record, duration_seconds, on_partial, endpointing)
         except Exception as e:
             print(f"Error with Vosk speech-to-text: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+    def speech_to_text(self, data):
+        """
+        Converts raw audio data to text using the appropriate Vosk model.
+
+        Args:
+            data (bytes): Raw 16-bit mono PCM audio.
+
+        Returns:
+            str: Transcribed text from the audio input. Returns an empty string on failure.
+        """
+        try:
+            stream = self.create_stream()
+            if stream is None:
+                return ""
+            block_bytes = AUDIO_BLOCKSIZE * 2
+            for offset in range(0, len(data), block_bytes):
+                stream.accept(data[offset:offset + block_bytes])
+            return stream.finish()
+        except Exception as e:
+            print(f"Error with Vosk speech-to-text: {e}")
+            return ""
+
+
+class SpeechStream:
+    """
+    Incremental recognition of one utterance.
+
+    Vosk finalizes a segment whenever it detects a pause; the finalized segments are
+    kept and joined with the remainder returned by `FinalResult` when the stream ends.
+
+    Args:
+        recognizer (vosk.KaldiRecognizer): A fresh (or reset) recognizer.
+        on_finish (callable, optional): Called with the recognizer once `finish` no longer needs it.
+
+    Attributes:
+        partial (str): Current best guess for the whole utterance so far.
+        words (list[dict]): Finalized words with their confidence, {"word", "conf", ...}.
+        finish_seconds (float): Time `finish` took, i.e. the STT latency after recording.
+    """
+
+    def __init__(self, recognizer, on_finish=None):
+        self.recognizer = recognizer
+        self.on_finish = on_finish
+        self.partial = ""
+        self.finish_seconds = 0.0
+        self.words = []
+        self._segments = []
+
+    def _collect(self, result):
+        """
+        Keeps the text and words of a finalized Vosk result.
+        """
+        result = json.loads(result)
+        self.words.extend(result.get("result", []))
+        text = result.get("text", "").strip()
+        if text:
+            self._segments.append(text)
+
+    def accept(self, block):
+        """
+        Feeds one audio block to the recognizer.
+
+        Args:
+            block (bytes or np.ndarray): Raw 16-bit mono PCM audio.
+
+        Returns:
+            bool: True when the partial transcript changed.
+        """
+        if self.recognizer.AcceptWaveform(bytes(block)):
+            self._collect(self.recognizer.Result())
+            current = ""
+        else:
+            current = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+
+        partial = " ".join(self._segments + ([current] if current else []))
+        changed = partial != self.partial
+        self.partial = partial
+        return changed
+
+    def finish(self):
+        """
+        Flushes the recognizer and returns the full transcript.
+
+        Returns:
+            str: The transcript, or an empty string if nothing was recognized.
+        """
+        start = time.perf_counter()
+        self._collect(self.recognizer.FinalResult())
+        self.partial = " ".join(self._segments)
+        self.finish_seconds = time.perf_counter() - start
+        on_finish, self.on_finish = self.on_finish, None
+        if on_finish:
+            on_finish(self.recognizer)
+            self.recognizer = None
+        return self.partial
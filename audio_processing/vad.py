@@ -0,0 +1,168 @@
+import numpy as np
+from config import (
+    AUDIO_SAMPLERATE, AUDIO_VAD_FRAME_MS, AUDIO_VAD_START_TIMEOUT_SECONDS, AUDIO_VAD_TRAILING_SILENCE_SECONDS,
+    AUDIO_VAD_MIN_SPEECH_SECONDS, AUDIO_VAD_PRE_ROLL_SECONDS, AUDIO_VAD_ENERGY_MARGIN_DB, AUDIO_VAD_MIN_RMS,
+    AUDIO_VAD_MAX_ZERO_CROSSING_RATE
+)
+
+# Weight of each non-speech frame in the running noise floor estimate
+NOISE_FLOOR_SMOOTHING = 0.05
+
+
+class VoiceActivityDetector:
+    """
+    Energy / zero-crossing voice activity detector that decides when a recording can end.
+
+    Each frame is speech when its RMS level is `energy_margin_db` above the running
+    noise floor (and above `min_rms`), and its zero-crossing rate is low enough to be
+    voice rather than hiss or clicks. Frames are pushed one at a time; the recording:
+    - starts once `min_speech_seconds` of consecutive speech is heard
+    - ends with "no_speech" when nothing starts within `start_timeout_seconds`
+    - ends with "silence" after `trailing_silence_seconds` without speech
+    - ends with "max_length" when the speech lasts longer than the limit given to `reset`
+
+    Args:
+        samplerate (int): Sample rate of the 16-bit mono audio.
+        frame_ms (int): Frame length in milliseconds; the recorder uses it as block size.
+        start_timeout_seconds (float): Maximum wait for speech to start.
+        trailing_silence_seconds (float): Silence that ends the utterance.
+        min_speech_seconds (float): Speech needed to count as a start (ignores clicks and coughs).
+        pre_roll_seconds (float): Audio kept before the detected start and after the last speech.
+        energy_margin_db (float): Margin over the noise floor.
+        min_rms (float): Absolute minimum speech level (int16 scale).
+        max_zero_crossing_rate (float): Highest zero-crossing rate (0-1) of a voice frame.
+
+    Attributes:
+        frame_samples (int): Samples per frame.
+        speech_start (int or None): Frame index where speech started.
+        speech_end (int or None): Frame index after the last speech frame.
+        ended_by (str or None): "no_speech", "silence" or "max_length" once the recording should stop.
+    """
+
+    def __init__(self, samplerate=AUDIO_SAMPLERATE, frame_ms=AUDIO_VAD_FRAME_MS,
+                 start_timeout_seconds=AUDIO_VAD_START_TIMEOUT_SECONDS,
+                 trailing_silence_seconds=AUDIO_VAD_TRAILING_SILENCE_SECONDS,
+                 min_speech_seconds=AUDIO_VAD_MIN_SPEECH_SECONDS, pre_roll_seconds=AUDIO_VAD_PRE_ROLL_SECONDS,
+                 energy_margin_db=AUDIO_VAD_ENERGY_MARGIN_DB, min_rms=AUDIO_VAD_MIN_RMS,
+                 max_zero_crossing_rate=AUDIO_VAD_MAX_ZERO_CROSSING_RATE):
+        self.samplerate = samplerate
+        self.frame_samples = int(samplerate * frame_ms / 1000)
+        self.frame_seconds = self.frame_samples / samplerate
+        self._start_timeout_frames = self._frames(start_timeout_seconds)
+        self._trailing_silence_frames = self._frames(trailing_silence_seconds)
+        self._min_speech_frames = self._frames(min_speech_seconds)
+        self._pre_roll_frames = self._frames(pre_roll_seconds)
+        self.energy_ratio = 10 ** (energy_margin_db / 20)
+        self.min_rms = min_rms
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.reset()
+
+    def _frames(self, seconds):
+        """Converts a duration to a whole number of frames (at least one)."""
+        return max(1, round(seconds / self.frame_seconds))
+
+    def reset(self, max_seconds=None):
+        """
+        Prepares the detector for a new recording.
+
+        Args:
+            max_seconds (float, optional): Maximum length of the speech. Unlimited when None.
+        """
+        self._max_frames = self._frames(max_seconds) if max_seconds else None
+        self._frame_index = 0
+        self._noise_rms = None
+        self._speech_run = 0
+        self._silence_run = 0
+        self.speech_start = None
+        self.speech_end = None
+        self.ended_by = None
+
+    def is_speech(self, frame):
+        """
+        Classifies one frame and updates the noise floor with non-speech frames.
+
+        Args:
+            frame (bytes or np.ndarray): 16-bit mono samples.
+
+        Returns:
+            bool: True when the frame sounds like voice.
+        """
+        samples = np.frombuffer(frame, dtype=np.int16) if isinstance(frame, (bytes, bytearray, memoryview)) else frame
+        if samples.size == 0:
+            return False
+        samples = samples.astype(np.float32)
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        zero_crossing_rate = float(np.mean(np.signbit(samples[1:]) != np.signbit(samples[:-1]))) if samples.size > 1 else 0.0
+
+        floor = self._noise_rms if self._noise_rms is not None else self.min_rms / self.energy_ratio
+        speech = rms >= max(self.min_rms, floor * self.energy_ratio) and zero_crossing_rate <= self.max_zero_crossing_rate
+        if not speech:
+            self._noise_rms = rms if self._noise_rms is None else \
+                self._noise_rms + NOISE_FLOOR_SMOOTHING * (rms - self._noise_rms)
+        return speech
+
+    def push(self, frame):
+        """
+        Feeds the next frame of the recording.
+
+        Args:
+            frame (bytes or np.ndarray): 16-bit mono samples, `frame_samples` long.
+
+        Returns:
+            str or None: Why the recording should stop, or None to keep recording.
+        """
+        if self.ended_by:
+            return self.ended_by
+        index = self._frame_index
+        self._frame_index += 1
+        speech = self.is_speech(frame)
+
+        if self.speech_start is None:
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self._min_speech_frames:
+                self.speech_start = index - self._speech_run + 1
+                self.speech_end = index + 1
+            elif self._frame_index >= self._start_timeout_frames:
+                self.ended_by = "no_speech"
+            return self.ended_by
+
+        if speech:
+            self.speech_end = index + 1
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+        if self._silence_run >= self._trailing_silence_frames:
+            self.ended_by = "silence"
+        elif self._max_frames and self._frame_index - self.speech_start >= self._max_frames:
+            self.ended_by = "max_length"
+        return self.ended_by
+
+    def segment(self):
+        """
+        Returns the frame range of the utterance, padded with the pre-roll on both sides.
+
+        Returns:
+            tuple or None: (first frame, end frame), or None when no speech was heard.
+        """
+        if self.speech_start is None:
+            return None
+        start = max(0, self.speech_start - self._pre_roll_frames)
+        end = min(self._frame_index, self.speech_end + self._pre_roll_frames)
+        return start, end
+
+    def timing(self):
+        """
+        Returns the timing of the utterance relative to the start of the recording.
+
+        Returns:
+            dict: {"ended_by", "speech_start_seconds", "speech_end_seconds", "speech_seconds", "recording_seconds"};
+                  speech times are None when no speech was heard.
+        """
+        heard = self.speech_start is not None
+        return {
+            "ended_by": self.ended_by,
+            "speech_start_seconds": round(self.speech_start * self.frame_seconds, 3) if heard else None,
+            "speech_end_seconds": round(self.speech_end * self.frame_seconds, 3) if heard else None,
+            "speech_seconds": round((self.speech_end - self.speech_start) * self.frame_seconds, 3) if heard else 0.0,
+            "recording_seconds": round(self._frame_index * self.frame_seconds, 3)
+        }
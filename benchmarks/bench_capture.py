@@ -0,0 +1,61 @@
+import argparse
+import time
+from camera.camera import CameraHandler
+from camera.frame_sources import create_frame_source
+
+"""
+Capture latency benchmark that needs no webcam.
+
+Runs `CameraHandler` on any frame source (synthetic by default, or a recorded video
+or image directory) without a preview window and times the three capture modes:
+the freshest frame, the first frame after "now" (the countdown case) and a scored burst.
+
+Usage:
+    python -m benchmarks.bench_capture
+    python -m benchmarks.bench_capture --source video:/path/scene.mp4 --captures 100
+"""
+
+
+def timed(function, captures):
+    """
+    Calls `function` `captures` times.
+
+    Returns:
+        tuple: (median ms, p95 ms)
+    """
+    durations = []
+    for _ in range(captures):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return durations[len(durations) // 2] * 1000, durations[int(len(durations) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark capture latency on a frame source.")
+    parser.add_argument("--source", default="synthetic:1280x720")
+    parser.add_argument("--captures", type=int, default=50)
+    args = parser.parse_args()
+
+    source = create_frame_source(args.source)
+    camera_handler = CameraHandler(frame_source=source, keep_open=False, preview=False)
+    camera_handler.start_camera()
+    try:
+        camera_handler.take_capture()  # wait for the first frame outside the measurement
+        results = {
+            "freshest frame": timed(camera_handler.take_capture, args.captures),
+            "next frame": timed(lambda: camera_handler.take_capture(after=time.monotonic()), args.captures),
+            "burst": timed(lambda: camera_handler.capture_burst(after=time.monotonic()), max(1, args.captures // 5))
+        }
+    finally:
+        camera_handler.release_camera()
+
+    print(f"{source.name} at {source.fps:.0f} fps")
+    print(f"{'capture':<16}{'median ms':>11}{'p95 ms':>9}")
+    for name, (median, p95) in results.items():
+        print(f"{name:<16}{median:>11.2f}{p95:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import difflib
+import json
+import os
+import subprocess
+import sys
+import time
+import PIL.Image
+from config import BASE_DIR, GEMMA_MODEL_PATH
+
+"""
+Accuracy-vs-latency benchmark for the Gemma precision modes.
+
+Each mode runs in its own subprocess so load time and resident memory are measured
+from a clean process. Every mode answers the same image/question fixtures; answers
+are compared against the fp32 answers to report drift.
+
+Usage:
+    python -m benchmarks.bench_precision
+    python -m benchmarks.bench_precision --modes fp32 int8 --model-path /path/to/gemma
+"""
+
+FIXTURES = [
+    ("static/assets/echo_logo.jpg", "Describe this image please."),
+    ("static/assets/echo_logo.jpg", "What text can you read?"),
+    ("user enter his name.jpg", "What is on the screen?"),
+    ("user enter his name (1).jpg", "What colors do you see?"),
+    ("user enter his name (2).jpg", "Is there a button?")
+]
+
+
+def resident_memory_mb():
+    """
+    Returns the current resident set size of this process in MB.
+
+    Reads `/proc/self/status` on Linux and falls back to the peak RSS on other Unix
+    systems; returns None on Windows, which has no `resource` module.
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if sys.platform == "win32":
+        return None
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_single_mode(mode, model_path):
+    """
+    Loads the model in one precision mode and runs every fixture through it.
+
+    Args:
+        mode (str): Precision mode.
+        model_path (str): Local directory of the Gemma model.
+
+    Returns:
+        dict: Load time, resident memory and per-fixture profiles.
+    """
+    from ai_integrations.gemma_3n import GemmaModelHolder
+
+    rss_before = resident_memory_mb()
+    holder = GemmaModelHolder(model_path, precision=mode)
+    holder.load()
+
+    results = []
+    for image_path, question in FIXTURES:
+        image = PIL.Image.open(os.path.join(BASE_DIR, image_path)).convert("RGB")
+        results.append(holder.profile(image, question))
+
+    rss_after = resident_memory_mb()
+    return {
+        "mode": mode,
+        "load_seconds": holder.load_seconds,
+        "resident_mb": rss_after,
+        "model_mb": rss_after - rss_before if rss_after is not None else None,
+        "fixtures": results
+    }
+
+
+def run_mode_in_subprocess(mode, model_path):
+    """
+    Runs `run_single_mode` in a fresh Python process and returns its JSON result.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_precision", "--single-mode", mode, "--model-path", model_path],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        print(f"Mode {mode} failed after {time.perf_counter() - start:.1f}s:\n{completed.stderr}")
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(results):
+    """
+    Prints one row per mode with latency, memory and drift against fp32.
+
+    Args:
+        results (list[dict]): Outputs of `run_single_mode`, fp32 first when present.
+    """
+    baseline = next((result for result in results if result["mode"] == "fp32"), None)
+    print(f"{'mode':<6}{'load s':>9}{'RSS MB':>9}{'prefill s':>11}{'decode ms/tok':>15}{'exact':>8}{'similarity':>12}")
+    for result in results:
+        fixtures = result["fixtures"]
+        prefill = sum(f["prefill_seconds"] for f in fixtures) / len(fixtures)
+        decode = sum(f["decode_seconds_per_token"] for f in fixtures) / len(fixtures)
+        if baseline is not None:
+            pairs = list(zip(baseline["fixtures"], fixtures))
+            exact = sum(a["answer"] == b["answer"] for a, b in pairs) / len(pairs)
+            similarity = sum(
+                difflib.SequenceMatcher(None, a["answer"], b["answer"]).ratio() for a, b in pairs
+            ) / len(pairs)
+            drift = f"{exact:>8.0%}{similarity:>12.3f}"
+        else:
+            drift = f"{'n/a':>8}{'n/a':>12}"
+        resident = f"{result['resident_mb']:>9.0f}" if result["resident_mb"] is not None else f"{'n/a':>9}"
+        print(f"{result['mode']:<6}{result['load_seconds']:>9.1f}{resident}"
+              f"{prefill:>11.2f}{decode * 1000:>15.1f}{drift}")
+
+    for result in results:
+        print(f"\n[{result['mode']}] answers:")
+        for (image_path, question), fixture in zip(FIXTURES, result["fixtures"]):
+            print(f"  {os.path.basename(image_path)} | {question} -> {fixture['answer']!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemma precision modes on CPU.")
+    parser.add_argument("--modes", nargs="+", default=["fp32", "bf16", "int8"])
+    parser.add_argument("--model-path", default=GEMMA_MODEL_PATH)
+    parser.add_argument("--single-mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single_mode:
+        print(json.dumps(run_single_mode(args.single_mode, args.model_path)))
+        return
+
+    modes = sorted(args.modes, key=lambda mode: mode != "fp32")
+    results = [result for result in (run_mode_in_subprocess(mode, args.model_path) for mode in modes) if result]
+    if results:
+        summarize(results)
+
+
+if __name__ == '__main__':
+    main()
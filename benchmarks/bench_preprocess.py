@@ -0,0 +1,107 @@
+import argparse
+import os
+import time
+import tracemalloc
+import cv2
+import numpy as np
+import PIL.Image
+from camera.preprocess import FramePreprocessor
+from config import BASE_DIR, GEMMA_MODEL_PATH
+
+"""
+Per-frame latency and allocation benchmark for camera frame preprocessing.
+
+Compares the current path (BGR -> RGB -> PIL -> 200x200 resize -> Hugging Face image
+processor) with `FramePreprocessor` (BGR frame -> normalized pixel array in place).
+Both produce the pixel array the model consumes; only the preprocessing is timed.
+
+Usage:
+    python -m benchmarks.bench_preprocess
+    python -m benchmarks.bench_preprocess --frames 500 --frame-size 1280x720 --model-path /path/to/gemma
+"""
+
+
+def make_frame(width, height, image_path=None):
+    """
+    Builds a BGR uint8 test frame, from an image file when given, else random noise.
+    """
+    if image_path:
+        frame = cv2.imread(image_path)
+        if frame is not None:
+            return cv2.resize(frame, (width, height))
+    return np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def pil_path(image_processor):
+    """
+    Returns the current preprocessing path as a function of a BGR frame.
+    """
+    def run(frame_bgr):
+        frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+        pil_img = PIL.Image.fromarray(frame_rgb).resize((200, 200))
+        return image_processor(images=pil_img, return_tensors="np")["pixel_values"]
+    return run
+
+
+def measure(run, frame, frames):
+    """
+    Times a preprocessing function and traces its allocations.
+
+    Args:
+        run (callable): Preprocessing function taking a BGR frame.
+        frame (numpy.ndarray): Input frame.
+        frames (int): Number of timed iterations.
+
+    Returns:
+        dict: Median and p95 milliseconds per frame, and peak traced KB allocated for one frame.
+    """
+    run(frame)  # warm up lazy initialisation outside the measurement
+
+    durations = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        run(frame)
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+
+    # Peak traced memory over one frame is the transient allocation the path makes per frame
+    tracemalloc.start()
+    run(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": durations[len(durations) // 2] * 1000,
+        "p95_ms": durations[int(len(durations) * 0.95) - 1] * 1000,
+        "peak_kb": peak / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark camera frame preprocessing paths.")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--frame-size", default="640x480", help="WIDTHxHEIGHT of the simulated camera frame")
+    parser.add_argument("--image", default=os.path.join(BASE_DIR, "static", "assets", "echo_logo.jpg"))
+    parser.add_argument("--model-path", default=GEMMA_MODEL_PATH)
+    args = parser.parse_args()
+
+    from transformers import AutoImageProcessor
+
+    width, height = (int(value) for value in args.frame_size.lower().split("x"))
+    frame = make_frame(width, height, args.image)
+    image_processor = AutoImageProcessor.from_pretrained(args.model_path)
+    preprocessor = FramePreprocessor.from_image_processor(image_processor)
+
+    results = {
+        "pil + processor": measure(pil_path(image_processor), frame, args.frames),
+        "frame preprocessor": measure(preprocessor, frame, args.frames)
+    }
+
+    print(f"{width}x{height} frame -> {preprocessor.width}x{preprocessor.height} pixels, {args.frames} frames")
+    print(f"{'path':<20}{'median ms':>11}{'p95 ms':>9}{'alloc KB/frame':>16}")
+    for name, result in results.items():
+        print(f"{name:<20}{result['median_ms']:>11.2f}{result['p95_ms']:>9.2f}{result['peak_kb']:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
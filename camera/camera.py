@@ -1,28 +1,66 @@
+import atexit
+import time
 import cv2
 import PIL.Image
+from camera.frame_grabber import FrameGrabber
+from camera.frame_quality import FrameQuality
+from camera.frame_sources import create_frame_source
+from camera.preview import FramePreview
+from config import (
+    CAMERA_SOURCE, CAMERA_RING_SIZE, CAMERA_KEEP_OPEN, CAMERA_PREVIEW, CAMERA_PREVIEW_FPS,
+    CAMERA_CAPTURE_TIMEOUT_SECONDS, CAMERA_BURST_SIZE
+)
 
 class CameraHandler:
     """
     Manages camera operations for capturing images using OpenCV.
 
+    Frames come from a pluggable frame source (live device, video file, image
+    directory or synthetic generator, see camera/frame_sources.py), so the same
+    pipeline runs on headless servers and replays recorded scenes.
+
     This class provides methods to:
-    - Start the camera
+    - Start the frame source, its background frame grabber and the optional preview
     - Capture a frame and convert it to a PIL image
+    - Capture a burst and keep its sharpest, best exposed frame
     - Stop and release the camera resources
     """
 
-    def __init__(self):
+    def __init__(self, frame_source=None, ring_size=CAMERA_RING_SIZE, keep_open=CAMERA_KEEP_OPEN,
+                 frame_quality=None, preview=None):
         """
         Initializes the CameraHandler instance.
 
+        Args:
+            frame_source (FrameSource, optional): Where frames come from; defaults to `CAMERA_SOURCE`.
+            ring_size (int): Number of recent frames kept by the frame grabber.
+            keep_open (bool): Keep the device open and grabbing after `stop_camera`,
+                              so the next session starts without reopening it.
+            frame_quality (FrameQuality, optional): Burst frame scorer; defaults to config thresholds.
+            preview (FramePreview, optional): Local preview window; defaults to one when
+                                              `CAMERA_PREVIEW` is set, False disables it.
+
         Attributes:
-            image_capture (cv2.VideoCapture): The OpenCV video capture object.
+            image_capture (FrameSource): The frame source, opened by `start_camera`.
+            frame_grabber (FrameGrabber): Background reader filling the frame ring buffer.
+            last_frame (numpy.ndarray): Raw BGR frame of the latest capture, for
+                                        `GemmaModelHolder.generate_frame`; the interaction flow
+                                        sends the PIL capture instead.
         """
-        self.image_capture = None
+        self.image_capture = frame_source if frame_source is not None else create_frame_source(CAMERA_SOURCE)
+        self.ring_size = ring_size
+        self.keep_open = keep_open
+        self.frame_grabber = None
+        self.last_frame = None
+        self.frame_quality = frame_quality if frame_quality is not None else FrameQuality()
+        if preview is None and CAMERA_PREVIEW:
+            preview = FramePreview(fps=CAMERA_PREVIEW_FPS)
+        self.preview = preview
+        self._release_registered = False
 
     def start_camera(self):
         """
-        Starts the camera if it's not already running.
+        Starts the camera and the background frame grabber if they are not already running.
 
         Returns:
             bool: True if the camera starts successfully.
@@ -30,51 +68,133 @@ class CameraHandler:
         Raises:
             Exception: If the camera cannot be accessed or is in use.
         """
-        if self.image_capture is None or not self.image_capture.isOpened():
-            self.image_capture = cv2.VideoCapture(0)
-            if not self.image_capture.isOpened():
-                raise Exception("Camera not available. Ensure it's connected and not in use by another application.")
-            print("📸 Camera ready.")
+        if not self.image_capture.isOpened():
+            if not self.image_capture.open():
+                raise Exception(f"Camera not available ({self.image_capture.name}). Ensure it's connected and not in use by another application.")
+            self.frame_grabber = FrameGrabber(
+                self.image_capture, self.ring_size, on_demand=getattr(self.image_capture, "on_demand", False)
+            )
+            if not self._release_registered:
+                atexit.register(self.release_camera)
+                self._release_registered = True
+            print(f"📸 Camera ready ({self.image_capture.name}).")
+        self.frame_grabber.start()
+        if self.preview:
+            self.preview.start(self.frame_grabber)
         return True
 
-    def take_capture(self):
+    def take_capture(self, after=None):
         """
-        Captures a single frame from the camera and returns it as a resized PIL image.
+        Returns a frame from the grabber's ring buffer as a PIL image.
+
+        Args:
+            after (float, optional): `time.monotonic()` moment the photo should be taken at
+                                     (e.g. the end of the countdown). The first frame read at
+                                     or after it is used. When None, the freshest frame is used.
 
         Returns:
-            PIL.Image.Image or None: The captured image in RGB format resized to 200x200,
+            PIL.Image.Image or None: The captured image in RGB format at full resolution,
                                      or None if capture fails or camera is not running.
-
-        Side Effects:
-            Displays the captured frame in a window using OpenCV.
         """
-        if self.image_capture is None or not self.image_capture.isOpened():
+        if self.frame_grabber is None or not self.frame_grabber.is_running:
             print("Camera is not running. Please start the camera first.")
             return None
 
-        ret, frame = self.image_capture.read()
-        if not ret:
+        if after is None and not self.frame_grabber.on_demand:
+            # Right after start_camera the ring may still be empty
+            entry = self.frame_grabber.latest() or self.frame_grabber.frame_after(0.0, CAMERA_CAPTURE_TIMEOUT_SECONDS)
+        else:
+            entry = self.frame_grabber.frame_after(after or 0.0, CAMERA_CAPTURE_TIMEOUT_SECONDS)
+        if entry is None:
             print("Failed to capture frame from camera.")
             return None
 
-        cv2.imshow("Camera", frame)
-        cv2.waitKey(1)
+        _, frame = entry
+        return self._to_pil(frame)
+
+    def capture_burst(self, count=CAMERA_BURST_SIZE, after=None):
+        """
+        Grabs `count` consecutive frames and keeps the best one.
+
+        Frames are scored by `frame_quality` (blur, exposure, motion). Scoring runs on
+        small grayscale copies, so a bad burst is reported in milliseconds instead of
+        after a full model call.
+
+        Args:
+            count (int): Number of consecutive frames to grab.
+            after (float, optional): `time.monotonic()` moment the burst starts at; defaults to now.
+
+        Returns:
+            tuple: (PIL.Image.Image or None, dict or None) - the best frame as an RGB image
+                   and its evaluation (see `FrameQuality.evaluate`), whose "problem" is None when
+                   the frame is usable. (None, None) if the camera delivers no frame.
+        """
+        if self.frame_grabber is None or not self.frame_grabber.is_running:
+            print("Camera is not running. Please start the camera first.")
+            return None, None
+
+        moment = time.monotonic() if after is None else after
+        frames = []
+        for _ in range(max(1, count)):
+            entry = self.frame_grabber.frame_after(moment, CAMERA_CAPTURE_TIMEOUT_SECONDS)
+            if entry is None:
+                break
+            timestamp, frame = entry
+            frames.append(frame)
+            # Strictly later than this frame, so the next one is the following device frame
+            moment = timestamp + 1e-6
+
+        if not frames:
+            print("Failed to capture frame from camera.")
+            return None, None
+
+        best, evaluation = self.frame_quality.pick_best(frames)
+        print(f"Burst of {len(frames)}: frame {best + 1} picked (sharpness {evaluation['sharpness']:.0f}, "
+              f"brightness {evaluation['brightness']:.0f}, problem: {evaluation['problem']})")
+        return self._to_pil(frames[best]), evaluation
+
+    def _to_pil(self, frame):
+        """
+        Remembers a frame as `last_frame` and converts it to an RGB PIL image.
+
+        The capture keeps its full resolution; the resolution policy decides per
+        question how much of it the model gets.
+        """
+        self.last_frame = frame
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
         pil_img = PIL.Image.fromarray(frame_rgb)
-        pil_img = pil_img.resize((200, 200))
         print("Image captured successfully.")
         return pil_img
 
     def stop_camera(self):
         """
-        Stops the camera and releases associated resources.
+        Ends the camera session.
+
+        With `keep_open`, the device and the frame grabber keep running for the next
+        session; otherwise the camera is released.
+
+        Side Effects:
+            Closes the preview window.
+        """
+        if self.preview:
+            self.preview.stop()
+        if self.keep_open and self.image_capture.isOpened():
+            return
+        self.release_camera()
+
+    def release_camera(self):
+        """
+        Stops the preview and the frame grabber and releases the frame source.
 
         Side Effects:
-            Closes any OpenCV windows and releases the video capture object.
+            Releases the video capture object.
         """
-        if self.image_capture and self.image_capture.isOpened():
+        if self.preview:
+            self.preview.stop()
+        if self.frame_grabber is not None:
+            self.frame_grabber.stop()
+            self.frame_grabber = None
+        if self.image_capture.isOpened():
             self.image_capture.release()
-            cv2.destroyAllWindows()
             print("🚫 Camera closed.")
-        self.image_capture = None
\ No newline at end of file
@@ -0,0 +1,137 @@
+import collections
+import threading
+import time
+
+
+class FrameGrabber:
+    """
+    Reads frames continuously from an open `cv2.VideoCapture` into a small ring buffer.
+
+    Reading at the device frame rate keeps the driver's internal queue drained, so the
+    newest buffered frame is always fresh, and a capture never waits for `read()`.
+
+    With `on_demand` (unpaced replays of files or synthetic frames) no thread runs:
+    `frame_after` reads exactly one frame from the source per call, so the Nth frame
+    requested is always the Nth frame of the source and no CPU is used between captures.
+
+    Args:
+        video_capture (cv2.VideoCapture): An opened capture device.
+        ring_size (int): Number of most recent frames kept.
+        on_demand (bool): Pull frames only when a capture asks for one.
+
+    Attributes:
+        frames_read (int): Frames read since start.
+        read_failures (int): Failed `read()` calls since start.
+    """
+
+    def __init__(self, video_capture, ring_size=4, on_demand=False):
+        self.video_capture = video_capture
+        self.on_demand = on_demand
+        self._ring = collections.deque(maxlen=ring_size)
+        self._new_frame = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.frames_read = 0
+        self.read_failures = 0
+
+    @property
+    def is_running(self):
+        """bool: True while the reader thread is alive (or, on demand, between `start` and `stop`)."""
+        if self.on_demand:
+            return self._running
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Starts the reader thread if it is not running yet.
+        """
+        if self.is_running:
+            return
+        self._running = True
+        if self.on_demand:
+            return
+        self._thread = threading.Thread(target=self._run, name="camera-frame-grabber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the reader thread and waits for it; the capture device stays open.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        with self._new_frame:
+            self._ring.clear()
+            self._new_frame.notify_all()
+
+    def _read_into_ring(self):
+        """
+        Reads one frame and appends it to the ring; the caller holds `_new_frame`.
+
+        Returns:
+            tuple or None: (timestamp, frame), or None when the read failed.
+        """
+        ret, frame = self.video_capture.read()
+        timestamp = time.monotonic()
+        if not ret:
+            self.read_failures += 1
+            return None
+        self._ring.append((timestamp, frame))
+        self.frames_read += 1
+        self._new_frame.notify_all()
+        return timestamp, frame
+
+    def _run(self):
+        """
+        Reader loop: each successful read is timestamped and appended to the ring.
+        """
+        while self._running:
+            ret, frame = self.video_capture.read()
+            timestamp = time.monotonic()
+            if not ret:
+                self.read_failures += 1
+                time.sleep(0.01)
+                continue
+            with self._new_frame:
+                self._ring.append((timestamp, frame))
+                self.frames_read += 1
+                self._new_frame.notify_all()
+
+    def latest(self):
+        """
+        Returns the freshest frame without waiting.
+
+        Returns:
+            tuple or None: (timestamp, frame) with a `time.monotonic()` timestamp, or None
+                           when no frame has been read yet.
+        """
+        with self._new_frame:
+            return self._ring[-1] if self._ring else None
+
+    def frame_after(self, after, timeout=1.0):
+        """
+        Returns the first frame read at or after a given moment.
+
+        On demand, `after` is ignored and the source's next frame is read.
+
+        Args:
+            after (float): `time.monotonic()` moment the frame must not predate.
+            timeout (float): Maximum seconds to wait for such a frame.
+
+        Returns:
+            tuple or None: (timestamp, frame), or None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._new_frame:
+            if self.on_demand:
+                # Replay time is virtual: the next frame of the source is the one asked for
+                return self._read_into_ring() if self._running else None
+            while True:
+                for timestamp, frame in self._ring:
+                    if timestamp >= after:
+                        return timestamp, frame
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._new_frame.wait(remaining)
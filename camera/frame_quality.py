@@ -0,0 +1,130 @@
+import cv2
+import numpy as np
+from config import (
+    FRAME_SCORE_WIDTH, FRAME_MIN_SHARPNESS, FRAME_MIN_BRIGHTNESS,
+    FRAME_MAX_BRIGHTNESS, FRAME_MAX_CLIPPED_FRACTION, FRAME_MAX_MOTION
+)
+
+# What to tell the user when no frame of a burst is usable
+PROBLEM_MESSAGES = {
+    "too_dark": "The picture is too dark. Please turn on a light or face a window.",
+    "too_bright": "The picture is too bright. Please turn the camera away from the light.",
+    "too_blurry": "The picture is blurry. Please hold the camera still, a little further from the object.",
+    "moving": "The camera was moving. Please hold it still for a moment."
+}
+
+
+class FrameQuality:
+    """
+    Scores camera frames for sharpness, exposure and motion.
+
+    Every metric is computed on a downscaled grayscale copy with whole-array
+    NumPy/OpenCV operations, so scoring a burst costs a few milliseconds:
+    - sharpness: variance of the Laplacian (low means blurry)
+    - exposure: mean brightness and share of crushed (< 16) or clipped (> 239) pixels from a 256-bin histogram
+    - motion: mean absolute difference with the previous frame of the burst
+
+    Args:
+        score_width (int): Width frames are downscaled to before scoring.
+        min_sharpness (float): Minimum Laplacian variance of a usable frame.
+        min_brightness (float): Minimum mean brightness (0-255).
+        max_brightness (float): Maximum mean brightness (0-255).
+        max_clipped_fraction (float): Maximum share of crushed or clipped pixels.
+        max_motion (float): Maximum mean absolute difference with the previous frame.
+    """
+
+    def __init__(self, score_width=FRAME_SCORE_WIDTH, min_sharpness=FRAME_MIN_SHARPNESS,
+                 min_brightness=FRAME_MIN_BRIGHTNESS, max_brightness=FRAME_MAX_BRIGHTNESS,
+                 max_clipped_fraction=FRAME_MAX_CLIPPED_FRACTION, max_motion=FRAME_MAX_MOTION):
+        self.score_width = score_width
+        self.min_sharpness = min_sharpness
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.max_clipped_fraction = max_clipped_fraction
+        self.max_motion = max_motion
+
+    def _gray(self, frame_bgr):
+        """
+        Returns a downscaled grayscale copy of a BGR frame.
+        """
+        height, width = frame_bgr.shape[:2]
+        if width > self.score_width:
+            frame_bgr = cv2.resize(
+                frame_bgr, (self.score_width, max(1, height * self.score_width // width)),
+                interpolation=cv2.INTER_AREA
+            )
+        return cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+
+    def evaluate(self, frame_bgr, previous_gray=None):
+        """
+        Scores one frame.
+
+        Args:
+            frame_bgr (numpy.ndarray): Camera frame, BGR uint8.
+            previous_gray (numpy.ndarray, optional): `gray` of the previous frame, for motion.
+
+        Returns:
+            dict: {
+                "sharpness", "brightness", "clipped_fraction", "motion": metrics,
+                "problem": None, "too_dark", "too_bright", "too_blurry" or "moving",
+                "score": higher is better, comparable within a burst,
+                "gray": downscaled grayscale frame to pass as `previous_gray`
+            }
+        """
+        gray = self._gray(frame_bgr)
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_32F).var())
+
+        histogram = np.bincount(gray.ravel(), minlength=256)
+        pixels = gray.size
+        brightness = float(np.dot(histogram, np.arange(256)) / pixels)
+        clipped_fraction = float((histogram[:16].sum() + histogram[240:].sum()) / pixels)
+
+        motion = 0.0
+        if previous_gray is not None and previous_gray.shape == gray.shape:
+            motion = float(cv2.absdiff(gray, previous_gray).mean())
+
+        if brightness < self.min_brightness:
+            problem = "too_dark"
+        elif brightness > self.max_brightness:
+            problem = "too_bright"
+        elif sharpness < self.min_sharpness:
+            problem = "too_blurry"
+        elif motion > self.max_motion:
+            problem = "moving"
+        elif clipped_fraction > self.max_clipped_fraction:
+            problem = "too_dark" if brightness < 128 else "too_bright"
+        else:
+            problem = None
+
+        return {
+            "sharpness": sharpness,
+            "brightness": brightness,
+            "clipped_fraction": clipped_fraction,
+            "motion": motion,
+            "problem": problem,
+            "score": sharpness * (1.0 - clipped_fraction) / (1.0 + motion),
+            "gray": gray
+        }
+
+    def pick_best(self, frames_bgr):
+        """
+        Scores a burst and picks the frame to send to inference.
+
+        Args:
+            frames_bgr (list[numpy.ndarray]): Consecutive frames of a burst.
+
+        Returns:
+            tuple: (index of the best frame, its evaluation). The best usable frame wins;
+                   when none is usable, the highest-scoring one is returned with its problem.
+        """
+        evaluations = []
+        previous_gray = None
+        for frame in frames_bgr:
+            evaluation = self.evaluate(frame, previous_gray)
+            previous_gray = evaluation["gray"]
+            evaluations.append(evaluation)
+
+        usable = [index for index, evaluation in enumerate(evaluations) if evaluation["problem"] is None]
+        candidates = usable or range(len(evaluations))
+        best = max(candidates, key=lambda index: evaluations[index]["score"])
+        return best, evaluations[best]
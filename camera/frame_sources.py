@@ -0,0 +1,298 @@
+import os
+import time
+import cv2
+import numpy as np
+
+"""
+Frame sources behind `CameraHandler`.
+
+Every source exposes the `cv2.VideoCapture` subset the frame grabber uses:
+`open()`, `isOpened()`, `read() -> (ok, frame)` and `release()`. Frames are BGR uint8.
+File-based and synthetic sources pace `read()` to their frame rate when `realtime`
+is set, so they behave like a camera. With `realtime=False` they are `on_demand`:
+the frame grabber reads one frame per capture request instead of continuously, so
+capture N always gets frame N of the source, which makes replays deterministic.
+"""
+
+# File extensions picked up by `ImageDirectorySource`
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class FrameSource:
+    """
+    Base class of the frame sources.
+
+    Attributes:
+        name (str): Human-readable description used in log messages.
+        fps (float): Nominal frame rate.
+        realtime (bool): Pace `read()` to `fps`.
+        on_demand (bool): Frames are pulled one per capture instead of read continuously.
+    """
+
+    name = "frame source"
+
+    def __init__(self, fps=30.0, realtime=True):
+        self.fps = fps
+        self.realtime = realtime
+        self._next_frame_at = 0.0
+
+    @property
+    def on_demand(self):
+        """bool: True for unpaced replays, which the grabber reads one frame per capture."""
+        return not self.realtime
+
+    def open(self):
+        """
+        Opens the source.
+
+        Returns:
+            bool: True when frames can be read.
+        """
+        raise NotImplementedError
+
+    def isOpened(self):
+        """bool: True while the source is open (same name as `cv2.VideoCapture`)."""
+        raise NotImplementedError
+
+    def read(self):
+        """
+        Reads the next frame.
+
+        Returns:
+            tuple: (bool, numpy.ndarray or None) like `cv2.VideoCapture.read`.
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """Closes the source."""
+        raise NotImplementedError
+
+    def _pace(self):
+        """
+        Sleeps until the next frame is due when `realtime` is set.
+        """
+        if not self.realtime or self.fps <= 0:
+            return
+        now = time.monotonic()
+        if self._next_frame_at > now:
+            time.sleep(self._next_frame_at - now)
+        self._next_frame_at = max(now, self._next_frame_at) + 1.0 / self.fps
+
+
+class DeviceSource(FrameSource):
+    """
+    Live camera through `cv2.VideoCapture`; the device itself paces the reads.
+
+    Args:
+        index (int): OpenCV device index.
+    """
+
+    # A live device must be read continuously, or its driver queue serves stale frames
+    on_demand = False
+
+    def __init__(self, index=0):
+        super().__init__(fps=0.0, realtime=False)
+        self.index = index
+        self.name = f"camera device {index}"
+        self._capture = None
+
+    def open(self):
+        if self._capture is None or not self._capture.isOpened():
+            self._capture = cv2.VideoCapture(self.index)
+            self.fps = self._capture.get(cv2.CAP_PROP_FPS) or 0.0
+        return self._capture.isOpened()
+
+    def isOpened(self):
+        return self._capture is not None and self._capture.isOpened()
+
+    def read(self):
+        if self._capture is None:
+            return False, None
+        return self._capture.read()
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+        self._capture = None
+
+
+class VideoFileSource(FrameSource):
+    """
+    Replays a recorded video file.
+
+    Args:
+        path (str): Video file readable by OpenCV.
+        loop (bool): Restart from the first frame at the end of the file.
+        realtime (bool): Pace reads to the file's frame rate.
+    """
+
+    def __init__(self, path, loop=True, realtime=True):
+        super().__init__(fps=0.0, realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.name = f"video file {path}"
+        self._capture = None
+
+    def open(self):
+        if self._capture is None or not self._capture.isOpened():
+            self._capture = cv2.VideoCapture(self.path)
+            self.fps = self._capture.get(cv2.CAP_PROP_FPS) or 30.0
+        return self._capture.isOpened()
+
+    def isOpened(self):
+        return self._capture is not None and self._capture.isOpened()
+
+    def read(self):
+        if self._capture is None:
+            return False, None
+        self._pace()
+        ret, frame = self._capture.read()
+        if not ret and self.loop:
+            self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._capture.read()
+        return ret, frame
+
+    def release(self):
+        if self._capture is not None:
+            self._capture.release()
+        self._capture = None
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    Plays the images of a directory in file-name order, as if each were a camera frame.
+
+    Args:
+        directory (str): Directory holding the images.
+        fps (float): Frames per second when `realtime` is set.
+        loop (bool): Start over after the last image.
+        realtime (bool): Pace reads to `fps`.
+    """
+
+    def __init__(self, directory, fps=5.0, loop=True, realtime=True):
+        super().__init__(fps=fps, realtime=realtime)
+        self.directory = directory
+        self.loop = loop
+        self.name = f"image directory {directory}"
+        self._paths = None
+        self._position = 0
+
+    def open(self):
+        if self._paths is None:
+            if not os.path.isdir(self.directory):
+                return False
+            self._paths = sorted(
+                os.path.join(self.directory, filename) for filename in os.listdir(self.directory)
+                if filename.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            self._position = 0
+        return bool(self._paths)
+
+    def isOpened(self):
+        return bool(self._paths)
+
+    def read(self):
+        if not self._paths:
+            return False, None
+        if self._position >= len(self._paths):
+            if not self.loop:
+                return False, None
+            self._position = 0
+        self._pace()
+        frame = cv2.imread(self._paths[self._position])
+        self._position += 1
+        return frame is not None, frame
+
+    def release(self):
+        self._paths = None
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generates deterministic test frames: a fixed gradient with a square moving across it.
+
+    Frame `n` is identical on every run, so replays and benchmarks are reproducible
+    without any camera or media file.
+
+    Args:
+        width (int): Frame width.
+        height (int): Frame height.
+        fps (float): Frames per second when `realtime` is set.
+        realtime (bool): Pace reads to `fps`.
+    """
+
+    def __init__(self, width=640, height=480, fps=30.0, realtime=True):
+        super().__init__(fps=fps, realtime=realtime)
+        self.width = width
+        self.height = height
+        self.name = f"synthetic {width}x{height}"
+        self._background = None
+        self._frame_index = 0
+
+    def open(self):
+        if self._background is None:
+            columns = np.linspace(0, 255, self.width, dtype=np.uint8)
+            rows = np.linspace(0, 255, self.height, dtype=np.uint8)
+            self._background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._background[:, :, 0] = columns[None, :]
+            self._background[:, :, 1] = rows[:, None]
+            self._background[:, :, 2] = 128
+            self._frame_index = 0
+        return True
+
+    def isOpened(self):
+        return self._background is not None
+
+    def read(self):
+        if self._background is None:
+            return False, None
+        self._pace()
+        frame = self._background.copy()
+        side = max(8, min(self.width, self.height) // 6)
+        x = (self._frame_index * 4) % max(1, self.width - side)
+        y = (self.height - side) // 2
+        frame[y:y + side, x:x + side] = 255
+        self._frame_index += 1
+        return True, frame
+
+    def release(self):
+        self._background = None
+
+
+def create_frame_source(spec):
+    """
+    Creates a frame source from a `CAMERA_SOURCE` style specification.
+
+    Specifications:
+        "device:0"                    live camera with OpenCV index 0
+        "video:/path/scene.mp4"       recorded video, looped, paced to its frame rate
+        "images:/path/to/directory"   image files in name order, 5 per second
+        "synthetic" or "synthetic:640x480"
+    Appending "@fast" to a file-based or synthetic spec disables pacing: frames are
+    then pulled one per capture, so replays are deterministic.
+
+    Args:
+        spec (str): Source specification.
+
+    Returns:
+        FrameSource: The (not yet opened) source.
+
+    Raises:
+        ValueError: If the specification is not recognized.
+    """
+    realtime = not spec.endswith("@fast")
+    spec = spec[:-len("@fast")] if not realtime else spec
+    kind, _, argument = spec.partition(":")
+
+    if kind == "device":
+        return DeviceSource(int(argument or 0))
+    if kind == "video" and argument:
+        return VideoFileSource(argument, realtime=realtime)
+    if kind == "images" and argument:
+        return ImageDirectorySource(argument, realtime=realtime)
+    if kind == "synthetic":
+        width, height = (int(value) for value in (argument or "640x480").lower().split("x"))
+        return SyntheticSource(width, height, realtime=realtime)
+    raise ValueError(
+        f"Unknown camera source '{spec}'. Use device:N, video:PATH, images:DIR or synthetic[:WxH]."
+    )
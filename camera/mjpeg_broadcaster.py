@@ -0,0 +1,143 @@
+import threading
+import time
+import cv2
+import numpy as np
+from config import CAMERA_STREAM_FPS, CAMERA_STREAM_JPEG_QUALITY, CAMERA_STREAM_MAX_WIDTH
+
+# Multipart boundary of the MJPEG response
+MJPEG_BOUNDARY = "frame"
+
+# Seconds without a new frame after which a viewer is sent a keep-alive part
+KEEP_ALIVE_SECONDS = 1.0
+
+
+class MjpegBroadcaster:
+    """
+    Encodes the camera feed to JPEG once and fans it out to every MJPEG viewer.
+
+    A single encoder thread reads the latest frame from the `CameraHandler` frame
+    grabber at `fps`, so viewers never touch the device and adding a viewer costs no
+    extra encoding. The thread runs only while at least one viewer is connected.
+
+    Args:
+        camera_handler (CameraHandler): Camera whose frame grabber feeds the stream.
+        fps (float): Maximum stream frame rate.
+        quality (int): JPEG quality (0-100).
+        max_width (int): Frames wider than this are downscaled before encoding.
+
+    Attributes:
+        frames_encoded (int): JPEG frames produced.
+        viewers (int): Currently connected viewers.
+    """
+
+    def __init__(self, camera_handler, fps=CAMERA_STREAM_FPS, quality=CAMERA_STREAM_JPEG_QUALITY,
+                 max_width=CAMERA_STREAM_MAX_WIDTH):
+        self.camera_handler = camera_handler
+        self.fps = fps
+        self.quality = quality
+        self.max_width = max_width
+        self.frames_encoded = 0
+        self.viewers = 0
+        self._jpeg = None
+        self._sequence = 0
+        self._new_jpeg = threading.Condition()
+        self._thread = None
+        self._placeholder = None
+
+    def _placeholder_jpeg(self):
+        """
+        Returns a small dark JPEG shown while the camera is not running.
+        """
+        if self._placeholder is None:
+            self._placeholder = self._encode(np.full((240, 320, 3), 32, dtype=np.uint8))
+        return self._placeholder
+
+    def _encode(self, frame):
+        """
+        Downscales a BGR frame to `max_width` and encodes it as JPEG.
+
+        Returns:
+            bytes or None: The JPEG data, or None if encoding fails.
+        """
+        height, width = frame.shape[:2]
+        if width > self.max_width:
+            frame = cv2.resize(frame, (self.max_width, height * self.max_width // width), interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return buffer.tobytes() if ok else None
+
+    def _run(self):
+        """
+        Encoder loop: one encode per new grabber frame, at most `fps` times per second.
+        """
+        last_timestamp = None
+        interval = 1.0 / self.fps
+        while True:
+            with self._new_jpeg:
+                if self.viewers == 0:
+                    self._thread = None
+                    return
+
+            start = time.monotonic()
+            grabber = self.camera_handler.frame_grabber
+            entry = grabber.latest() if grabber is not None else None
+            if entry is not None and entry[0] != last_timestamp:
+                last_timestamp = entry[0]
+                jpeg = self._encode(entry[1])
+                if jpeg is not None:
+                    with self._new_jpeg:
+                        self._jpeg = jpeg
+                        self._sequence += 1
+                        self.frames_encoded += 1
+                        self._new_jpeg.notify_all()
+            time.sleep(max(0.0, interval - (time.monotonic() - start)))
+
+    def frames(self):
+        """
+        Yields the multipart MJPEG body for one viewer.
+
+        Every viewer receives the same encoded bytes; a slow viewer simply skips to the
+        newest frame instead of queuing old ones. Without a new frame for
+        `KEEP_ALIVE_SECONDS` (e.g. before the camera starts) the last frame, or a dark
+        placeholder, is sent again: the server only notices a disconnected viewer when
+        a write fails.
+
+        Yields:
+            bytes: One multipart part (boundary, headers and JPEG data) per frame.
+        """
+        with self._new_jpeg:
+            self.viewers += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mjpeg-encoder", daemon=True)
+                self._thread.start()
+            seen = 0
+
+        try:
+            while True:
+                with self._new_jpeg:
+                    if self._sequence == seen:
+                        self._new_jpeg.wait(timeout=KEEP_ALIVE_SECONDS)
+                    seen, jpeg = self._sequence, self._jpeg
+                if jpeg is None:
+                    jpeg = self._placeholder_jpeg()
+                yield (
+                    f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n"
+                ).encode() + jpeg + b"\r\n"
+        finally:
+            # Runs when the client disconnects and the server closes the generator
+            with self._new_jpeg:
+                self.viewers -= 1
+
+    def stats(self):
+        """
+        Returns the stream counters.
+
+        Returns:
+            dict: {"viewers", "frames_encoded", "fps", "quality"}
+        """
+        with self._new_jpeg:
+            return {
+                "viewers": self.viewers,
+                "frames_encoded": self.frames_encoded,
+                "fps": self.fps,
+                "quality": self.quality
+            }
@@ -0,0 +1,89 @@
+import cv2
+import numpy as np
+
+"""
+Camera frame to model pixel tensor, without the PIL round-trip.
+
+`CameraHandler.take_capture` hands out a resized PIL image, and the Hugging Face
+image processor converts it back into an array and resizes and normalizes it again.
+`FramePreprocessor` goes from the OpenCV BGR frame straight to the normalized
+channels-first pixel array in one resize plus one fused pass per channel, writing
+into buffers that are allocated once and reused for every frame.
+"""
+
+
+class FramePreprocessor:
+    """
+    Converts BGR uint8 frames into normalized (1, 3, H, W) pixel arrays.
+
+    The output buffer is reused: each call overwrites the array returned by the
+    previous call, so callers must consume (or copy) it before preprocessing the
+    next frame.
+
+    Args:
+        height (int): Model input height.
+        width (int): Model input width.
+        image_mean (sequence[float]): Per-channel RGB mean after rescaling.
+        image_std (sequence[float]): Per-channel RGB standard deviation after rescaling.
+        rescale_factor (float): Factor applied to the uint8 pixel values (usually 1/255).
+        dtype (numpy.dtype): Output element type.
+    """
+
+    def __init__(self, height, width, image_mean=(0.5, 0.5, 0.5), image_std=(0.5, 0.5, 0.5),
+                 rescale_factor=1 / 255, dtype=np.float32):
+        self.height = height
+        self.width = width
+        # (x * rescale - mean) / std == x * scale + offset, folded once per channel
+        self.scale = np.asarray(
+            [rescale_factor / std for std in image_std], dtype=dtype
+        )
+        self.offset = np.asarray(
+            [-mean / std for mean, std in zip(image_mean, image_std)], dtype=dtype
+        )
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        self._pixels = np.empty((1, 3, height, width), dtype=dtype)
+
+    @classmethod
+    def from_image_processor(cls, image_processor, dtype=np.float32):
+        """
+        Builds a preprocessor matching a Hugging Face image processor's settings.
+
+        Args:
+            image_processor (BaseImageProcessor): E.g. `processor.image_processor`.
+            dtype (numpy.dtype): Output element type.
+
+        Returns:
+            FramePreprocessor: Preprocessor with the same size, rescale and normalization.
+        """
+        size = getattr(image_processor, "size", None) or {}
+        height = size.get("height") or size.get("shortest_edge") or 224
+        width = size.get("width") or size.get("shortest_edge") or 224
+
+        image_mean, image_std = (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)
+        if getattr(image_processor, "do_normalize", True):
+            image_mean = getattr(image_processor, "image_mean", None) or image_mean
+            image_std = getattr(image_processor, "image_std", None) or image_std
+
+        rescale_factor = 1.0
+        if getattr(image_processor, "do_rescale", True):
+            rescale_factor = getattr(image_processor, "rescale_factor", 1 / 255)
+
+        return cls(height, width, image_mean, image_std, rescale_factor, dtype)
+
+    def __call__(self, frame_bgr):
+        """
+        Resizes, converts BGR to RGB, rescales, normalizes and transposes a frame.
+
+        Args:
+            frame_bgr (numpy.ndarray): OpenCV frame, shape (h, w, 3), dtype uint8.
+
+        Returns:
+            numpy.ndarray: The shared output buffer, shape (1, 3, height, width).
+        """
+        cv2.resize(frame_bgr, (self.width, self.height), dst=self._resized, interpolation=cv2.INTER_AREA)
+        for channel in range(3):
+            # RGB channel c is BGR channel 2 - c; strided view, no copy
+            out = self._pixels[0, channel]
+            np.multiply(self._resized[:, :, 2 - channel], self.scale[channel], out=out, casting="unsafe")
+            out += self.offset[channel]
+        return self._pixels
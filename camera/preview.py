@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+import cv2
+
+
+def display_available():
+    """
+    Tells whether an OpenCV window can be opened.
+
+    Returns:
+        bool: False on Linux without an X11 or Wayland display (headless servers).
+    """
+    if sys.platform.startswith("linux"):
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+class FramePreview:
+    """
+    Optional local preview window fed from the frame grabber's ring buffer.
+
+    Runs in its own thread at a modest rate, so `imshow`/`waitKey` never sit on the
+    capture path, and does nothing on machines without a display.
+
+    Args:
+        window_name (str): Title of the OpenCV window.
+        fps (float): Refresh rate of the window.
+    """
+
+    def __init__(self, window_name="Camera", fps=15.0):
+        self.window_name = window_name
+        self.fps = fps
+        self._grabber = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, frame_grabber):
+        """
+        Starts showing the grabber's latest frames.
+
+        Args:
+            frame_grabber (FrameGrabber): Running grabber to read frames from.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if not display_available():
+            print("No display available, camera preview disabled.")
+            return
+        self._grabber = frame_grabber
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="camera-preview", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the preview thread; the window is closed by the thread itself.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _run(self):
+        """
+        Preview loop. HighGUI calls stay in this thread, window creation included.
+        """
+        last_timestamp = None
+        try:
+            while not self._stop.wait(1.0 / self.fps):
+                entry = self._grabber.latest()
+                if entry is None or entry[0] == last_timestamp:
+                    continue
+                last_timestamp = entry[0]
+                cv2.imshow(self.window_name, entry[1])
+                cv2.waitKey(1)
+        except cv2.error as e:
+            print(f"Camera preview stopped: {e}")
+        finally:
+            try:
+                cv2.destroyWindow(self.window_name)
+            except cv2.error:
+                pass
@@ -0,0 +1,90 @@
+import threading
+import numpy as np
+import PIL.Image
+from utils.image_utils import image_fingerprint, hash_distance
+from config import SCENE_CHANGE_MAX_HASH_DISTANCE, SCENE_CHANGE_MAX_PIXEL_DIFFERENCE
+
+
+class SceneChangeDetector:
+    """
+    Cheaply decides whether a new capture shows the same scene as the current image.
+
+    Two signals must both say "unchanged":
+    - perceptual dHash distance (structure, robust to small shifts and noise)
+    - mean absolute difference of 32x32 grayscale thumbnails (catches lighting and
+      large content changes the 64-bit hash can miss)
+
+    Signatures of the reference image are kept by identity, so comparing several
+    captures against the same current image computes its signature once.
+
+    Args:
+        max_hash_distance (int): Largest dHash bit difference still treated as unchanged.
+        max_pixel_difference (float): Largest mean thumbnail difference (0-255) still treated as unchanged.
+
+    Attributes:
+        comparisons (int): Captures compared against a current image.
+        reused_images (int): Captures found unchanged, so the current image was kept. Each
+                             skipped the disk write and, with the conversation cache, the image
+                             encoding; questions about it still run the model (skipped inferences
+                             are the answer cache's hits).
+    """
+
+    def __init__(self, max_hash_distance=SCENE_CHANGE_MAX_HASH_DISTANCE,
+                 max_pixel_difference=SCENE_CHANGE_MAX_PIXEL_DIFFERENCE):
+        self.max_hash_distance = max_hash_distance
+        self.max_pixel_difference = max_pixel_difference
+        self.comparisons = 0
+        self.reused_images = 0
+        self._reference = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(pil_img):
+        """
+        Returns (dHash, 32x32 grayscale thumbnail as int16) of an image.
+        """
+        thumbnail = np.asarray(pil_img.convert("L").resize((32, 32), PIL.Image.BILINEAR), dtype=np.int16)
+        return image_fingerprint(pil_img), thumbnail
+
+    def is_same_scene(self, new_img, current_img):
+        """
+        Compares a new capture with the current image.
+
+        Args:
+            new_img (PIL.Image.Image): The new capture.
+            current_img (PIL.Image.Image): The image the conversation is about.
+
+        Returns:
+            bool: True when the scene is effectively unchanged.
+        """
+        with self._lock:
+            if self._reference is None or self._reference[0] is not current_img:
+                self._reference = (current_img, self._signature(current_img))
+            current_hash, current_thumbnail = self._reference[1]
+
+        new_hash, new_thumbnail = self._signature(new_img)
+        distance = hash_distance(new_hash, current_hash)
+        difference = float(np.abs(new_thumbnail - current_thumbnail).mean())
+        same = distance <= self.max_hash_distance and difference <= self.max_pixel_difference
+
+        with self._lock:
+            self.comparisons += 1
+            if same:
+                self.reused_images += 1
+        print(f"Scene change check: hash distance {distance}, pixel difference {difference:.1f} -> "
+              f"{'unchanged' if same else 'changed'}")
+        return same
+
+    def stats(self):
+        """
+        Returns the scene change counters.
+
+        Returns:
+            dict: {"comparisons", "reused_images", "reused_rate"}
+        """
+        with self._lock:
+            return {
+                "comparisons": self.comparisons,
+                "reused_images": self.reused_images,
+                "reused_rate": round(self.reused_images / self.comparisons, 3) if self.comparisons else 0.0
+            }
@@ -11,7 +11,13 @@ Contents:
     - BASE_DIR: Absolute path to the project root
     - MODELS_DIR: Directory for storing downloaded Vosk models
     - IMAGE_SAVE_DIRECTORY: Directory for saving captured images
-    - IMAGE_FILENAME: Default filename for the last captured image
+    - IMAGE_FILENAME: Default filename for `save_pil_image_to_disk`
+    - IMAGE_STORE_MAX_BYTES: Disk budget of the content-addressed image store
+    - IMAGE_STORE_MAX_AGE_SECONDS: Stored images unused for longer than this are deleted
+    - IMAGE_STORE_JPEG_QUALITY: JPEG quality of stored captures
+    - IMAGE_VARIANT_DIRECTORY: Disk cache of resized image variants
+    - IMAGE_VARIANT_SIZES: Longest side of each served variant ("thumbnail", "preview")
+    - IMAGE_CACHE_MAX_AGE_SECONDS: Browser cache lifetime of content-addressed images
     - DB_FILE: SQLite database filename for Peewee ORM
 
 🎙️ Audio Settings:
@@ -20,7 +26,82 @@ Contents:
     - AUDIO_CHANNELS: Number of audio channels (mono)
     - AUDIO_DTYPE: Data type for audio samples
     - AUDIO_RECORD_DURATION: Duration of initial recording (seconds)
-    - AUDIO_FOLLOW_UP_DURATION: Duration of follow-up recording (seconds)
+    - AUDIO_FOLLOW_UP_DURATION: Duration of follow-up recording (seconds); the maximum length with AUDIO_VAD
+    - AUDIO_RING_SECONDS: Audio kept by the always-open microphone stream's ring buffer
+    - AUDIO_KEEP_OPEN: Keep the microphone stream open between recordings
+    - AUDIO_PRE_ROLL_SECONDS: Audio from just before a recording starts that it still includes (never from
+      before the end of the spoken prompt, see `Record.mark`)
+    - AUDIO_RECOGNIZER_POOL_SIZE: Idle Vosk recognizers kept for reuse per (model, sample rate, grammar)
+    - AUDIO_VAD: End recordings when the user stops talking instead of after a fixed duration
+    - AUDIO_VAD_FRAME_MS: Length of the frames the voice activity detector classifies (milliseconds)
+    - AUDIO_VAD_START_TIMEOUT_SECONDS: Give up when no speech starts within this time
+    - AUDIO_VAD_TRAILING_SILENCE_SECONDS: Silence after speech that ends the recording
+    - AUDIO_VAD_MAX_QUESTION_SECONDS: Maximum length of a question with AUDIO_VAD
+    - AUDIO_VAD_MIN_SPEECH_SECONDS: Speech needed before a recording counts as started
+    - AUDIO_VAD_PRE_ROLL_SECONDS: Audio kept from before the detected speech start
+    - AUDIO_VAD_ENERGY_MARGIN_DB: How far above the noise floor a frame must be to count as speech
+    - AUDIO_VAD_MIN_RMS: Absolute minimum RMS level of speech (int16 scale)
+    - AUDIO_VAD_MAX_ZERO_CROSSING_RATE: Loud frames crossing zero more often than this are noise, not voice
+
+📸 Camera Settings:
+    - CAMERA_SOURCE: Frame source, "device:N", "video:PATH", "images:DIR" or "synthetic[:WxH]"
+      (append "@fast" to replay files without pacing, one frame per capture; override with `CAMERA_SOURCE` env var)
+    - CAMERA_PREVIEW: Show a local preview window (skipped automatically without a display)
+    - CAMERA_PREVIEW_FPS: Refresh rate of the preview window
+    - CAMERA_STREAM_FPS: Frame rate of the /camera/stream MJPEG preview
+    - CAMERA_STREAM_JPEG_QUALITY: JPEG quality of the stream (0-100)
+    - CAMERA_STREAM_MAX_WIDTH: Stream frames wider than this are downscaled before encoding
+    - CAMERA_RING_SIZE: Number of recent frames kept by the background frame grabber
+    - CAMERA_KEEP_OPEN: Keep the device open and grabbing between sessions
+    - CAMERA_CAPTURE_TIMEOUT_SECONDS: Maximum wait for a frame newer than the requested moment
+    - CAMERA_BURST_SIZE: Frames grabbed per photo; the sharpest well-exposed one is used (1 disables bursts)
+    - CAMERA_BURST_MAX_ATTEMPTS: Bursts tried per photo; when none is usable, no inference runs on it
+    - CAMERA_PHOTO_MAX_ROUNDS: Photos (countdown included) tried in a row before the session ends without one
+    - FRAME_SCORE_WIDTH: Width frames are downscaled to for quality scoring
+    - FRAME_MIN_SHARPNESS: Minimum Laplacian variance of a usable frame
+    - FRAME_MIN_BRIGHTNESS / FRAME_MAX_BRIGHTNESS: Accepted mean brightness range (0-255)
+    - FRAME_MAX_CLIPPED_FRACTION: Maximum share of crushed or clipped pixels
+    - FRAME_MAX_MOTION: Maximum mean difference with the previous burst frame
+    - SCENE_CHANGE_DETECTION: Reuse the current image when a "new picture" shows the same scene
+    - SCENE_CHANGE_MAX_HASH_DISTANCE: Largest perceptual-hash bit difference treated as the same scene
+    - SCENE_CHANGE_MAX_PIXEL_DIFFERENCE: Largest mean 32x32 grayscale difference treated as the same scene
+
+🧠 Gemma Settings:
+    - GEMMA_MODEL_PATH: Local directory of the Gemma 3n model (override with `GEMMA_MODEL_PATH` env var)
+    - INFERENCE_BACKEND: Inference backend, one of "transformers", "onnx" or "stub"
+    - ONNX_MODEL_DIR: Directory of the ONNX export used by the "onnx" backend
+    - STUB_TOKENS_PER_SECOND: Token rate of the deterministic "stub" backend
+    - GEMMA_MAX_NEW_TOKENS: Maximum number of tokens generated per answer
+    - GEMMA_PRECISION: Inference precision, one of "fp32", "bf16" or "int8" (dynamic int8 linear layers)
+    - GEMMA_SPECULATIVE_DECODING: Let a small draft model propose tokens that Gemma verifies
+    - GEMMA_NUM_ASSISTANT_TOKENS: Tokens proposed by the draft model per verification step
+    - GEMMA_CONVERSATION_CACHE: Reuse the image prefix state for "same picture" follow-up questions
+    - ANSWER_CACHE_ENABLED: Answer repeated (image, question) pairs from the answer cache
+    - ANSWER_CACHE_MAX_BYTES: Memory budget of the answer cache
+    - ANSWER_CACHE_TTL_SECONDS: How long a cached answer stays valid
+    - ANSWER_CACHE_MAX_HASH_DISTANCE: Perceptual-hash bit difference still treated as the same scene
+    - ANSWER_CACHE_PERSIST: Also store cached answers in the SQLite database
+    - RESOLUTION_POLICY: Send one whole image or tiles depending on the question
+    - RESOLUTION_INPUT_SIDE: Side of Gemma 3n's vision input; the processor resizes every image to it,
+      so images and tiles are downscaled to it and never below
+    - RESOLUTION_TILE_GRID: Tiles per side for text-reading questions (2 means 2x2)
+    - RESOLUTION_LATENCY_BUDGET_SECONDS: Time until the answer starts (the full answer for tiles) this
+      device should stay under (override with `RESOLUTION_LATENCY_BUDGET_SECONDS` env var)
+    - RESOLUTION_REPROBE_EVERY: A plan stepped down for exceeding the budget is measured again after
+      being passed over this many times
+    - DETECTOR_CASCADE: Try the fast local object/face detector before Gemma
+    - DETECTOR_MODEL_DIR: Directory of the MobileNet-SSD Caffe files
+    - DETECTOR_MIN_CONFIDENCE: Detections below this score are ignored
+    - DETECTOR_ANSWER_CONFIDENCE: Detections must reach this score to answer without Gemma
+    - DETECTOR_FACE_CONFIDENCE: Score assigned to Haar cascade faces; below DETECTOR_ANSWER_CONFIDENCE, so
+      faces are only context for Gemma
+    - INFERENCE_BATCHING: Route questions through the dynamic batching scheduler
+    - INFERENCE_BATCH_MAX_SIZE: Maximum number of requests merged into one generate call
+    - INFERENCE_BATCH_MAX_WAIT_MS: How long the scheduler waits to fill a batch (milliseconds)
+    - INFERENCE_OUT_OF_PROCESS: Run Gemma in dedicated worker processes instead of the Flask process
+    - INFERENCE_WORKER_COUNT: Number of inference worker processes
+    - INFERENCE_WORKER_TIMEOUT_SECONDS: Maximum wait for a worker answer
+    - INFERENCE_WORKER_HEALTH_INTERVAL_SECONDS: How often crashed workers are detected and restarted
 
 🌐 Language Settings:
     LANG_SETTINGS: Dictionary of supported languages with:
@@ -29,6 +110,10 @@ Contents:
         - vosk_model_zip_name: Filename of the ZIP model
         - vosk_model_url: URL to download the model
         - tts_voice_name: TTS engine identifier (Coqui or pyttsx3)
+        - gemma_draft_model_path: Draft model for speculative decoding (None disables it)
+    MENU_PHRASES: Per language, the phrases of each spoken menu ("follow_up": yes/no,
+        "choice": new/same/previous), recognized with a restricted Vosk grammar
+    MENU_MIN_CONFIDENCE: Menu answers below this word confidence are asked again
 
 Notes:
 ------
@@ -56,11 +141,108 @@ AUDIO_DTYPE = 'int16'
 AUDIO_RECORD_DURATION = 7
 AUDIO_FOLLOW_UP_DURATION = 4
 
+# Persistent microphone stream
+AUDIO_RING_SECONDS = 30
+AUDIO_KEEP_OPEN = True
+AUDIO_PRE_ROLL_SECONDS = 0.3
+AUDIO_RECOGNIZER_POOL_SIZE = 2
+
+# Voice activity endpointing
+AUDIO_VAD = True
+AUDIO_VAD_FRAME_MS = 30
+AUDIO_VAD_START_TIMEOUT_SECONDS = 5.0
+AUDIO_VAD_TRAILING_SILENCE_SECONDS = 0.8
+AUDIO_VAD_MAX_QUESTION_SECONDS = 15
+AUDIO_VAD_MIN_SPEECH_SECONDS = 0.15
+AUDIO_VAD_PRE_ROLL_SECONDS = 0.3
+AUDIO_VAD_ENERGY_MARGIN_DB = 10.0
+AUDIO_VAD_MIN_RMS = 300.0
+AUDIO_VAD_MAX_ZERO_CROSSING_RATE = 0.4
+
 # VOSK_MODEL_PATH = "models/vosk-model-small-en-us-0.15"
 
+# Inference backend
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "transformers")
+ONNX_MODEL_DIR = os.environ.get("ONNX_MODEL_DIR", os.path.join(MODELS_DIR, "onnx", "gemma-3n-e2b"))
+STUB_TOKENS_PER_SECOND = 20
+
+# Gemma 3n
+GEMMA_MODEL_PATH = os.environ.get(
+    "GEMMA_MODEL_PATH",
+    os.path.join(MODELS_DIR, "google", "gemma-3n-transformers-gemma-3n-e2b-v2")
+)
+GEMMA_MAX_NEW_TOKENS = 10
+GEMMA_PRECISION = os.environ.get("GEMMA_PRECISION", "fp32")
+GEMMA_SPECULATIVE_DECODING = False
+GEMMA_NUM_ASSISTANT_TOKENS = 5
+GEMMA_CONVERSATION_CACHE = True
+
+# Answer memoization
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_MAX_BYTES = 1024 * 1024
+ANSWER_CACHE_TTL_SECONDS = 60 * 60
+ANSWER_CACHE_MAX_HASH_DISTANCE = 4
+ANSWER_CACHE_PERSIST = False
+
+# Question-aware tiling
+RESOLUTION_POLICY = True
+RESOLUTION_INPUT_SIDE = 768
+RESOLUTION_TILE_GRID = 2
+RESOLUTION_LATENCY_BUDGET_SECONDS = float(os.environ.get("RESOLUTION_LATENCY_BUDGET_SECONDS", "10"))
+RESOLUTION_REPROBE_EVERY = 10
+
+# Local detector cascade in front of Gemma
+DETECTOR_CASCADE = True
+DETECTOR_MODEL_DIR = os.path.join(MODELS_DIR, "mobilenet_ssd")
+DETECTOR_MIN_CONFIDENCE = 0.5
+DETECTOR_ANSWER_CONFIDENCE = 0.8
+DETECTOR_FACE_CONFIDENCE = 0.6
+
+# Dynamic batching of concurrent inference requests
+INFERENCE_BATCHING = False
+INFERENCE_BATCH_MAX_SIZE = 4
+INFERENCE_BATCH_MAX_WAIT_MS = 20
+
+# Out-of-process inference workers
+INFERENCE_OUT_OF_PROCESS = False
+INFERENCE_WORKER_COUNT = 1
+INFERENCE_WORKER_TIMEOUT_SECONDS = 120
+INFERENCE_WORKER_HEALTH_INTERVAL_SECONDS = 5
+
+# Small multilingual draft model shared by the languages below for speculative decoding
+GEMMA_DRAFT_MODEL_PATH = os.path.join(MODELS_DIR, "google", "gemma-3-270m-it")
+
+# Camera
+CAMERA_SOURCE = os.environ.get("CAMERA_SOURCE", "device:0")
+CAMERA_PREVIEW = True
+CAMERA_PREVIEW_FPS = 15
+CAMERA_STREAM_FPS = 10
+CAMERA_STREAM_JPEG_QUALITY = 70
+CAMERA_STREAM_MAX_WIDTH = 640
+CAMERA_RING_SIZE = 4
+CAMERA_KEEP_OPEN = True
+CAMERA_CAPTURE_TIMEOUT_SECONDS = 1.0
+CAMERA_BURST_SIZE = 5
+CAMERA_BURST_MAX_ATTEMPTS = 2
+CAMERA_PHOTO_MAX_ROUNDS = 3
+FRAME_SCORE_WIDTH = 320
+FRAME_MIN_SHARPNESS = 60.0
+FRAME_MIN_BRIGHTNESS = 40
+FRAME_MAX_BRIGHTNESS = 215
+FRAME_MAX_CLIPPED_FRACTION = 0.5
+FRAME_MAX_MOTION = 12.0
+SCENE_CHANGE_DETECTION = True
+SCENE_CHANGE_MAX_HASH_DISTANCE = 6
+SCENE_CHANGE_MAX_PIXEL_DIFFERENCE = 12.0
+
 # Image Storage
-IMAGE_SAVE_DIRECTORY = "/captured_images"
 IMAGE_FILENAME = "last_capture.jpg"
+IMAGE_STORE_MAX_BYTES = 200 * 1024 * 1024
+IMAGE_STORE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+IMAGE_STORE_JPEG_QUALITY = 90
+IMAGE_VARIANT_DIRECTORY = os.path.join(BASE_DIR, "image_variants")
+IMAGE_VARIANT_SIZES = {"thumbnail": 160, "preview": 640}
+IMAGE_CACHE_MAX_AGE_SECONDS = 365 * 24 * 60 * 60
 
 LANG_SETTINGS = {
     "ar-XA": {
@@ -68,34 +250,98 @@ LANG_SETTINGS = {
         "vosk_model_path": "model/svosk-model-ar-0.22",
         "vosk_model_zip_name": "models/vosk-model-ar-0.22.zip", 
         "vosk_model_url": "https://alphacephei.com/vosk/models/vosk-model-ar-mgb2-0.4.zip",
-        "tts_voice_name": "tts_models/ar/mai/tacotron2-DDC"
+        "tts_voice_name": "tts_models/ar/mai/tacotron2-DDC",
+        "gemma_draft_model_path": GEMMA_DRAFT_MODEL_PATH
     },
     "en-US": {
         "display_name": "English (US)",
         "vosk_model_path": "models/vosk-model-small-en-us-0.15",
         "vosk_model_zip_name": "models/vosk-model-small-en-us-0.15.zip",
         "vosk_model_url": "https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip",
-        "tts_voice_name": "pyttsx3"
+        "tts_voice_name": "pyttsx3",
+        "gemma_draft_model_path": GEMMA_DRAFT_MODEL_PATH
     },
     "es-ES": {
         "display_name": "Spanish (Spain)",
         "vosk_model_path": "models/vosk-model-small-es-0.42",
         "vosk_model_zip_name": "models/vosk-model-small-es-0.42.zip",
         "vosk_model_url": "https://alphacephei.com/vosk/models/vosk-model-small-es-0.42.zip",
-        "tts_voice_name": "tts_models/es/css10/vits"
+        "tts_voice_name": "tts_models/es/css10/vits",
+        "gemma_draft_model_path": GEMMA_DRAFT_MODEL_PATH
     },
     "fr-FR": {
         "display_name": "French (France)",
         "vosk_model_path": "models/vosk-model-small-fr-0.22",
         "vosk_model_zip_name": "models/vosk-model-small-fr-0.22.zip",
         "vosk_model_url": "https://alphacephei.com/vosk/models/vosk-model-small-fr-0.22.zip",
-        "tts_voice_name": "tts_models/fr/css10/vits"
+        "tts_voice_name": "tts_models/fr/css10/vits",
+        "gemma_draft_model_path": GEMMA_DRAFT_MODEL_PATH
     },
     "de-DE": {
         "display_name": "German (Germany)",
         "vosk_model_path": "models/vosk-model-small-de-0.15",
         "vosk_model_zip_name": "models/vosk-model-small-de-0.15.zip",
         "vosk_model_url": "https://alphacephei.com/vosk/models/vosk-model-small-de-0.15.zip",
-        "tts_voice_name": "tts_models/de/thorsten/vits"
+        "tts_voice_name": "tts_models/de/thorsten/vits",
+        "gemma_draft_model_path": GEMMA_DRAFT_MODEL_PATH
+    }
+}
+
+MENU_PHRASES = {
+    "ar-XA": {
+        "follow_up": {
+            "yes": ["نعم", "أجل", "ايوه"],
+            "no": ["لا", "كفى", "لا شكرا"]
+        },
+        "choice": {
+            "new": ["جديدة", "صورة جديدة", "صورة أخرى"],
+            "same": ["نفس", "نفس الصورة"],
+            "previous": ["السابقة", "التفاعل السابق"]
+        }
+    },
+    "en-US": {
+        "follow_up": {
+            "yes": ["yes", "yeah", "yep", "sure", "okay", "yes please"],
+            "no": ["no", "nope", "no thanks", "no thank you", "enough", "that's enough", "stop"]
+        },
+        "choice": {
+            "new": ["new", "new picture", "new one", "another", "another picture", "fresh"],
+            "same": ["same", "same picture", "same one", "similar"],
+            "previous": ["previous", "previous interaction", "old", "old one", "last", "last one", "last time"]
+        }
+    },
+    "es-ES": {
+        "follow_up": {
+            "yes": ["sí", "si", "claro", "vale"],
+            "no": ["no", "no gracias", "basta"]
+        },
+        "choice": {
+            "new": ["nueva", "nueva foto", "nuevo", "otra", "otra foto"],
+            "same": ["misma", "la misma", "misma foto", "igual"],
+            "previous": ["anterior", "la anterior", "interacción anterior", "última"]
+        }
+    },
+    "fr-FR": {
+        "follow_up": {
+            "yes": ["oui", "ouais", "d'accord"],
+            "no": ["non", "non merci", "assez"]
+        },
+        "choice": {
+            "new": ["nouvelle", "nouvelle photo", "une autre", "autre"],
+            "same": ["même", "la même", "même photo"],
+            "previous": ["précédente", "précédent", "interaction précédente", "dernière"]
+        }
+    },
+    "de-DE": {
+        "follow_up": {
+            "yes": ["ja", "genau", "jawohl"],
+            "no": ["nein", "nein danke", "genug"]
+        },
+        "choice": {
+            "new": ["neu", "neues", "neues bild", "anderes", "anderes bild"],
+            "same": ["gleiche", "gleiches bild", "dasselbe", "selbe"],
+            "previous": ["vorherige", "vorheriges", "letzte", "letztes"]
+        }
     }
-}
\ No newline at end of file
+}
+MENU_MIN_CONFIDENCE = 0.6
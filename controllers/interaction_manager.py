@@ -1,9 +1,14 @@
 import os
+import time
+import uuid
 import PIL.Image
 
+from audio_processing.menu_recognizer import MenuRecognizer
+from utils.sentence_chunker import iter_sentences
+from camera.frame_quality import PROBLEM_MESSAGES
 from config import (
-    IMAGE_SAVE_DIRECTORY, IMAGE_FILENAME,
-    AUDIO_RECORD_DURATION, AUDIO_FOLLOW_UP_DURATION
+    AUDIO_RECORD_DURATION, AUDIO_FOLLOW_UP_DURATION, AUDIO_VAD, AUDIO_VAD_MAX_QUESTION_SECONDS,
+    CAMERA_BURST_SIZE, CAMERA_BURST_MAX_ATTEMPTS, CAMERA_PHOTO_MAX_ROUNDS
 )
 
 
@@ -23,14 +28,23 @@ class InteractionManager:
         - factory_speak: Object to handle TTS output
         - record: Object to record audio
         - stt: Object to convert speech to text
-        - save_image_func: Function to save PIL image to disk
+        - save_image_func: Function storing a PIL image and returning its stable path
+        - image_saved: Optional function confirming that a stored image reached the disk
         - interaction: Object to save/load interaction history
         - get_name: Object to load user name
         - init_ai: Function to query AI model with image and question
+        - stream_ai: Optional function that streams the AI answer chunk by chunk
+        - conversation_cache: Optional ConversationCache reusing the image prefix for follow-ups
+        - answer_cache: Optional AnswerCache answering repeated questions without the model
+        - scene_detector: Optional SceneChangeDetector reusing the current image for an unchanged "new picture"
+        - resolution_policy: Optional ResolutionPolicy choosing one image or tiles per question
+        - cascade: Optional DetectorCascade answering simple questions with a local detector before Gemma
     """
 
     def __init__(self, camera_handler, factory_speak, record, stt,
-                 save_image_func, interaction, get_name, init_ai):
+                 save_image_func, interaction, get_name, init_ai, stream_ai=None,
+                 conversation_cache=None, answer_cache=None, scene_detector=None, resolution_policy=None,
+                 cascade=None, menu_recognizer=None, image_saved=None):
         """
         Initializes the interaction manager with all required components.
 
@@ -38,41 +52,305 @@ class InteractionManager:
             camera_handler: CameraHandler instance
             factory_speak: TTS handler
             record: Audio recorder
-            stt: Speech-to-text processor
-            save_image_func: Function to save image to disk
+            stt: Speech-to-text processor; recognizes while `record` is recording
+            save_image_func: Function storing an image (e.g. `ImageStore.save`) and returning its path
             interaction: ORM handler for saving/loading interactions
             get_name: Object to retrieve user name
             init_ai: Function to query AI model with image and question
+            stream_ai: Optional function returning an iterator of answer chunks.
+                       When given, answers are spoken sentence by sentence while decoding.
+            conversation_cache: Optional ConversationCache. When given, questions go through it
+                                so "same picture" follow-ups skip re-encoding the image.
+            answer_cache: Optional AnswerCache consulted before the model is called.
+            scene_detector: Optional SceneChangeDetector. When given, a "new picture" of the
+                            same scene keeps the current image, its saved path and cached state.
+            resolution_policy: Optional ResolutionPolicy. When given, the full-resolution capture
+                               is downscaled or tiled for each question before inference.
+            cascade: Optional DetectorCascade. When given, a fast detector answers the questions it
+                     can settle; the others go to Gemma with the detections as context.
+            menu_recognizer: Optional MenuRecognizer for the yes/no and new/same/previous answers.
+                             Defaults to one built on `stt`.
+            image_saved: Optional function (e.g. `ImageStore.wait_until_written`) taking a path from
+                         `save_image_func` and returning whether the file was written. When given,
+                         a failed background write is reported and never kept in the history.
         """
         self.camera_handler = camera_handler
         self.factory_speak = factory_speak
         self.record = record
         self.stt = stt
-        self.save_pil_image_to_disk = save_image_func
+        self.save_image = save_image_func
+        self.image_saved = image_saved
         self.interaction = interaction
         self.get_name = get_name
         self.init_ai = init_ai
+        self.stream_ai = stream_ai
+        self.conversation_cache = conversation_cache
+        self.answer_cache = answer_cache
+        self.scene_detector = scene_detector
+        self.resolution_policy = resolution_policy
+        self.cascade = cascade
+        self.menu_recognizer = menu_recognizer or MenuRecognizer(stt)
+        self.last_model_seconds = None
+        # With endpointing the question ends when the user stops talking, so the limit can be generous
+        self.question_seconds = AUDIO_VAD_MAX_QUESTION_SECONDS if AUDIO_VAD else AUDIO_RECORD_DURATION
+        self.session_id = None
         self.current_image = None
         self.current_saved_image_path = None
+        self.previous_image = None
+        self.previous_saved_image_path = None
 
-    def _get_gemma_3n_response(self, user_question, image):
+    def _forget_current_image(self):
+        """
+        Clears the current image and drops its cached model state.
+        """
+        self.current_image = None
+        self.current_saved_image_path = None
+        self.previous_image = None
+        self.previous_saved_image_path = None
+        if self.conversation_cache is not None:
+            self.conversation_cache.evict(self.session_id)
+
+    def _replace_current_image(self):
+        """
+        Asks for a new picture while keeping the current one to compare against.
+
+        Without a scene detector this is the same as `_forget_current_image`.
+        """
+        if self.scene_detector is None or self.current_image is None:
+            self._forget_current_image()
+            return
+        self.previous_image = self.current_image
+        self.previous_saved_image_path = self.current_saved_image_path
+        self.current_image = None
+        self.current_saved_image_path = None
+
+    def _reuse_previous_image(self, img):
+        """
+        Restores the previous image when the new capture shows the same scene.
+
+        The previous image object is kept (not the new capture), so the conversation
+        cache, which matches images by identity, and the saved file are reused as-is.
+
+        Args:
+            img (PIL.Image.Image): The new capture.
+
+        Returns:
+            bool: True when the previous image was restored.
+        """
+        previous_image, previous_path = self.previous_image, self.previous_saved_image_path
+        self.previous_image = None
+        self.previous_saved_image_path = None
+        if previous_image is None:
+            return False
+        if self.scene_detector.is_same_scene(img, previous_image):
+            self.current_image = previous_image
+            self.current_saved_image_path = previous_path
+            return True
+        if self.conversation_cache is not None:
+            self.conversation_cache.evict(self.session_id)
+        return False
+
+    def _ask(self, prompt):
+        """
+        Speaks a prompt the user answers right away.
+
+        The end of the prompt is marked on the recorder, so the next recording's pre-roll
+        does not pick up the prompt's own tail and take it for the start of the answer.
+
+        Args:
+            prompt (str): What to say.
+        """
+        self.factory_speak.speak(prompt)
+        self.record.mark()
+
+    def _confirmed_image_path(self):
+        """
+        Returns the saved path of the current image once its background write has finished.
+
+        The write normally completes while the model answers, so this rarely waits.
+
+        Returns:
+            str or None: The path, or None when the image could not be written.
+        """
+        path = self.current_saved_image_path
+        if path is None or self.image_saved is None or self.image_saved(path):
+            return path
+        print(f"⚠️ Captured image was not written to {path}; saving the interaction without it.")
+        self.factory_speak.speak("I couldn't save this picture, so it won't be available as a previous picture later.")
+        self.current_saved_image_path = None
+        return None
+
+    def _capture_photo(self, moment):
+        """
+        Takes the photo, retrying when the burst has no usable frame.
+
+        With bursts enabled, a dark, blurry or shaken burst is rejected before any model
+        call: the user hears what to fix and a new burst is taken. After
+        `CAMERA_BURST_MAX_ATTEMPTS` unusable bursts the photo is reported as unusable,
+        so no inference is spent on it.
+
+        Args:
+            moment (float): `time.monotonic()` moment the countdown ended.
+
+        Returns:
+            tuple: (PIL.Image.Image or None, str or None) - the photo (None if the camera
+                   delivered no frame) and the problem of the last burst (None when usable).
+        """
+        if CAMERA_BURST_SIZE <= 1:
+            return self.camera_handler.take_capture(after=moment), None
+
+        for attempt in range(1, CAMERA_BURST_MAX_ATTEMPTS + 1):
+            img, quality = self.camera_handler.capture_burst(after=moment)
+            if img is None or quality["problem"] is None:
+                return img, None
+            if attempt < CAMERA_BURST_MAX_ATTEMPTS:
+                self.factory_speak.speak(f'{PROBLEM_MESSAGES[quality["problem"]]} I will take the photo again after 3. 1 2 3')
+                moment = time.monotonic()
+
+        print(f"No usable frame after {CAMERA_BURST_MAX_ATTEMPTS} bursts.")
+        return img, quality["problem"]
+
+    def _stream_tiles(self, user_question, tiles):
+        """
+        Streams the answers for each tile one after the other, as one answer.
+
+        Args:
+            user_question (str): The user's question
+            tiles (list[PIL.Image.Image]): Tiles in reading order
+
+        Yields:
+            str: Answer chunks, tiles separated by a space
+        """
+        for index, tile in enumerate(tiles):
+            if index:
+                yield " "
+            yield from self.stream_ai(tile, user_question)
+
+    def _get_gemma_3n_response(self, user_question, image, model_images=None, model_prompt=None):
         """
         Sends image and question to Gemini model and returns the response.
 
         Args:
             user_question (str): The user's question
             image (PIL.Image.Image): The image to analyze
+            model_images (list[PIL.Image.Image], optional): Resolution-policy inputs for `image`;
+                                                           several images are tiles answered in turn
+            model_prompt (str, optional): Text sent to the model, e.g. the question with detector
+                                          context. Defaults to `user_question`, which stays the
+                                          answer cache key so re-captures of a scene still hit it.
 
         Returns:
             str: AI response or fallback message on error
+
+        Side Effects:
+            Sets `last_model_seconds` to the model time (None when answered from cache).
         """
+        self.last_model_seconds = None
+        if self.answer_cache is not None:
+            cached_response = self.answer_cache.lookup(image, user_question)
+            if cached_response is not None:
+                print("Answer served from cache.")
+                return cached_response
+
+        model_images = model_images or [image]
+        model_prompt = model_prompt or user_question
+        start = time.perf_counter()
         try:
-            response = self.init_ai(image, user_question)
-            return response if response else "Sorry, I did not receive a response from the Gemini model."
+            if len(model_images) > 1:
+                response = " ".join(
+                    answer for answer in (self.init_ai(tile, model_prompt) for tile in model_images) if answer
+                )
+            elif self.conversation_cache is not None:
+                response = self.conversation_cache.generate(self.session_id, model_images[0], model_prompt)
+            else:
+                response = self.init_ai(model_images[0], model_prompt)
+            self.last_model_seconds = time.perf_counter() - start
+            if not response:
+                return "Sorry, I did not receive a response from the Gemini model."
+            if self.answer_cache is not None:
+                self.answer_cache.remember(image, user_question, response)
+            return response
         except Exception as e:
             print(f"Error calling Gemini API: {e}")
             return "I'm having trouble connecting to the AI. Please try again later."
 
+    def _speak_gemma_3n_stream(self, user_question, image, model_images=None, model_prompt=None):
+        """
+        Streams the AI answer and speaks it one sentence at a time while decoding continues.
+
+        Args:
+            user_question (str): The user's question
+            image (PIL.Image.Image): The image to analyze
+            model_images (list[PIL.Image.Image], optional): Resolution-policy inputs for `image`;
+                                                           several images are tiles answered in turn
+            model_prompt (str, optional): Text sent to the model, e.g. the question with detector
+                                          context. Defaults to `user_question`, which stays the
+                                          answer cache key so re-captures of a scene still hit it.
+
+        Returns:
+            str: The full spoken answer, or the fallback message that was spoken on error
+
+        Side Effects:
+            Sets `last_model_seconds` to the time until the first sentence, or for several images
+            (tiles) the model time of the full answer, without the time spent speaking
+            (None when answered from cache).
+        """
+        self.last_model_seconds = None
+        if self.answer_cache is not None:
+            cached_response = self.answer_cache.lookup(image, user_question)
+            if cached_response is not None:
+                print("Answer served from cache.")
+                self.factory_speak.speak(cached_response)
+                return cached_response
+
+        model_images = model_images or [image]
+        model_prompt = model_prompt or user_question
+        spoken_sentences = []
+        speaking_seconds = 0.0
+        chunks = None
+        start = time.perf_counter()
+        try:
+            if len(model_images) > 1:
+                chunks = self._stream_tiles(model_prompt, model_images)
+            elif self.conversation_cache is not None:
+                chunks = self.conversation_cache.stream(self.session_id, model_images[0], model_prompt)
+            else:
+                chunks = self.stream_ai(model_images[0], model_prompt)
+            for sentence in iter_sentences(chunks):
+                if not spoken_sentences:
+                    self.last_model_seconds = time.perf_counter() - start
+                    print(f"First sentence ready after {self.last_model_seconds:.2f}s")
+                print(sentence)
+                speak_start = time.perf_counter()
+                self.factory_speak.speak(sentence)
+                speaking_seconds += time.perf_counter() - speak_start
+                spoken_sentences.append(sentence)
+            if len(model_images) > 1 and spoken_sentences:
+                # Tiles are answered one after another: the first sentence only covers the first tile
+                self.last_model_seconds = time.perf_counter() - start - speaking_seconds
+                print(f"Full answer over {len(model_images)} tiles after {self.last_model_seconds:.2f}s")
+        except Exception as e:
+            print(f"Error streaming from Gemma: {e}")
+            if not spoken_sentences:
+                fallback = "I'm having trouble connecting to the AI. Please try again later."
+                self.factory_speak.speak(fallback)
+                return fallback
+            return " ".join(spoken_sentences)
+        finally:
+            # Releases the model right away when speaking failed halfway through the answer
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+        if not spoken_sentences:
+            fallback = "Sorry, I did not receive a response from the Gemini model."
+            self.factory_speak.speak(fallback)
+            return fallback
+
+        response = " ".join(spoken_sentences)
+        if self.answer_cache is not None:
+            self.answer_cache.remember(image, user_question, response)
+        return response
+
     def start_interaction_flow(self):
         """
         Runs the full interaction loop with the user.
@@ -89,35 +367,40 @@ class InteractionManager:
             dict: Last interaction state containing question, response, and image path
         """
         print("Starting interaction flow...")
+        self.session_id = uuid.uuid4().hex
 
         self.camera_handler.start_camera()
         load = self.get_name.load_name()
         name = load.get('name')
         self.factory_speak.speak(f'Hi {name}! How are you doing?')
 
+        unusable_photos = 0
         try:
             while True:
                 if self.current_image is None:
                     self.factory_speak.speak(f'Please set the camera for a moment {name}, I will take photo after 3. 1 2 3')
-                    img = self.camera_handler.take_capture()
+                    # speak() returns when "3" has been said: that is the moment the user expects the photo
+                    img, problem = self._capture_photo(time.monotonic())
                     if img is None:
                         self.factory_speak.speak("Sorry, I couldn't capture an image. Please try again.")
                         break
-
-                    self.current_saved_image_path = self.save_pil_image_to_disk(
-                        img,
-                        save_directory=IMAGE_SAVE_DIRECTORY,
-                        filename=IMAGE_FILENAME
-                    )
-                    if self.current_saved_image_path is None:
-                        self.factory_speak.speak("Failed to save the captured image. Please try again.")
-                        break
-
-                    self.current_image = img
-
-                self.factory_speak.speak('Now, please ask your question about the image.')
-                user_audio_data = self.record.record_audio_once(duration_seconds=AUDIO_RECORD_DURATION)
-                user_question = self.stt.speech_to_text(user_audio_data)
+                    if problem is not None:
+                        unusable_photos += 1
+                        if unusable_photos >= CAMERA_PHOTO_MAX_ROUNDS:
+                            self.factory_speak.speak(f"I still couldn't take a usable picture. {PROBLEM_MESSAGES[problem]} Please try again when you are ready.")
+                            break
+                        self.factory_speak.speak(f"I still couldn't take a usable picture. {PROBLEM_MESSAGES[problem]} Let's try once more.")
+                        continue
+                    unusable_photos = 0
+
+                    if self._reuse_previous_image(img):
+                        self.factory_speak.speak("This looks like the same scene as before, so I will keep that picture.")
+                    else:
+                        self.current_saved_image_path = self.save_image(img)
+                        self.current_image = img
+
+                self._ask('Now, please ask your question about the image.')
+                user_question = self.stt.transcribe_live(self.record, self.question_seconds)
 
                 if not user_question:
                     self.factory_speak.speak('Sorry, I could not hear you clearly. I will describe the image generally.')
@@ -125,51 +408,69 @@ class InteractionManager:
                 else:
                     self.factory_speak.speak(f'You said: {user_question}')
 
-                print("Sending image and question to Gemini...")
-                ai_response = self._get_gemma_3n_response(user_question, self.current_image)
-                print(ai_response)
-                self.factory_speak.speak(ai_response)
-
-                self.interaction.save_last_interaction_orm(user_question, ai_response, self.current_saved_image_path)
+                ai_response, model_prompt = None, user_question
+                if self.cascade is not None:
+                    ai_response, model_prompt = self.cascade.triage(user_question, self.current_image)
 
-                self.factory_speak.speak('Do you have another question or anything else you want to ask? Please say yes or no.')
-                follow_up_audio = self.record.record_audio_once(duration_seconds=AUDIO_FOLLOW_UP_DURATION)
-                follow_up_text = self.stt.speech_to_text(follow_up_audio)
-
-                if "yes" in follow_up_text.lower():
+                if ai_response is not None:
+                    print(ai_response)
+                    self.factory_speak.speak(ai_response)
+                else:
+                    print("Sending image and question to Gemini...")
+                    plan, model_images = None, None
+                    if self.resolution_policy is not None:
+                        plan, model_images = self.resolution_policy.prepare(
+                            user_question, self.current_image, self.session_id
+                        )
+
+                    if self.stream_ai is not None:
+                        ai_response = self._speak_gemma_3n_stream(
+                            user_question, self.current_image, model_images, model_prompt
+                        )
+                    else:
+                        ai_response = self._get_gemma_3n_response(
+                            user_question, self.current_image, model_images, model_prompt
+                        )
+                        print(ai_response)
+                        self.factory_speak.speak(ai_response)
+
+                    if plan is not None and self.last_model_seconds is not None:
+                        self.resolution_policy.record(plan, model_images, self.last_model_seconds)
+                    if self.cascade is not None:
+                        self.cascade.record_escalation(self.last_model_seconds)
+
+                self.interaction.save_last_interaction_orm(user_question, ai_response, self._confirmed_image_path())
+
+                self._ask('Do you have another question or anything else you want to ask? Please say yes or no.')
+                follow_up = self.menu_recognizer.listen(self.record, "follow_up", AUDIO_FOLLOW_UP_DURATION)
+
+                if follow_up["intent"] == "yes":
                     choice_understood = False
                     choice_attempts = 0
                     max_choice_attempts = 3
 
                     while not choice_understood and choice_attempts < max_choice_attempts:
                         if choice_attempts == 0:
-                            self.factory_speak.speak('Do you want to ask about a "new picture", "same picture", or recall "previous interaction"?')
+                            self._ask('Do you want to ask about a "new picture", "same picture", or recall "previous interaction"?')
                         else:
-                            self.factory_speak.speak(f"I still didn't understand. Please say clearly: 'new', 'same', or 'previous'. (Attempt {choice_attempts + 1} of {max_choice_attempts})")
-
-                        choice_audio = self.record.record_audio_once(duration_seconds=AUDIO_FOLLOW_UP_DURATION)
-                        choice_text = self.stt.speech_to_text(choice_audio).lower()
-
-                        print(f"DEBUG: User's choice understood as: {choice_text}")
+                            self._ask(f"I still didn't understand. Please say clearly: 'new', 'same', or 'previous'. (Attempt {choice_attempts + 1} of {max_choice_attempts})")
 
-                        new_keywords = ["new", "another", "fresh"]
-                        same_keywords = ["same", "similar"]
-                        previous_keywords = ["previous", "old", "last"]
+                        choice = self.menu_recognizer.listen(self.record, "choice", AUDIO_FOLLOW_UP_DURATION)["intent"]
 
-                        if any(keyword in choice_text for keyword in new_keywords):
-                            self.current_image = None
-                            self.current_saved_image_path = None
+                        if choice == "new":
+                            self._replace_current_image()
                             self.factory_speak.speak("Alright, let's take another picture.")
                             choice_understood = True
 
-                        elif any(keyword in choice_text for keyword in same_keywords):
+                        elif choice == "same":
                             self.factory_speak.speak("Okay, you can ask another question about the current image.")
                             choice_understood = True
 
-                        elif any(keyword in choice_text for keyword in previous_keywords):
+                        elif choice == "previous":
                             last_state = self.interaction.load_last_interaction_orm()
                             if last_state.get("question") and last_state.get("ai_response"):
                                 self.factory_speak.speak(f"Your last question was: '{last_state['question']}', and the AI replied: '{last_state['ai_response']}'.")
+                                self._forget_current_image()
                                 if last_state.get("image_path") and os.path.exists(last_state["image_path"]):
                                     try:
                                         self.current_image = PIL.Image.open(last_state["image_path"])
@@ -178,16 +479,13 @@ class InteractionManager:
                                     except Exception as img_e:
                                         print(f"Error reloading previous image for interaction: {img_e}")
                                         self.factory_speak.speak("I found the previous interaction details, but couldn't load the old picture. Let's take a new one.")
-                                        self.current_image = None
-                                        self.current_saved_image_path = None
+                                        self._forget_current_image()
                                 else:
                                     self.factory_speak.speak("I found the previous interaction details, but no valid picture was saved or the file is missing. Let's take a new one.")
-                                    self.current_image = None
-                                    self.current_saved_image_path = None
+                                    self._forget_current_image()
                             else:
                                 self.factory_speak.speak("I don't have a previous interaction saved. Let's take a new picture.")
-                                self.current_image = None
-                                self.current_saved_image_path = None
+                                self._forget_current_image()
                             choice_understood = True
 
                         else:
@@ -201,7 +499,7 @@ class InteractionManager:
                     if not choice_understood and choice_attempts >= max_choice_attempts:
                         break
 
-                elif "no" in follow_up_text.lower() or "enough" in follow_up_text.lower():
+                elif follow_up["intent"] == "no":
                     self.factory_speak.speak("Okay, thank you. Goodbye!")
                     break
                 else:
@@ -210,5 +508,9 @@ class InteractionManager:
                     break
 
         finally:
+            if self.conversation_cache is not None:
+                self.conversation_cache.evict(self.session_id)
+            if self.resolution_policy is not None:
+                self.resolution_policy.evict(self.session_id)
             self.camera_handler.stop_camera()
             return self.interaction.load_last_interaction_orm()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import os
+import tempfile
+import threading
+import time
+import PIL.Image
+from config import AUDIO_SAMPLERATE, LANG_SETTINGS
+
+# Maximum wait for each inference worker's ping while reporting readiness
+WORKER_PING_TIMEOUT_SECONDS = 1.0
+
+
+class WarmUp:
+    """
+    Preloads the speech and vision models in parallel background threads at startup.
+
+    Each component is loaded and then exercised once (a recognition on silence, a
+    synthesis, a dummy inference) so the first `/start_interaction` does not pay for it.
+
+    Dependencies:
+        - get_lang: Object with method load_language() returning {"language": code}
+        - stt: Stt instance (Vosk model cache)
+        - init_speaking: InitSpeaking instance (pyttsx3 / Coqui TTS)
+        - init_ai: Function to query the AI model with image and question
+        - worker_pool: Optional InferenceWorkerPool, when inference runs out of process
+    """
+
+    COMPONENTS = ("stt", "tts", "gemma")
+
+    def __init__(self, get_lang, stt, init_speaking, init_ai, worker_pool=None):
+        """
+        Initializes the warm-up tracker; nothing is loaded until `start()`.
+
+        Args:
+            get_lang: Object that provides the user's language settings.
+            stt: Speech-to-text processor.
+            init_speaking: TTS engine initializer.
+            init_ai: Function to query AI model with image and question.
+            worker_pool: Optional InferenceWorkerPool. When given, readiness also requires
+                         at least one live worker that answers a ping.
+        """
+        self.get_lang = get_lang
+        self.stt = stt
+        self.init_speaking = init_speaking
+        self.init_ai = init_ai
+        self.worker_pool = worker_pool
+        self.language = None
+        self._pyttsx3_engine = None
+        self.started = False
+        self._lock = threading.Lock()
+        self._status = {
+            name: {"status": "pending", "seconds": None, "error": None} for name in self.COMPONENTS
+        }
+
+    def start(self):
+        """
+        Starts one background thread per component. Calling it again does nothing.
+        """
+        with self._lock:
+            if self.started:
+                return
+            self.started = True
+
+        try:
+            usr_lang = self.get_lang.load_language()
+            self.language = usr_lang.get('language') or "en-US"
+        except Exception as e:
+            # Never block app startup: report every component as failed instead
+            print(f"⚠️ Warm-up could not read the language: {e}")
+            for name in self.COMPONENTS:
+                self._set(name, status="failed", error=f"Language lookup failed: {e}")
+            return
+
+        tasks = {"stt": self._warm_stt, "tts": self._warm_tts, "gemma": self._warm_gemma}
+        for name, task in tasks.items():
+            threading.Thread(target=self._run, args=(name, task), name=f"warmup-{name}", daemon=True).start()
+        print(f"🔥 Warming up models for {self.language}...")
+
+    def _run(self, name, task):
+        """
+        Runs one warm-up task and records its status and duration.
+
+        Args:
+            name (str): Component name.
+            task (Callable): Function performing the warm-up.
+        """
+        self._set(name, status="loading")
+        start = time.perf_counter()
+        try:
+            task()
+            self._set(name, status="ready", seconds=round(time.perf_counter() - start, 2))
+            print(f"✅ {name} warmed up in {time.perf_counter() - start:.1f}s")
+        except Exception as e:
+            self._set(name, status="failed", seconds=round(time.perf_counter() - start, 2), error=str(e))
+            print(f"⚠️ Warm-up of {name} failed: {e}")
+
+    def _set(self, name, **fields):
+        """Updates the status entry of a component."""
+        with self._lock:
+            self._status[name].update(fields)
+
+    def _warm_stt(self):
+        """
+        Loads the Vosk model for the stored language and decodes half a second of silence.
+
+        The recognizer goes back to the STT pool, so the first question reuses it.
+        """
+        stream = self.stt.create_stream(self.language)
+        if stream is None:
+            raise RuntimeError(f"Vosk model for {self.language} is not downloaded.")
+        stream.accept(bytes(AUDIO_SAMPLERATE))
+        stream.finish()
+
+    def _warm_tts(self):
+        """
+        Initializes the speech engine for the stored language and synthesizes a short phrase in memory.
+        """
+        tts_model = LANG_SETTINGS.get(self.language, {}).get('tts_voice_name', "pyttsx3")
+        if tts_model == "pyttsx3":
+            engine = self.init_speaking.init_pyttsx3()
+            # Rendered to a file, so nothing is heard
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                engine.save_to_file("Hello.", path)
+                engine.runAndWait()
+            finally:
+                os.remove(path)
+            # pyttsx3.init() only reuses an engine that is still referenced somewhere
+            self._pyttsx3_engine = engine
+        else:
+            speaker = self.init_speaking.init_tts(tts_model)
+            speaker.tts(text="Hello.")
+
+    def _warm_gemma(self):
+        """
+        Loads the vision-language model by running one dummy inference.
+        """
+        self.init_ai(PIL.Image.new("RGB", (200, 200)), "Describe this image please.")
+
+    def status(self):
+        """
+        Reports per-component readiness.
+
+        With a worker pool, Gemma warming up once is not enough: the workers can crash or
+        be restarting later, so they are pinged on every call.
+
+        Returns:
+            dict: {
+                "ready": True when every component warmed up successfully (and a worker answers),
+                "finished": True when no component is still pending or loading,
+                "language": warmed-up language code,
+                "components": {name: {"status", "seconds", "error"}},
+                "workers": `InferenceWorkerPool.health()` entries (only with a worker pool)
+            }
+        """
+        with self._lock:
+            components = {name: dict(entry) for name, entry in self._status.items()}
+        statuses = [entry["status"] for entry in components.values()]
+        ready = self.started and all(status == "ready" for status in statuses)
+        result = {
+            "ready": ready,
+            "finished": self.started and all(status in ("ready", "failed") for status in statuses),
+            "language": self.language,
+            "components": components
+        }
+        if self.worker_pool is not None:
+            workers = self.worker_pool.health(timeout=WORKER_PING_TIMEOUT_SECONDS)
+            result["workers"] = workers
+            result["ready"] = ready and any(
+                worker["alive"] and worker["ready"] and worker.get("ping_seconds") is not None for worker in workers
+            )
+        return result
@@ -0,0 +1,94 @@
+import datetime
+from peewee import OperationalError
+from .models import CachedAnswer
+from .db_config import db
+
+class GetCachedAnswer:
+    """
+    Handles saving, loading and deleting memoized AI answers using ORM.
+    """
+
+    def __init__(self):
+        """Initializes the GetCachedAnswer handler."""
+        pass
+
+    def save_answer(self, image_hash, question, answer):
+        """
+        Saves (or replaces) a cached answer.
+
+        Args:
+            image_hash (str): Perceptual hash of the image (hex).
+            question (str): Normalized question.
+            answer (str): The AI's answer.
+
+        Side Effects:
+            - Inserts or replaces a row in the CachedAnswer table
+        """
+        try:
+            db.connect()
+            CachedAnswer.replace(
+                image_hash=image_hash,
+                question=question,
+                answer=answer,
+                timestamp=datetime.datetime.now()
+            ).execute()
+        except OperationalError as e:
+            print(f"ORM: Database connection error during answer save: {e}")
+        except Exception as e:
+            print(f"ORM: Error saving cached answer: {e}")
+        finally:
+            if not db.is_closed():
+                db.close()
+
+    def load_answers(self, max_age_seconds):
+        """
+        Loads every cached answer younger than `max_age_seconds`.
+
+        Args:
+            max_age_seconds (float): Maximum age of the answers to load.
+
+        Returns:
+            list[dict]: [{"image_hash", "question", "answer", "timestamp"}, ...]
+                        or an empty list on error.
+        """
+        answers = []
+        try:
+            db.connect()
+            since = datetime.datetime.now() - datetime.timedelta(seconds=max_age_seconds)
+            query = CachedAnswer.select().where(CachedAnswer.timestamp >= since)
+            answers = [{
+                "image_hash": row.image_hash,
+                "question": row.question,
+                "answer": row.answer,
+                "timestamp": row.timestamp
+            } for row in query]
+            print(f"ORM: {len(answers)} cached answers loaded successfully.")
+        except OperationalError as e:
+            print(f"ORM: Database connection error during answer load: {e}")
+        except Exception as e:
+            print(f"ORM: Error loading cached answers: {e}")
+        finally:
+            if not db.is_closed():
+                db.close()
+        return answers
+
+    def delete_answer(self, image_hash, question):
+        """
+        Deletes a cached answer.
+
+        Args:
+            image_hash (str): Perceptual hash of the image (hex).
+            question (str): Normalized question.
+        """
+        try:
+            db.connect()
+            CachedAnswer.delete().where(
+                (CachedAnswer.image_hash == image_hash) & (CachedAnswer.question == question)
+            ).execute()
+        except OperationalError as e:
+            print(f"ORM: Database connection error during answer delete: {e}")
+        except Exception as e:
+            print(f"ORM: Error deleting cached answer: {e}")
+        finally:
+            if not db.is_closed():
+                db.close()
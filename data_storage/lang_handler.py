@@ -1,4 +1,5 @@
 import datetime
+import threading
 from peewee import OperationalError
 from .models import Language
 from .db_config import db
@@ -6,13 +7,20 @@ from .db_config import db
 class GetLanguage:
     """
     Handles saving and loading the user's selected language using ORM.
+
+    Attributes:
+        version (int): Class-level counter increased by every saved language, shared by all
+                       instances, so readers can cache the language until it changes.
     """
 
+    version = 0
+    _version_lock = threading.Lock()
+
     def __init__(self):
         """Initializes the GetLanguage handler."""
         pass
 
-    def save_language(language):
+    def save_language(self, language):
         """
         Saves the selected language to the database.
 
@@ -21,6 +29,7 @@ class GetLanguage:
 
         Side Effects:
             - Updates Language table (ID=1)
+            - Increases `GetLanguage.version`
         """
         try:
             db.connect()
@@ -28,6 +37,8 @@ class GetLanguage:
             state.language = language
             state.timestamp = datetime.datetime.now()
             state.save()
+            with GetLanguage._version_lock:
+                GetLanguage.version += 1
             print("ORM: language saved successfully.")
         except OperationalError as e:
             print(f"ORM: Database connection error during save: {e}")
@@ -39,7 +50,7 @@ class GetLanguage:
 
 
 
-    def load_language():
+    def load_language(self):
         """
         Loads the saved language from the database.
 
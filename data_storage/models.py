@@ -70,4 +70,28 @@ class Name(BaseModel):
     timestamp = DateTimeField(default=datetime.datetime.now)
 
     class Meta:
-        table_name = 'name'
\ No newline at end of file
+        table_name = 'name'
+
+class CachedAnswer(BaseModel):
+    """
+    Stores a memoized AI answer for an image fingerprint and a normalized question.
+
+    Fields:
+        - image_hash (str): Perceptual hash of the image (hex)
+        - question (str): Normalized question text
+        - answer (str): The AI's answer
+        - timestamp (datetime): When the answer was cached
+
+    Table Name:
+        'cached_answer'
+    """
+    image_hash = TextField()
+    question = TextField()
+    answer = TextField()
+    timestamp = DateTimeField(default=datetime.datetime.now)
+
+    class Meta:
+        table_name = 'cached_answer'
+        indexes = (
+            (('image_hash', 'question'), True),
+        )
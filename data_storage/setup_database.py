@@ -1,6 +1,6 @@
 import datetime
 from peewee import OperationalError
-from .models import LastInteractionState, Language, Name
+from .models import LastInteractionState, Language, Name, CachedAnswer
 from .db_config import db
 
 class SetupDatabase:
@@ -26,12 +26,12 @@ class SetupDatabase:
 
         Side Effects:
             - Connects to the database
-            - Creates tables: LastInteractionState, Language, Name
+            - Creates tables: LastInteractionState, Language, Name, CachedAnswer
             - Inserts default row with ID=1 for each table
         """
         try:
             db.connect()
-            db.create_tables([LastInteractionState, Language, Name])
+            db.create_tables([LastInteractionState, Language, Name, CachedAnswer])
 
             try:
                 LastInteractionState.get(LastInteractionState.id == 1)
@@ -1,4 +1,4 @@
-# import os
+import os
 # import atexit
 # from flask import Flask, send_from_directory
 from flask import Flask
@@ -8,6 +8,8 @@ from routes.home_routes import home_bp
 from routes.add_user_routes import user_bp
 from routes.start_interaction_routes import interaction_bp
 from routes.show_image import image_bp
+from routes.ready_routes import ready_bp, warm_up
+from routes.camera_stream_routes import camera_stream_bp
 
 os.environ["HF_HOME"] = "D:/huggingface_cache"
 def create_app():
@@ -22,6 +24,9 @@ def create_app():
         - `user_bp`: User creation and management
         - `interaction_bp`: Voice interaction logic
         - `show_bp`: Serve saved images from disk
+        - `ready_bp`: Model warm-up readiness
+        - `camera_stream_bp`: Live MJPEG camera preview
+    - Starts the background model warm-up for the stored language
     - Sets Hugging Face cache directory via `HF_HOME` environment variable
 
     Returns:
@@ -43,5 +48,10 @@ def create_app():
     app.register_blueprint(user_bp)
     app.register_blueprint(interaction_bp)
     app.register_blueprint(image_bp)
+    app.register_blueprint(ready_bp)
+    app.register_blueprint(camera_stream_bp)
+
+    # Preload speech and vision models while the user opens the page
+    warm_up.start()
 
     return app
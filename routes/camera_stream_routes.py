@@ -0,0 +1,33 @@
+from flask import Blueprint, Response
+from camera.mjpeg_broadcaster import MjpegBroadcaster, MJPEG_BOUNDARY
+from routes.start_interaction_routes import camera_handler
+
+# One shared encoder for every viewer, reading the interaction camera's frames
+broadcaster = MjpegBroadcaster(camera_handler)
+
+# Flask Blueprint for the live camera preview
+camera_stream_bp = Blueprint('camera_stream_bp', __name__)
+"""
+Blueprint: camera_stream_bp
+
+Streams what the camera sees as multipart MJPEG, so a sighted helper can watch
+the feed from the web UI.
+"""
+
+@camera_stream_bp.route('/camera/stream', methods=['GET'])
+def camera_stream():
+    """
+    Streams the live camera feed.
+
+    Returns:
+        Response: `multipart/x-mixed-replace` MJPEG stream; frames appear while the camera runs.
+
+    Notes:
+        - Frames are encoded once by the shared `broadcaster`, whatever the number of viewers
+        - The stream never opens the camera device itself
+    """
+    return Response(
+        broadcaster.frames(),
+        mimetype=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+        headers={"Cache-Control": "no-cache, no-store"}
+    )
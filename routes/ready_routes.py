@@ -0,0 +1,34 @@
+from flask import jsonify, Blueprint
+from config import INFERENCE_OUT_OF_PROCESS
+from controllers.warmup_controller import WarmUp
+from routes.start_interaction_routes import get_language, stt, init_speaking, ai_generate, worker_pool
+
+# Background warm-up shared with the interaction components, started by `create_app`
+warm_up = WarmUp(get_language, stt, init_speaking, ai_generate,
+                 worker_pool=worker_pool if INFERENCE_OUT_OF_PROCESS else None)
+
+# Flask Blueprint for readiness routes
+ready_bp = Blueprint('ready_bp', __name__)
+"""
+Blueprint: ready_bp
+
+Reports whether the speech and vision models have finished warming up,
+so the UI can tell the user when the assistant is ready.
+"""
+
+@ready_bp.route('/ready', methods=['GET'])
+def ready():
+    """
+    Reports per-component warm-up status and load time.
+
+    Returns:
+        JSON response with:
+            - ready (bool): True when every component is loaded
+            - finished (bool): True when no component is still loading
+            - language (str): Language the models were loaded for
+            - components (dict): {"stt" | "tts" | "gemma": {"status", "seconds", "error"}}
+            - workers (list): Inference worker health, when inference runs out of process
+        Status code 200 when ready, 503 otherwise (e.g. while every worker is dead or restarting).
+    """
+    status = warm_up.status()
+    return jsonify(status), 200 if status["ready"] else 503
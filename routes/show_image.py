@@ -1,33 +1,68 @@
 import os
-from flask import Blueprint, send_from_directory
-from config import IMAGE_SAVE_DIRECTORY
+from flask import Blueprint, abort, request, send_from_directory
+from config import IMAGE_SAVE_DIRECTORY, IMAGE_CACHE_MAX_AGE_SECONDS
+from routes.start_interaction_routes import image_store
+from utils.image_variants import ImageVariants
+
+# Thumbnails and previews of captured images, generated on first request and deleted with their capture
+image_variants = ImageVariants()
+image_variants.prune()
+image_store.add_eviction_listener(image_variants.drop)
 
 # Flask Blueprint for serving captured images
 image_bp = Blueprint('image_bp', __name__)
 """
 Blueprint: image_bp
 
-Handles serving image files from the static directory.
+Handles serving captured images and their resized variants.
 Useful for displaying or accessing captured images via URL.
 """
 
-@image_bp.route('/' + IMAGE_SAVE_DIRECTORY + '/<path:filename>')
+@image_bp.route('/captured_images/<path:filename>')
 def serve_captured_image(filename):
     """
-    Serves a captured image file from the static directory.
+    Serves a captured image file, or a resized variant of it.
 
     URL Pattern:
-        /captured_images/<filename>
+        /captured_images/<filename>?size=thumbnail|preview|original
 
     Args:
         filename (str): Name of the image file to serve
 
     Returns:
-        Response: Sends the image file from 'static/captured_images' without forcing download
+        Response: The image (or a 304 Not Modified when the browser's copy is current)
 
     Notes:
-        - Files are served from: static/<IMAGE_SAVE_DIRECTORY>
+        - Files are served from IMAGE_SAVE_DIRECTORY; variants from IMAGE_VARIANT_DIRECTORY
+        - ETag and Last-Modified are sent, and conditional requests get 304 responses
+        - Content-addressed captures never change, so they are cached for IMAGE_CACHE_MAX_AGE_SECONDS;
+          other names must be revalidated
         - `as_attachment=False` allows direct display in browser
     """
-    upload_folder = os.path.join('static', IMAGE_SAVE_DIRECTORY)
-    return send_from_directory(upload_folder, filename, as_attachment=False)
\ No newline at end of file
+    filename = os.path.basename(filename)
+    variant = request.args.get('size', 'original')
+    immutable = image_variants.is_immutable(filename)
+    # A capture may still be in the background writer's queue
+    image_store.wait_until_written(os.path.join(IMAGE_SAVE_DIRECTORY, filename))
+
+    if variant == 'original':
+        directory = IMAGE_SAVE_DIRECTORY
+    else:
+        try:
+            path = image_variants.get(filename, variant)
+        except ValueError as e:
+            abort(400, description=str(e))
+        if path is None:
+            abort(404)
+        directory, filename = os.path.split(path)
+
+    response = send_from_directory(
+        directory, filename, as_attachment=False, conditional=True, etag=True,
+        max_age=IMAGE_CACHE_MAX_AGE_SECONDS if immutable else 0
+    )
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
@@ -7,9 +7,24 @@ from data_storage.lang_handler import GetLanguage
 from data_storage.user_handler import GetName
 from camera.camera import CameraHandler
 from controllers.interaction_manager import InteractionManager
-from utils.image_utils import save_pil_image_to_disk
-from ai_integrations.gemma_3n import init_ai
+from utils.image_store import ImageStore
+from ai_integrations.backends.factory_backend import create_backend
+from ai_integrations.batch_scheduler import BatchScheduler
+from ai_integrations.inference_worker import InferenceWorkerPool
+from ai_integrations.conversation_cache import ConversationCache
+from ai_integrations.answer_cache import AnswerCache
+from camera.scene_change import SceneChangeDetector
+from ai_integrations.resolution_policy import ResolutionPolicy
+from ai_integrations.local_detector import LocalDetector
+from ai_integrations.detector_cascade import DetectorCascade
+from data_storage.answer_cache_handler import GetCachedAnswer
+from config import (
+    INFERENCE_BATCHING, INFERENCE_OUT_OF_PROCESS, GEMMA_CONVERSATION_CACHE,
+    ANSWER_CACHE_ENABLED, ANSWER_CACHE_PERSIST, SCENE_CHANGE_DETECTION,
+    RESOLUTION_POLICY, DETECTOR_CASCADE
+)
 from audio_processing.speech import Stt
+from audio_processing.menu_recognizer import MenuRecognizer
 from audio_processing.speaking.init_speaking import InitSpeaking
 from audio_processing.speaking.which_spoken import WhichSpoken
 from utils.play_audio import play_audio
@@ -23,21 +38,67 @@ get_language = GetLanguage()
 get_name = GetName()
 stt = Stt(get_language)
 record = Record()
+# Yes/no and new/same/previous answers are decoded with a per-menu grammar
+menu_recognizer = MenuRecognizer(stt)
 init_speaking = InitSpeaking()
 spoken = WhichSpoken(init_speaking.init_pyttsx3, init_speaking.init_tts, play_audio=play_audio)
 factory_Speak = FactorySpeak(spoken.speak_english, spoken.speak_other_language, get_lang=get_language)
 
+# Captures are stored by content hash and written in the background
+image_store = ImageStore()
+
+# Inference backend chosen in config ("transformers", "onnx" or "stub")
+backend = create_backend(get_lang=get_language)
+
+# Concurrent sessions share batched generate calls when batching is enabled
+batch_scheduler = BatchScheduler(backend.generate_batch)
+
+# Worker processes are started lazily on the first question when out-of-process inference is enabled
+worker_pool = InferenceWorkerPool()
+
+# Follow-up questions about the same picture reuse the image prefix (in-process Transformers only)
+conversation_cache = ConversationCache(backend.holder, get_lang=get_language) if backend.name == "transformers" else None
+
+# Repeated questions about the same scene are answered without the model
+answer_cache = AnswerCache(store=GetCachedAnswer() if ANSWER_CACHE_PERSIST else None)
+answer_cache.load_persisted()
+
+# A "new picture" of the same scene keeps the current image instead of re-capturing and re-encoding it
+scene_detector = SceneChangeDetector()
+
+# Text-reading questions get tiles of the capture, everything else one whole image
+resolution_policy = ResolutionPolicy()
+
+# "Is there a person?"-style questions are answered by a fast local detector before Gemma
+cascade = DetectorCascade(LocalDetector())
+
+if INFERENCE_OUT_OF_PROCESS:
+    ai_generate, ai_stream, ai_conversation_cache = worker_pool.generate, None, None
+elif INFERENCE_BATCHING:
+    ai_generate, ai_stream, ai_conversation_cache = batch_scheduler.generate, None, None
+else:
+    ai_generate, ai_stream = backend.generate, backend.stream
+    ai_conversation_cache = conversation_cache if GEMMA_CONVERSATION_CACHE else None
+
 
 # Create interaction manager with all dependencies
 interaction_manager = InteractionManager(
     camera_handler=camera_handler,
-    factory_Speak=factory_Speak,
+    factory_speak=factory_Speak,
     record=record,
     stt=stt,
-    save_image_func=save_pil_image_to_disk,
+    save_image_func=image_store.save,
     interaction=interaction,
     get_name=get_name,
-    init_ai=init_ai
+    init_ai=ai_generate,
+    stream_ai=ai_stream,
+    conversation_cache=ai_conversation_cache,
+    answer_cache=answer_cache if ANSWER_CACHE_ENABLED else None,
+    scene_detector=scene_detector if SCENE_CHANGE_DETECTION else None,
+    resolution_policy=resolution_policy if RESOLUTION_POLICY else None,
+    cascade=cascade if DETECTOR_CASCADE else None,
+    menu_recognizer=menu_recognizer,
+    image_saved=image_store.wait_until_written
 )
 
 # Flask Blueprint for interaction-related routes
@@ -14,6 +14,41 @@ function updateStatus(message, isError = false) {
   statusMessageDiv.style.color = isError ? '#FF6347' : '#FFFFF0';
 }
 
+/**
+ * Polls the /ready endpoint until the models have finished warming up.
+ * Keeps the start button disabled while the assistant is still loading.
+ */
+async function waitUntilReady() {
+  startButton.disabled = true;
+  updateStatus('Loading the assistant... Please wait.');
+
+  while (true) {
+    try {
+      const response = await fetch('http://127.0.0.1:5000/ready');
+      const data = await response.json();
+
+      if (data.finished) {
+        const failed = Object.keys(data.components).filter(name => data.components[name].status === 'failed');
+        if (failed.length) {
+          updateStatus(`Assistant ready with problems (${failed.join(', ')}). Click "Start" to begin...`, true);
+        } else {
+          updateStatus('Assistant ready. Click "Start" to begin...');
+        }
+        break;
+      }
+    } catch (error) {
+      console.error('Readiness check failed:', error);
+      updateStatus('Click "Start" to begin...');
+      break;
+    }
+    await new Promise(resolve => setTimeout(resolve, 2000));
+  }
+
+  startButton.disabled = false;
+}
+
+waitUntilReady();
+
 /**
  * Handles the click event on the "Start Interaction" button.
  * Sends a POST request to the Flask backend to initiate the AI interaction flow.
@@ -49,7 +84,7 @@ startButton.addEventListener('click', async () => {
       if (data.last_image_path) {
         const normalizedPath = data.last_image_path.replace(/\\/g, '/'); // Normalize Windows paths
         const filename = normalizedPath.split('/').pop(); // Extract filename
-        responseImage.src = `http://127.0.0.1:5000/captured_images/${filename}`;
+        responseImage.src = `http://127.0.0.1:5000/captured_images/${filename}?size=preview`;
         responseImage.style.display = 'block';
       } else {
         responseImage.style.display = 'none';
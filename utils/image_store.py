@@ -0,0 +1,225 @@
+import hashlib
+import os
+import queue
+import threading
+import time
+from config import (
+    IMAGE_SAVE_DIRECTORY, IMAGE_STORE_MAX_BYTES, IMAGE_STORE_MAX_AGE_SECONDS, IMAGE_STORE_JPEG_QUALITY
+)
+
+
+class ImageStore:
+    """
+    Content-addressed JPEG store for captured images.
+
+    - Files are named by a hash of the pixels (`<image id>.jpg`), so the path returned
+      for a capture never changes and can be stored in the interaction history
+    - Identical captures are written once; saving them again only refreshes their recency
+    - JPEG encoding and disk writes run on a background writer thread, so `save`
+      returns at once and inference is not delayed
+    - After each write the store enforces a size budget (least recently used files go
+      first) and an age budget; eviction listeners (see `add_eviction_listener`) delete
+      whatever was derived from an evicted image, such as its resized variants
+
+    Args:
+        directory (str): Directory holding the images.
+        max_bytes (int): Disk budget for the stored images.
+        max_age_seconds (float): Images unused for longer than this are deleted.
+        jpeg_quality (int): JPEG quality (0-100).
+
+    Attributes:
+        writes (int): Images written to disk.
+        dedup_hits (int): Saves answered by an already stored (or queued) image.
+        evictions (int): Images deleted by the size or age budget.
+    """
+
+    def __init__(self, directory=IMAGE_SAVE_DIRECTORY, max_bytes=IMAGE_STORE_MAX_BYTES,
+                 max_age_seconds=IMAGE_STORE_MAX_AGE_SECONDS, jpeg_quality=IMAGE_STORE_JPEG_QUALITY):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.jpeg_quality = jpeg_quality
+        self.writes = 0
+        self.dedup_hits = 0
+        self.evictions = 0
+        self._files = None
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._eviction_listeners = []
+
+    def add_eviction_listener(self, listener):
+        """
+        Registers a function called with the path of every image the budgets delete.
+
+        Args:
+            listener (callable): Takes the evicted path, e.g. `ImageVariants.drop`.
+        """
+        self._eviction_listeners.append(listener)
+
+    @staticmethod
+    def image_id(pil_img):
+        """
+        Returns the content id of an image: a hash of its mode, size and pixels.
+
+        Args:
+            pil_img (PIL.Image.Image): The image.
+
+        Returns:
+            str: 20 hexadecimal characters.
+        """
+        digest = hashlib.blake2b(digest_size=10)
+        digest.update(f"{pil_img.mode}:{pil_img.width}x{pil_img.height}:".encode())
+        digest.update(pil_img.tobytes())
+        return digest.hexdigest()
+
+    def path_for(self, image_id):
+        """
+        Returns the stable path of an image id.
+        """
+        return os.path.join(self.directory, f"{image_id}.jpg")
+
+    def _scan(self):
+        """
+        Indexes the files already on disk (called once, under the lock).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._files = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".jpg"):
+                stat = entry.stat()
+                self._files[entry.path] = {"bytes": stat.st_size, "used": stat.st_mtime}
+
+    def save(self, pil_img):
+        """
+        Stores an image and returns its stable path without waiting for the disk write.
+
+        Args:
+            pil_img (PIL.Image.Image): The image to store.
+
+        Returns:
+            str or None: Path of the stored image, or None if no image was given.
+
+        Side Effects:
+            - Queues the JPEG write on the background writer thread
+            - Refreshes the recency of an identical image already stored
+        """
+        if pil_img is None:
+            print("No PIL image provided to save.")
+            return None
+
+        path = self.path_for(self.image_id(pil_img))
+        now = time.time()
+        with self._lock:
+            if self._files is None:
+                self._scan()
+            if path in self._files or path in self._pending:
+                self.dedup_hits += 1
+                if path in self._files:
+                    self._files[path]["used"] = now
+                    try:
+                        os.utime(path, (now, now))
+                    except OSError:
+                        pass
+                return path
+
+            self._pending[path] = threading.Event()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="image-store-writer", daemon=True)
+                self._thread.start()
+        # The writer owns the image from here on; captures are never modified after saving
+        self._queue.put((path, pil_img))
+        return path
+
+    def wait_until_written(self, path, timeout=5.0):
+        """
+        Blocks until a queued image has been written.
+
+        Args:
+            path (str): Path returned by `save`.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            bool: True when the file is on disk.
+        """
+        with self._lock:
+            written = self._pending.get(path)
+        if written is not None:
+            written.wait(timeout)
+        return os.path.exists(path)
+
+    def _run(self):
+        """
+        Writer loop: encodes queued images, writes them atomically and enforces the budgets.
+        """
+        while True:
+            path, pil_img = self._queue.get()
+            temporary_path = f"{path}.tmp"
+            try:
+                pil_img.convert("RGB").save(temporary_path, format="JPEG", quality=self.jpeg_quality)
+                os.replace(temporary_path, path)
+                size = os.path.getsize(path)
+                with self._lock:
+                    self._files[path] = {"bytes": size, "used": time.time()}
+                    self.writes += 1
+                print(f"Image saved at: {path}")
+                self._enforce_budget()
+            except Exception as e:
+                print(f"Error saving image to disk: {e}")
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+            finally:
+                with self._lock:
+                    written = self._pending.pop(path, None)
+                if written is not None:
+                    written.set()
+
+    def _enforce_budget(self):
+        """
+        Deletes images older than the age budget, then least recently used ones above the size budget.
+        """
+        now = time.time()
+        with self._lock:
+            by_recency = sorted(self._files.items(), key=lambda item: item[1]["used"])
+            total = sum(info["bytes"] for _, info in by_recency)
+            doomed = []
+            for path, info in by_recency:
+                # The most recent image is never evicted: it is the one the user is asking about
+                if path == by_recency[-1][0]:
+                    break
+                if now - info["used"] > self.max_age_seconds or total > self.max_bytes:
+                    doomed.append(path)
+                    total -= info["bytes"]
+            for path in doomed:
+                del self._files[path]
+                self.evictions += 1
+
+        for path in doomed:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Error deleting old image {path}: {e}")
+            for listener in self._eviction_listeners:
+                try:
+                    listener(path)
+                except Exception as e:
+                    print(f"Error cleaning up after evicting {path}: {e}")
+
+    def stats(self):
+        """
+        Returns the store counters.
+
+        Returns:
+            dict: {"files", "bytes", "pending", "writes", "dedup_hits", "evictions"}
+        """
+        with self._lock:
+            files = self._files or {}
+            return {
+                "files": len(files),
+                "bytes": sum(info["bytes"] for info in files.values()),
+                "pending": len(self._pending),
+                "writes": self.writes,
+                "dedup_hits": self.dedup_hits,
+                "evictions": self.evictions
+            }
@@ -1,4 +1,5 @@
 import os
+import PIL.Image
 from config import IMAGE_SAVE_DIRECTORY, IMAGE_FILENAME
 
 def save_pil_image_to_disk(pil_img, save_directory=IMAGE_SAVE_DIRECTORY, filename=IMAGE_FILENAME):
@@ -45,4 +46,45 @@ def save_pil_image_to_disk(pil_img, save_directory=IMAGE_SAVE_DIRECTORY, filenam
         return full_path
     except Exception as e:
         print(f"Error saving image to disk: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def image_fingerprint(pil_img, hash_size=8):
+    """
+    Computes a perceptual difference hash (dHash) of a PIL image.
+
+    The image is reduced to a tiny grayscale thumbnail and each bit records whether a
+    pixel is brighter than its right neighbour, so re-captures of the same scene give
+    identical or nearly identical hashes.
+
+    Args:
+        pil_img (PIL.Image.Image): The image to fingerprint.
+        hash_size (int, optional): Hash grid size; the hash has hash_size * hash_size bits.
+
+    Returns:
+        str: The hash as a hexadecimal string.
+
+    Example:
+        same_scene = hash_distance(image_fingerprint(img_a), image_fingerprint(img_b)) <= 4
+    """
+    small = pil_img.convert("L").resize((hash_size + 1, hash_size), PIL.Image.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def hash_distance(hash_a, hash_b):
+    """
+    Returns the number of differing bits between two hex fingerprints.
+
+    Args:
+        hash_a (str): Hex hash from `image_fingerprint`.
+        hash_b (str): Hex hash from `image_fingerprint`.
+
+    Returns:
+        int: Hamming distance between the two hashes.
+    """
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count("1")
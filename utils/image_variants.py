@@ -0,0 +1,145 @@
+import os
+import re
+import threading
+import PIL.Image
+from config import IMAGE_SAVE_DIRECTORY, IMAGE_VARIANT_DIRECTORY, IMAGE_VARIANT_SIZES
+
+# Names produced by `ImageStore`: the content hash, so the file never changes
+CONTENT_ADDRESSED_NAME = re.compile(r"^[0-9a-f]{20}\.jpg$")
+
+
+class ImageVariants:
+    """
+    Resized variants (thumbnail, preview) of captured images, generated on demand and cached on disk.
+
+    A variant is stored as `<source name>_<side>.jpg`. Captures are content addressed,
+    so a source name identifies its pixels and a cached variant never goes stale;
+    for other names the source's modification time is part of the key.
+
+    Args:
+        source_directory (str): Directory of the captured images.
+        cache_directory (str): Directory of the generated variants.
+        sizes (dict): {variant name: longest side in pixels}.
+
+    Attributes:
+        generated (int): Variants generated.
+        cache_hits (int): Variants served from the disk cache.
+    """
+
+    def __init__(self, source_directory=IMAGE_SAVE_DIRECTORY, cache_directory=IMAGE_VARIANT_DIRECTORY,
+                 sizes=IMAGE_VARIANT_SIZES):
+        self.source_directory = source_directory
+        self.cache_directory = cache_directory
+        self.sizes = sizes
+        self.generated = 0
+        self.cache_hits = 0
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    @staticmethod
+    def is_immutable(filename):
+        """
+        True when the file name is a content hash, i.e. the file can be cached forever.
+        """
+        return bool(CONTENT_ADDRESSED_NAME.match(os.path.basename(filename)))
+
+    def _variant_path(self, source_path, filename, side):
+        """
+        Returns the cache path of a variant, keyed by source identity and size.
+        """
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        if not self.is_immutable(filename):
+            stem = f"{stem}_{int(os.path.getmtime(source_path))}"
+        return os.path.join(self.cache_directory, f"{stem}_{side}.jpg")
+
+    def _lock_for(self, path):
+        """Returns the lock serializing the generation of one variant."""
+        with self._locks_lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def get(self, filename, variant):
+        """
+        Returns the path of a variant, generating it on the first request.
+
+        Args:
+            filename (str): File name of the captured image inside `source_directory`.
+            variant (str): One of `sizes`.
+
+        Returns:
+            str or None: Path of the variant file, or None if the source image does not exist.
+
+        Raises:
+            ValueError: If the variant name is unknown.
+        """
+        if variant not in self.sizes:
+            raise ValueError(f"Unknown image variant '{variant}'. Choose one of {tuple(self.sizes)}.")
+
+        source_path = os.path.join(self.source_directory, os.path.basename(filename))
+        if not os.path.isfile(source_path):
+            return None
+
+        side = self.sizes[variant]
+        path = self._variant_path(source_path, filename, side)
+        if os.path.exists(path):
+            self.cache_hits += 1
+            return path
+
+        with self._lock_for(path):
+            if os.path.exists(path):
+                self.cache_hits += 1
+                return path
+            os.makedirs(self.cache_directory, exist_ok=True)
+            with PIL.Image.open(source_path) as source:
+                image = source.convert("RGB")
+            image.thumbnail((side, side), PIL.Image.BICUBIC)
+            temporary_path = f"{path}.tmp"
+            image.save(temporary_path, format="JPEG", quality=85)
+            os.replace(temporary_path, path)
+            self.generated += 1
+        return path
+
+    def drop(self, source_path):
+        """
+        Deletes every cached variant of a source image, e.g. when the image store evicts it.
+
+        Args:
+            source_path (str): Path (or file name) of the source image.
+
+        Returns:
+            int: Number of variants deleted.
+        """
+        if not os.path.isdir(self.cache_directory):
+            return 0
+        prefix = f"{os.path.splitext(os.path.basename(source_path))[0]}_"
+        deleted = 0
+        for name in os.listdir(self.cache_directory):
+            if name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.cache_directory, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
+
+    def prune(self):
+        """
+        Deletes cached variants whose source image no longer exists.
+
+        Returns:
+            int: Number of variants deleted.
+        """
+        if not os.path.isdir(self.cache_directory):
+            return 0
+        sources = {os.path.splitext(name)[0] for name in os.listdir(self.source_directory)} \
+            if os.path.isdir(self.source_directory) else set()
+        deleted = 0
+        for name in os.listdir(self.cache_directory):
+            # "<stem>_<side>.jpg" or "<stem>_<mtime>_<side>.jpg"
+            stem = name.rsplit("_", 1)[0]
+            if stem not in sources and stem.rsplit("_", 1)[0] not in sources:
+                try:
+                    os.remove(os.path.join(self.cache_directory, name))
+                    deleted += 1
+                except OSError:
+                    pass
+        return deleted
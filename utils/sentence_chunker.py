@@ -0,0 +1,40 @@
+import re
+
+# Sentence-ending punctuation (Latin, Arabic question mark, ellipsis) followed by whitespace,
+# or a line break. Requiring the whitespace avoids cutting numbers such as "3.5".
+SENTENCE_BOUNDARY = re.compile(r'[.!?؟…]+(\s+)|(\n+)')
+
+
+def iter_sentences(text_chunks):
+    """
+    Regroups a stream of text chunks into complete sentences.
+
+    This function:
+    - Accumulates incoming chunks into a buffer
+    - Yields each sentence as soon as its boundary has been seen
+    - Yields whatever is left in the buffer once the stream ends
+
+    Args:
+        text_chunks (Iterable[str]): Text fragments in order, e.g. from `stream_ai`.
+
+    Yields:
+        str: Complete, stripped sentences.
+
+    Example:
+        for sentence in iter_sentences(["A red ", "car. It is ", "parked."]):
+            print(sentence)   # "A red car." then "It is parked."
+    """
+    buffer = ""
+    for chunk in text_chunks:
+        buffer += chunk
+        match = SENTENCE_BOUNDARY.search(buffer)
+        while match:
+            sentence = buffer[:match.start(1) if match.group(1) else match.start(2)].strip()
+            buffer = buffer[match.end():]
+            if sentence:
+                yield sentence
+            match = SENTENCE_BOUNDARY.search(buffer)
+
+    tail = buffer.strip()
+    if tail:
+        yield tail